@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分级日志 - 替代输入回调与工作线程中的 print()
+未启用的级别只做一次属性判断（参数按 % 格式延迟格式化，不拼接字符串）；
+启用队列输出时，回调线程只把记录放入 SimpleQueue，由后台写线程负责
+格式化与写 stdout，输入回调和连点线程中不发生任何 I/O。
+
+    AUTO_CLICKER_LOG_LEVEL=debug python3 auto_clicker_multi_position.py
+    AUTO_CLICKER_LOG_QUEUE=0 ...      # 关闭队列，直接同步输出
+
+不使用标准库 logging：它连同 logging.handlers 会在首次绘制前多导入
+约 15ms 的模块（socket、pickle 等），超出启动时间预算。
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from queue import SimpleQueue
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_ENV_VAR = 'AUTO_CLICKER_LOG_LEVEL'
+QUEUE_ENV_VAR = 'AUTO_CLICKER_LOG_QUEUE'
+
+_STOP = object()
+
+
+class QueueWriter:
+    """后台写线程：从队列取出记录后格式化并写入输出流"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.queue = SimpleQueue()
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def put(self, record):
+        if self.thread is None:
+            self._start()
+        self.queue.put(record)
+
+    def _start(self):
+        with self._lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is _STOP:
+                break
+            _write(self.stream, record)
+
+    def flush(self, timeout=1.0):
+        """停止写线程并写出队列中剩余的记录（程序退出时调用）"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join(timeout)
+        self.thread = None
+
+
+def _format(record):
+    name, level, msg, args, created = record
+    if args:
+        try:
+            msg = msg % args
+        except Exception:
+            msg = f"{msg} {args!r}"
+    if level == DEBUG:
+        return f"[{name}] {msg}"
+    return msg
+
+
+def _write(stream, record):
+    stream = stream or sys.stdout
+    try:
+        stream.write(_format(record) + '\n')
+        stream.flush()
+    except Exception:
+        pass
+
+
+class Logger:
+    """按名称区分的日志对象
+
+    debug_enabled / info_enabled 等标志在 configure() 时统一刷新，
+    热路径可以直接判断 `if log.debug_enabled:` 跳过准备参数的开销。
+    """
+
+    __slots__ = ('name', 'level', 'debug_enabled', 'info_enabled', 'warning_enabled')
+
+    def __init__(self, name):
+        self.name = name
+        self.set_level(_config['level'])
+
+    def set_level(self, level):
+        self.level = level
+        self.debug_enabled = level <= DEBUG
+        self.info_enabled = level <= INFO
+        self.warning_enabled = level <= WARNING
+
+    def log(self, level, msg, *args):
+        if level < self.level:
+            return
+        record = (self.name, level, msg, args, time.time())
+        writer = _config['writer']
+        if writer is not None:
+            writer.put(record)
+        else:
+            _write(_config['stream'], record)
+
+    def debug(self, msg, *args):
+        if self.debug_enabled:
+            self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        if self.info_enabled:
+            self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        if self.warning_enabled:
+            self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(ERROR, msg, *args)
+
+
+_config = {'level': INFO, 'stream': None, 'writer': None}
+_loggers = {}
+
+
+def get_logger(name):
+    """获取（或创建）指定名称的日志对象"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
+
+
+def configure(level=None, use_queue=None, stream=None):
+    """设置全局级别与输出方式（None 表示保持不变），对已创建的日志对象立即生效"""
+    if level is not None:
+        if isinstance(level, str):
+            level = LEVEL_NAMES.get(level.lower(), INFO)
+        _config['level'] = level
+        for logger in _loggers.values():
+            logger.set_level(level)
+    if stream is not None:
+        _config['stream'] = stream
+        if _config['writer'] is not None:
+            _config['writer'].stream = stream
+    if use_queue is not None:
+        writer = _config['writer']
+        if use_queue and writer is None:
+            _config['writer'] = QueueWriter(_config['stream'])
+        elif not use_queue and writer is not None:
+            _config['writer'] = None
+            writer.flush()
+
+
+def flush():
+    """写出队列中剩余的记录"""
+    writer = _config['writer']
+    if writer is not None:
+        writer.flush()
+
+
+configure(level=os.environ.get(LEVEL_ENV_VAR, 'info'),
+          use_queue=os.environ.get(QUEUE_ENV_VAR, '1') not in ('0', 'false', 'no'))
+atexit.register(flush)
@@ -19,48 +19,104 @@ from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QPushButton, QLabel, QSpinBox, 
                               QDoubleSpinBox, QComboBox, QCheckBox, QTextEdit,
-                              QGroupBox, QRadioButton, QButtonGroup, QMessageBox)
+                              QGroupBox, QRadioButton, QButtonGroup, QMessageBox,
+                              QFileDialog)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon
-from pynput import mouse, keyboard
-from pynput.mouse import Button, Controller as MouseController
-from pynput.keyboard import Key, Listener as KeyboardListener
-import keyboard as kb
-import configparser
 import os
 
+from config_store import load_settings
+from x11_hotkeys import X11_HOTKEY_AVAILABLE, X11HotkeyManager
+from click_engine import PynputMouse
+import startup
+
+class HoldKeyState:
+    """按住连点的热键状态
+
+    由热键监听回调在按下/松开时更新，工作线程据此阻塞或连点，
+    不再每次点击前查询系统按键状态。
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.held = False
+        self.cancelled = False
+    
+    def press(self):
+        with self._cond:
+            self.held = True
+            self._cond.notify_all()
+    
+    def release(self):
+        with self._cond:
+            self.held = False
+            self._cond.notify_all()
+    
+    def cancel(self):
+        """唤醒并结束正在等待的工作线程"""
+        with self._cond:
+            self.cancelled = True
+            self._cond.notify_all()
+    
+    def reset(self):
+        with self._cond:
+            self.cancelled = False
+    
+    def wait_held(self):
+        """阻塞直到热键按下；被取消时返回 False"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.held or self.cancelled)
+            return not self.cancelled
+    
+    def wait_released(self, timeout):
+        """最多等待 timeout 秒，热键松开或被取消时立即返回"""
+        with self._cond:
+            self._cond.wait_for(lambda: not self.held or self.cancelled, timeout)
+
 class ClickThread(QThread):
     click_signal = pyqtSignal()
     
-    def __init__(self, click_type, interval, max_clicks, hold_mode=False):
+    def __init__(self, click_type, interval, max_clicks, hold_mode=False, hold_state=None, mouse=None):
         super().__init__()
         self.click_type = click_type
         self.interval = interval
         self.max_clicks = max_clicks
         self.hold_mode = hold_mode
+        self.hold_state = hold_state if hold_state is not None else HoldKeyState()
         self.running = False
         self.click_count = 0
-        self.mouse = MouseController()
+        # 鼠标后端可注入（基准测试用假后端）；pynput 在首次连点时才导入
+        self.mouse = mouse if mouse is not None else PynputMouse()
         
     def run(self):
         self.running = True
         self.click_count = 0
         
-        button = Button.left if self.click_type == 'left' else Button.right
+        button = 'right' if self.click_type == 'right' else 'left'
+        hold_state = self.hold_state if self.hold_mode else None
+        delay = self.interval / 1000.0
         
         while self.running and (self.max_clicks == 0 or self.click_count < self.max_clicks):
-            if self.hold_mode and not kb.is_pressed('f6'):
+            # 按住模式：热键松开时阻塞，按下后立即恢复连点
+            if hold_state is not None and not hold_state.wait_held():
+                break
+            if not self.running:
                 break
                 
             self.mouse.click(button)
             self.click_count += 1
             self.click_signal.emit()
             
-            if self.interval > 0:
-                time.sleep(self.interval / 1000.0)
+            if delay > 0:
+                if hold_state is not None:
+                    # 松开热键时提前唤醒，下一轮进入阻塞
+                    hold_state.wait_released(delay)
+                else:
+                    time.sleep(delay)
     
     def stop(self):
         self.running = False
+        self.hold_state.cancel()
 
 class RecordThread(QThread):
     record_signal = pyqtSignal(str)
@@ -99,6 +155,8 @@ class RecordThread(QThread):
                 pass
     
     def run(self):
+        from pynput import mouse
+        from pynput.keyboard import Listener as KeyboardListener
         self.recording = True
         self.events = []
         
@@ -121,11 +179,11 @@ class RecordThread(QThread):
 class PlaybackThread(QThread):
     playback_signal = pyqtSignal(str)
     
-    def __init__(self, events):
+    def __init__(self, events, mouse=None):
         super().__init__()
         self.events = events
         self.running = False
-        self.mouse = MouseController()
+        self.mouse = mouse if mouse is not None else PynputMouse()
         
     def run(self):
         self.running = True
@@ -144,9 +202,9 @@ class PlaybackThread(QThread):
                     time.sleep(delay)
                 
                 x, y = event['x'], event['y']
-                button = Button.left if 'left' in event['button'] else Button.right
+                button = 'left' if 'left' in event['button'] else 'right'
                 
-                self.mouse.position = (x, y)
+                self.mouse.move(x, y)
                 self.mouse.click(button)
                 
                 self.playback_signal.emit(f"回放点击: ({x}, {y})")
@@ -156,34 +214,46 @@ class PlaybackThread(QThread):
         self.running = False
 
 class AutoClicker(QMainWindow):
+    hotkey_toggle_signal = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.click_thread = None
         self.record_thread = None
         self.playback_thread = None
-        self.config_file = 'config.ini'
+        self.x11_hotkeys = None
+        # 按住连点：热键按下/松开状态由监听回调维护
+        self.hold_state = HoldKeyState()
+        self.hold_mode_enabled = False
+        self.hotkey_down = False
+        self.hotkey_toggle_signal.connect(self.toggle_clicking)
+        self.settings = load_settings()
         self.load_config()
         
         self.init_ui()
-        self.setup_hotkeys()
+        # 热键后端在窗口第一次绘制后再加载，不拖慢窗口出现
+        startup.after_first_paint(self, self.setup_hotkeys)
         
     def load_config(self):
-        self.config = configparser.ConfigParser()
-        if os.path.exists(self.config_file):
-            self.config.read(self.config_file)
-        else:
-            self.config['Settings'] = {
-                'click_type': 'left',
-                'interval': '100',
-                'max_clicks': '0',
-                'hotkey': 'f6',
-                'hold_mode': 'false'
-            }
-            self.save_config()
+        # 从统一配置读取（进程内只解析一次）
+        click = self.settings.section('click')
+        self.config = {
+            'click_type': 'right' if click['button'] == 'right' else 'left',
+            'interval': max(1, min(10000, round(1000.0 / click['frequency']))) if click['frequency'] > 0 else 100,
+            'max_clicks': click['max_clicks'],
+            'hotkey': self.settings.get('hotkeys', 'toggle_key'),
+            'hold_mode': click['hold_mode']
+        }
     
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            self.config.write(f)
+        # 写回统一配置，由后台线程去抖后写盘
+        self.settings.update(
+            'click',
+            button=self.config['click_type'],
+            frequency=1000.0 / self.config['interval'],
+            max_clicks=self.config['max_clicks'],
+            hold_mode=self.config['hold_mode']
+        )
     
     def init_ui(self):
         self.setWindowTitle('鼠标连点器')
@@ -202,7 +272,7 @@ class AutoClicker(QMainWindow):
         type_layout.addWidget(QLabel("点击类型:"))
         self.click_type_combo = QComboBox()
         self.click_type_combo.addItems(["左键", "右键"])
-        click_type = self.config['Settings'].get('click_type', 'left')
+        click_type = self.config['click_type']
         self.click_type_combo.setCurrentText("左键" if click_type == 'left' else "右键")
         type_layout.addWidget(self.click_type_combo)
         click_layout.addLayout(type_layout)
@@ -212,7 +282,7 @@ class AutoClicker(QMainWindow):
         interval_layout.addWidget(QLabel("点击间隔 (毫秒):"))
         self.interval_spin = QSpinBox()
         self.interval_spin.setRange(1, 10000)
-        self.interval_spin.setValue(int(self.config['Settings'].get('interval', '100')))
+        self.interval_spin.setValue(self.config['interval'])
         interval_layout.addWidget(self.interval_spin)
         click_layout.addLayout(interval_layout)
         
@@ -221,14 +291,16 @@ class AutoClicker(QMainWindow):
         clicks_layout.addWidget(QLabel("点击次数 (0=无限):"))
         self.clicks_spin = QSpinBox()
         self.clicks_spin.setRange(0, 1000000)
-        self.clicks_spin.setValue(int(self.config['Settings'].get('max_clicks', '0')))
+        self.clicks_spin.setValue(self.config['max_clicks'])
         clicks_layout.addWidget(self.clicks_spin)
         click_layout.addLayout(clicks_layout)
         
         # 模式选择
         mode_layout = QHBoxLayout()
         self.hold_mode_check = QCheckBox("按住连点模式")
-        self.hold_mode_check.setChecked(self.config['Settings'].getboolean('hold_mode', False))
+        self.hold_mode_check.setChecked(self.config['hold_mode'])
+        self.hold_mode_check.toggled.connect(self.on_hold_mode_toggled)
+        self.hold_mode_enabled = self.hold_mode_check.isChecked()
         mode_layout.addWidget(self.hold_mode_check)
         click_layout.addLayout(mode_layout)
         
@@ -269,6 +341,10 @@ class AutoClicker(QMainWindow):
         self.playback_btn.clicked.connect(self.playback_recording)
         record_btn_layout.addWidget(self.playback_btn)
         
+        self.save_macro_btn = QPushButton("保存为宏")
+        self.save_macro_btn.clicked.connect(self.save_recording_as_macro)
+        record_btn_layout.addWidget(self.save_macro_btn)
+        
         record_layout.addLayout(record_btn_layout)
         
         self.record_text = QTextEdit()
@@ -285,14 +361,49 @@ class AutoClicker(QMainWindow):
         layout.addWidget(self.status_label)
         
         # 热键提示
-        hotkey_label = QLabel("热键: F6 - 开始/停止连点")
+        hotkey_name = self.config['hotkey'].upper()
+        hotkey_label = QLabel(f"热键: {hotkey_name} - 开始/停止连点（按住模式下按住连点）")
         hotkey_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(hotkey_label)
         
         self.recorded_events = []
     
     def setup_hotkeys(self):
-        kb.add_hotkey('f6', self.toggle_clicking)
+        hotkey = self.config['hotkey']
+        # Linux/X11 下优先使用 XGrabKey 后端：只有注册的热键才会唤醒Python
+        if sys.platform.startswith('linux') and X11_HOTKEY_AVAILABLE:
+            # 按住模式需要响应每一次快速按键，不做时间去抖（自动重复仍会过滤）
+            self.x11_hotkeys = X11HotkeyManager(debounce=0)
+            self.x11_hotkeys.set_bindings([([], hotkey, self.on_hotkey_down)],
+                                          [([], hotkey, self.on_hotkey_up)])
+            if self.x11_hotkeys.start_monitoring():
+                return
+            self.x11_hotkeys = None
+        try:
+            import keyboard as kb
+            kb.on_press_key(hotkey, lambda e: self.on_hotkey_down())
+            kb.on_release_key(hotkey, lambda e: self.on_hotkey_up())
+        except Exception as e:
+            print(f"全局热键不可用: {e}")
+    
+    def on_hotkey_down(self):
+        """热键按下（监听线程中调用）"""
+        if self.hotkey_down:
+            return  # 系统自动重复
+        self.hotkey_down = True
+        if self.hold_mode_enabled:
+            self.hold_state.press()
+            if self.click_thread and self.click_thread.isRunning():
+                return
+        self.hotkey_toggle_signal.emit()
+    
+    def on_hotkey_up(self):
+        """热键松开（监听线程中调用）"""
+        self.hotkey_down = False
+        self.hold_state.release()
+    
+    def on_hold_mode_toggled(self, checked):
+        self.hold_mode_enabled = checked
     
     def toggle_clicking(self):
         if self.click_thread and self.click_thread.isRunning():
@@ -306,7 +417,8 @@ class AutoClicker(QMainWindow):
         max_clicks = self.clicks_spin.value()
         hold_mode = self.hold_mode_check.isChecked()
         
-        self.click_thread = ClickThread(click_type, interval, max_clicks, hold_mode)
+        self.hold_state.reset()
+        self.click_thread = ClickThread(click_type, interval, max_clicks, hold_mode, self.hold_state)
         self.click_thread.click_signal.connect(self.update_click_count)
         self.click_thread.finished.connect(self.clicking_finished)
         
@@ -317,10 +429,10 @@ class AutoClicker(QMainWindow):
         self.status_label.setText("连点中...")
         
         # 保存设置
-        self.config['Settings']['click_type'] = click_type
-        self.config['Settings']['interval'] = str(interval)
-        self.config['Settings']['max_clicks'] = str(max_clicks)
-        self.config['Settings']['hold_mode'] = str(hold_mode)
+        self.config['click_type'] = click_type
+        self.config['interval'] = interval
+        self.config['max_clicks'] = max_clicks
+        self.config['hold_mode'] = hold_mode
         self.save_config()
     
     def stop_clicking(self):
@@ -378,8 +490,29 @@ class AutoClicker(QMainWindow):
     def playback_finished(self):
         self.status_label.setText("回放完成")
     
+    def save_recording_as_macro(self):
+        if not self.recorded_events:
+            QMessageBox.warning(self, "警告", "没有录制的内容")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "保存为宏", "recording.macro", "宏文件 (*.macro);;所有文件 (*)")
+        if not path:
+            return
+        from macro import recording_to_macro
+        text = recording_to_macro(self.recorded_events)
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except OSError as e:
+            QMessageBox.warning(self, "警告", f"保存失败: {e}")
+            return
+        self.record_text.append(text.splitlines()[0].lstrip('# '))
+        self.status_label.setText(f"已保存宏: {os.path.basename(path)}")
+    
     def closeEvent(self, a0):
         self.stop_clicking()
+        self.settings.close()
+        if self.x11_hotkeys:
+            self.x11_hotkeys.stop_monitoring()
         if self.record_thread and self.record_thread.isRunning():
             self.record_thread.stop()
         if self.playback_thread and self.playback_thread.isRunning():
@@ -389,5 +522,6 @@ class AutoClicker(QMainWindow):
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = AutoClicker()
+    startup.install_probe(window)
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行连点器 - 不需要 Qt 与窗口，适合脚本、CI 和 Xvfb 批处理
+直接驱动 click_engine，结束后向标准输出打印 JSON 统计（实际频率、抖动等）。
+
+    python3 -m auto_clicker_cli --rate 50 --count 500
+    python3 -m auto_clicker_cli --positions "100,200;300,400" --duration 10
+    python3 -m auto_clicker_cli --profile 任务1 --rate 20 --count 100
+    python3 -m auto_clicker_cli --recording events.json
+    python3 -m auto_clicker_cli --rate 1000 --duration 2 --dry-run
+    python3 -m auto_clicker_cli --jobs jobs.json --duration 60
+    python3 -m auto_clicker_cli --macro farm.macro --duration 300
+
+未指定的参数取自统一配置（~/.auto_clicker_settings.json）。
+Ctrl+C 或 SIGTERM 会停止连点并照常输出统计。
+
+--jobs 读取任务列表，在同一个调度线程上并行运行多个独立任务，例如
+    [{"name": "A", "rate": 5, "positions": [[100, 200]]},
+     {"name": "B", "rate": 20, "button": "right", "count": 100, "delay": 1.5}]
+每个任务可以使用 rate、count、duration、positions、profile、button、
+double、cycle、delay、action 字段，未指定的取统一配置。
+
+--action 把每次点击换成按住、拖动、组合键或指定间隔的双击，例如
+    --action '{"type": "hold", "duration": 0.15}'
+    --action '{"type": "drag", "from": [100, 200], "to": [400, 200], "duration": 0.3}'
+    --action '{"type": "chord", "buttons": ["left", "right"]}'
+动作的各步骤与点击一样按截止时间调度。
+
+--macro 执行宏文件（语法见 macro.py），--count / --duration 限制总点击次数与时长。
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+
+from click_engine import BUTTONS, ClickEngine, NullMouse, action_from_spec
+
+
+def parse_positions(text):
+    """"x,y;x,y" -> [(x, y), ...]"""
+    positions = []
+    for item in text.replace(' ', '').split(';'):
+        if not item:
+            continue
+        try:
+            x, y = item.split(',')
+            positions.append((int(x), int(y)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"无效的位置: {item!r}（格式 x,y;x,y）")
+    return positions
+
+
+def parse_action(text):
+    """'{"type": "hold", ...}' -> 动作步骤"""
+    try:
+        return action_from_spec(json.loads(text))
+    except (ValueError, AttributeError) as e:
+        raise argparse.ArgumentTypeError(f"无效的动作: {e}")
+
+
+def load_recording(path):
+    """读取录制文件：事件列表，或包含 "events" 字段的对象"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('events', []) if isinstance(data, dict) else data
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python3 -m auto_clicker_cli',
+        description='无界面连点器：结束后输出 JSON 统计')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--positions', type=parse_positions, help='点击位置 "x,y;x,y"，默认当前光标位置')
+    source.add_argument('--profile', help='使用位置方案库中的方案')
+    source.add_argument('--recording', help='按录制文件（JSON 事件列表）的节奏回放点击')
+    source.add_argument('--jobs', help='任务列表文件（JSON），多个任务在一个调度线程上并行运行')
+    source.add_argument('--macro', help='执行宏文件（move / click / hold / wait / loop ...）')
+    parser.add_argument('--rate', type=float, help='每秒点击次数（默认取配置）')
+    parser.add_argument('--count', type=int, help='点击次数，0 为不限（默认取配置）')
+    parser.add_argument('--duration', type=float, help='最长运行秒数')
+    parser.add_argument('--button', choices=BUTTONS, help='鼠标按键（默认取配置）')
+    parser.add_argument('--double', action='store_true', help='双击')
+    parser.add_argument('--action', type=parse_action, help='每次点击执行的动作（JSON：hold / drag / chord / double）')
+    parser.add_argument('--no-cycle', action='store_true', help='多位置时只依次点击一轮')
+    parser.add_argument('--speed', type=float, default=1.0, help='回放录制时的速度倍数')
+    parser.add_argument('--delay', type=float, default=0.0, help='开始前等待的秒数')
+    parser.add_argument('--output', help='把 JSON 统计写入文件而不是标准输出')
+    parser.add_argument('--dry-run', action='store_true', help='不注入鼠标事件，只按计划计时')
+    return parser
+
+
+def build_engine(args, kill_switch):
+    """根据命令行参数（未指定时取统一配置）构造连点引擎"""
+    from config_store import load_settings
+    click = load_settings().section('click')
+    button = args.button or click['button']
+    double = args.double or click['click_type'] == 'double'
+
+    if args.macro:
+        from macro import MacroError, load_macro
+        try:
+            program = load_macro(args.macro)
+        except MacroError as e:
+            raise SystemExit(f"{args.macro}: {e}")
+        return ClickEngine(rate=0, count=args.count or 0, duration=args.duration,
+                           kill_switch=kill_switch, program=program)
+
+    if args.recording:
+        return ClickEngine.from_recording(load_recording(args.recording), speed=args.speed,
+                                          button=button, double=double,
+                                          duration=args.duration, kill_switch=kill_switch)
+
+    positions = args.positions
+    cycle = not args.no_cycle
+    if args.profile:
+        from profile_library import ProfileLibrary
+        profile = ProfileLibrary().load(args.profile)
+        if profile is None:
+            raise SystemExit(f"找不到位置方案: {args.profile}")
+        positions = profile['positions']
+        cycle = cycle and profile['cycle_mode']
+
+    rate = args.rate if args.rate is not None else click['frequency']
+    if rate <= 0:
+        raise SystemExit("--rate 必须大于 0")
+    count = args.count if args.count is not None else click['max_clicks']
+    if count == 0 and args.duration is None and not (positions and not cycle):
+        print("未限制次数与时长，按 Ctrl+C 停止", file=sys.stderr)
+    return ClickEngine(rate=rate, count=count, duration=args.duration, positions=positions,
+                       button=button, double=double, cycle=cycle, kill_switch=kill_switch,
+                       action=args.action)
+
+
+def build_scheduler(args):
+    """根据任务列表文件构造调度器（每个任务未指定的字段取统一配置）"""
+    from config_store import load_settings
+    from job_scheduler import JobScheduler, job_from_spec
+    click = dict(load_settings().section('click'))
+    if args.button:
+        click['button'] = args.button
+    with open(args.jobs, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    if isinstance(specs, dict):
+        specs = specs.get('jobs', [])
+
+    scheduler = JobScheduler()
+    for n, spec in enumerate(specs, 1):
+        if args.duration is not None:
+            spec.setdefault('duration', args.duration)
+        try:
+            job = job_from_spec(spec, click, default_name=f'job{n}')
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if job.action is None and args.action is not None:
+            job.action = args.action
+        scheduler.submit(job)
+    return scheduler
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    kill_switch = threading.Event()
+    if args.jobs:
+        runner = build_scheduler(args)
+        stop = runner.close
+    else:
+        runner = build_engine(args, kill_switch)
+        stop = kill_switch.set
+    if args.dry_run:
+        runner.mouse = NullMouse()
+
+    # 信号处理只置位停止开关，引擎在下一次等待时立即退出
+    def on_signal(signum, frame):
+        kill_switch.set()
+        stop()
+    signal.signal(signal.SIGINT, on_signal)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, on_signal)
+
+    if args.delay > 0 and kill_switch.wait(args.delay):
+        summary = {'clicks': 0, 'stopped_by': 'stop'}
+    elif args.jobs:
+        started = time.perf_counter()
+        jobs = runner.run()
+        summary = {
+            'clicks': sum(job['clicks'] for job in jobs),
+            'elapsed_s': round(time.perf_counter() - started, 4),
+            'jobs': jobs,
+        }
+    else:
+        summary = runner.run()
+    summary.update({
+        'mode': 'jobs' if args.jobs else 'macro' if args.macro else 'recording' if args.recording else 'profile' if args.profile else 'rate',
+        'positions': sum(len(job.positions) for job in runner.jobs) if args.jobs else len(runner.positions),
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    })
+
+    text = json.dumps(summary, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text, flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
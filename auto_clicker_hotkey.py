@@ -13,54 +13,51 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                              QGroupBox, QTextEdit, QShortcut)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QKeySequence
-from pynput.mouse import Controller, Button
-from pynput import keyboard
+
+from config_store import (load_settings, button_label, button_value,
+                          click_type_label, click_type_value)
+from click_engine import ClickEngine, PynputMouse, double_click
+from x11_hotkeys import X11_HOTKEY_AVAILABLE, X11HotkeyManager
+import startup
 
 
 class ClickWorker(QThread):
     click_signal = pyqtSignal(int)
     
-    def __init__(self, config):
+    def __init__(self, config, mouse=None):
         super().__init__()
         self.config = config
         self.running = False
-        self.mouse = Controller()
+        # 鼠标后端可注入（基准测试用假后端）；pynput 在首次连点时才导入
+        self.mouse = mouse if mouse is not None else PynputMouse()
+        self.kill_switch = threading.Event()
         self.click_count = 0
         
     def run(self):
         self.running = True
         self.click_count = 0
         
-        button_map = {
-            '左键': Button.left,
-            '右键': Button.right,
-            '中键': Button.middle
-        }
-        button = button_map[self.config['button']]
-        
-        interval = 1.0 / self.config['frequency']
-        
-        while self.running and self.click_count < self.config['max_clicks']:
-            if self.config['click_type'] == '单击':
-                self.mouse.click(button)
-            else:  # 双击
-                self.mouse.click(button)
-                time.sleep(0.01)
-                self.mouse.click(button)
-            
-            self.click_count += 1
-            self.click_signal.emit(self.click_count)
-            
-            if not self.running:
-                break
-                
-            time.sleep(interval)
+        # 双击的第二次点击由引擎在同一条截止时间线上调度，不再额外 sleep
+        action = double_click(gap=0.01) if self.config['click_type'] != '单击' else None
+        engine = ClickEngine(rate=self.config['frequency'], count=self.config['max_clicks'],
+                             button=button_value(self.config['button']), action=action,
+                             mouse=self.mouse, kill_switch=self.kill_switch, on_click=self._on_click)
+        engine.run()
+        self.running = False
+    
+    def _on_click(self, index, position):
+        self.click_count = index + 1
+        self.click_signal.emit(self.click_count)
     
     def stop(self):
         self.running = False
+        self.kill_switch.set()
 
 
 class MouseClicker(QMainWindow):
+    hotkey_start_signal = pyqtSignal()
+    hotkey_stop_signal = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.worker = None
@@ -72,10 +69,15 @@ class MouseClicker(QMainWindow):
             'hotkey_start': 'f6',
             'hotkey_stop': 'f7'
         }
+        self.settings = load_settings()
         self.load_config()
         self.hotkey_listener = None
+        self.x11_hotkeys = None
+        self.hotkey_start_signal.connect(self.start_clicking)
+        self.hotkey_stop_signal.connect(self.stop_clicking)
         self.init_ui()
-        self.setup_hotkeys()
+        # 热键后端在窗口第一次绘制后再加载，不拖慢窗口出现
+        startup.after_first_paint(self, self.setup_hotkeys)
         
     def init_ui(self):
         self.setWindowTitle('鼠标连点器 (带热键)')
@@ -201,19 +203,46 @@ class MouseClicker(QMainWindow):
         central_widget.setLayout(layout)
         
     def setup_hotkeys(self):
+        # Linux/X11 下优先使用 XGrabKey 后端：只有注册的热键才会唤醒Python
+        if sys.platform.startswith('linux') and X11_HOTKEY_AVAILABLE:
+            self.x11_hotkeys = X11HotkeyManager()
+            self.x11_hotkeys.set_bindings([
+                ([], self.config['hotkey_start'], self.hotkey_start_signal.emit),
+                ([], self.config['hotkey_stop'], self.hotkey_stop_signal.emit),
+            ])
+            if self.x11_hotkeys.start_monitoring():
+                return
+            self.x11_hotkeys = None
+        
+        pressed_keys = set()
+        
+        def key_to_name(key):
+            return key.char.lower() if hasattr(key, 'char') else str(key).split('.')[1].lower()
+        
         def on_key_press(key):
             try:
-                key_name = key.char.lower() if hasattr(key, 'char') else str(key).split('.')[1].lower()
+                key_name = key_to_name(key)
+                # 按住不放时系统会不断重复按下事件，每次物理按键只处理一次
+                if key_name in pressed_keys:
+                    return
+                pressed_keys.add(key_name)
                 
                 if key_name == self.config['hotkey_start']:
-                    self.start_clicking()
+                    self.hotkey_start_signal.emit()
                 elif key_name == self.config['hotkey_stop']:
-                    self.stop_clicking()
+                    self.hotkey_stop_signal.emit()
+            except:
+                pass
+        
+        def on_key_release(key):
+            try:
+                pressed_keys.discard(key_to_name(key))
             except:
                 pass
         
         def listen_for_hotkeys():
-            with keyboard.Listener(on_press=on_key_press) as listener:
+            from pynput import keyboard
+            with keyboard.Listener(on_press=on_key_press, on_release=on_key_release) as listener:
                 self.hotkey_listener = listener
                 listener.join()
         
@@ -254,18 +283,25 @@ class MouseClicker(QMainWindow):
         self.count_label.setText(f"点击次数: {count}")
         
     def load_config(self):
-        try:
-            with open('config_hotkey.json', 'r') as f:
-                self.config.update(json.load(f))
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+        # 从统一配置读取（进程内只解析一次），限制在本界面的取值范围内
+        click = self.settings.section('click')
+        hotkeys = self.settings.section('hotkeys')
+        self.config['frequency'] = max(1, min(100, round(click['frequency'])))
+        self.config['max_clicks'] = max(1, min(10000, click['max_clicks'])) if click['max_clicks'] else self.config['max_clicks']
+        self.config['button'] = button_label(click['button'])
+        self.config['click_type'] = click_type_label(click['click_type'])
+        self.config['hotkey_start'] = hotkeys['start_key']
+        self.config['hotkey_stop'] = hotkeys['stop_key']
             
     def save_config(self):
-        try:
-            with open('config_hotkey.json', 'w') as f:
-                json.dump(self.config, f, indent=2)
-        except Exception:
-            pass
+        # 写回统一配置，由后台线程去抖后写盘
+        self.settings.update(
+            'click',
+            frequency=self.config['frequency'],
+            max_clicks=self.config['max_clicks'],
+            button=button_value(self.config['button']),
+            click_type=click_type_value(self.config['click_type'])
+        )
             
     def closeEvent(self, a0):
         if self.worker and self.worker.isRunning():
@@ -273,7 +309,10 @@ class MouseClicker(QMainWindow):
             self.worker.wait()
         if self.hotkey_listener:
             self.hotkey_listener.stop()
+        if self.x11_hotkeys:
+            self.x11_hotkeys.stop_monitoring()
         self.save_config()
+        self.settings.close()
         if a0:
             a0.accept()
 
@@ -283,6 +322,7 @@ def main():
     app.setStyle('Fusion')
     
     window = MouseClicker()
+    startup.install_probe(window)
     window.show()
     
     sys.exit(app.exec_())
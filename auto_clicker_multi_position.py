@@ -13,54 +13,27 @@ import os
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QWidget, QPushButton, QLabel, QSpinBox, QComboBox,
                              QGroupBox, QCheckBox, QSlider, QTextEdit, QShortcut,
-                             QListWidget, QListWidgetItem, QMessageBox, QInputDialog)
+                             QListWidget, QListWidgetItem, QMessageBox, QInputDialog,
+                             QFileDialog)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QCloseEvent, QKeySequence
-from pynput.mouse import Controller, Button
-from pynput import mouse
-
-# 尝试导入原生macOS热键支持
-try:
-    from AppKit import NSApplication  # type: ignore
-    import Quartz  # type: ignore
-    NATIVE_HOTKEY_AVAILABLE = True
-except Exception:
-    NATIVE_HOTKEY_AVAILABLE = False
-    class Quartz:  # type: ignore
-        @staticmethod
-        def CGEventTapCreate(*args): return None
-        @staticmethod
-        def CGEventTapEnable(*args): pass
-        @staticmethod
-        def CGEventGetIntegerValueField(*args): return 0
-        @staticmethod
-        def CGEventGetFlags(*args): return 0
-        @staticmethod
-        def CFMachPortCreateRunLoopSource(*args): return None
-        @staticmethod
-        def CFRunLoopAddSource(*args): pass
-        @staticmethod
-        def CFRunLoopGetCurrent(*args): return None
-        @staticmethod
-        def CFRunLoopRunInMode(*args): return None
-        @staticmethod
-        def CFMachPortInvalidate(*args): pass
-        kCGEventKeyDown = 10
-        kCGEventFlagsChanged = 12
-        kCGKeyboardEventKeycode = 9
-        kCGSessionEventTap = 0
-        kCGHeadInsertEventTap = 0
-        kCGEventTapOptionDefault = 0
-        kCGHIDEventTap = 0
-        kCGEventTapOptionListenOnly = 1
-        kCGEventTapDisabledByTimeout = 0
-        kCGEventTapDisabledByUserInput = 1
-        kCFRunLoopCommonModes = 'kCFRunLoopCommonModes'
-        kCFRunLoopDefaultMode = 'kCFRunLoopDefaultMode'
-        kCGEventFlagMaskCommand = 1048576
-        kCGEventFlagMaskAlternate = 524288
-        kCGEventFlagMaskControl = 262144
-        kCGEventFlagMaskShift = 131072
+
+from config_store import (load_settings, button_label, button_value,
+                          click_type_label, click_type_value)
+from hotkey_dispatch import HotkeyDispatchTable, mods_from_flags, native_hotkey_available, load_quartz
+from profile_library import ProfileLibrary
+from click_engine import PynputMouse
+from click_metrics import ClickMetrics
+from metrics_panel import MetricsPanel
+from permission_probe import PermissionCache
+import startup
+import tracing
+from app_logging import get_logger
+
+log = get_logger('multi_position')
+
+# 原生macOS热键支持：启动时只检查是否可用，Quartz 在开始监听时才导入
+NATIVE_HOTKEY_AVAILABLE = native_hotkey_available()
 
 
 class MultiPositionClickWorker(QThread):
@@ -68,7 +41,8 @@ class MultiPositionClickWorker(QThread):
     finished = pyqtSignal()
     position_changed = pyqtSignal(int, str)  # 位置索引, 位置描述
     
-    def __init__(self, positions, click_type, frequency, max_clicks, button_type, cycle_mode=True):
+    def __init__(self, positions, click_type, frequency, max_clicks, button_type, cycle_mode=True,
+                 kill_switch=None, mouse=None, metrics=None, human_motion=False):
         super().__init__()
         self.positions = positions  # [(x, y, name), ...]
         self.click_type = click_type
@@ -76,27 +50,48 @@ class MultiPositionClickWorker(QThread):
         self.max_clicks = max_clicks
         self.button_type = button_type
         self.cycle_mode = cycle_mode  # 是否循环点击所有位置
+        # 线程安全的停止开关：紧急停止监听器可直接置位，无需经过Qt事件队列
+        self.kill_switch = kill_switch if kill_switch is not None else threading.Event()
         self.running = False
-        self.mouse = Controller()
-        
+        # 鼠标后端可注入（基准测试用假后端）；pynput 在首次连点时才导入
+        self.mouse = mouse if mouse is not None else PynputMouse()
+        self.metrics = metrics  # 可选的 ClickMetrics，界面定时采样
+        self.human_motion = human_motion  # 沿拟人轨迹移动而不是瞬移到目标
+        
+    def _plan_motion(self, interval):
+        """预先生成各段移动路径（numpy 可用时向量化计算），返回 (各段路径, 第一段路径)"""
+        import trajectory
+        targets = [(x, y) for x, y, _ in self.positions]
+        # 移动至多占点击间隔的 80%，不拖慢点击节奏
+        legs = trajectory.plan_cycle(targets, max_duration=0.8 * interval)
+        try:
+            current = self.mouse.position()
+        except Exception:
+            current = targets[-1]
+        return legs, trajectory.plan(current, targets[0], max_duration=0.8 * interval)
+
     def run(self):
         """执行多位置点击"""
         self.running = True
+        kill_switch = self.kill_switch
         click_count = 0
         position_index = 0
         
-        # 按钮映射
-        button_map = {
-            '左键': Button.left,
-            '右键': Button.right,
-            '中键': Button.middle
-        }
-        button = button_map.get(self.button_type, Button.left)
+        button = button_value(self.button_type)
         
         # 计算点击间隔
         interval = 1.0 / self.frequency
-        
-        while self.running:
+        metrics = self.metrics
+        motion = None
+        if self.human_motion and self.positions:
+            from trajectory import stream
+            legs, path = self._plan_motion(interval)
+            motion = 0
+        due = time.perf_counter()
+        if motion is not None:
+            due += path.duration
+        
+        while self.running and not kill_switch.is_set():
             if not self.positions:
                 break
                 
@@ -111,19 +106,34 @@ class MultiPositionClickWorker(QThread):
             # 发送位置变更信号
             self.position_changed.emit(position_index + 1, name)
             
-            # 移动鼠标到目标位置
-            self.mouse.position = (x, y)
-            time.sleep(0.01)  # 短暂延迟确保鼠标移动到位
+            if motion is not None:
+                # 沿预先算好的路径移动（同一段的几条路径轮流使用），到位后等到截止时间
+                if not stream(self.mouse, path, kill_switch):
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0 and kill_switch.wait(delay):
+                    break
+            else:
+                # 移动鼠标到目标位置
+                self.mouse.move(x, y)
+                # 短暂延迟确保鼠标移动到位，停止开关置位时立即返回
+                if kill_switch.wait(0.01):
+                    break
             
-            # 再次检查running状态
-            if not self.running:
+            # 每次注入点击前检查停止开关
+            if not self.running or kill_switch.is_set():
                 break
             
             # 执行点击
-            if self.click_type == '单击':
-                self.mouse.click(button)
-            elif self.click_type == '双击':
-                self.mouse.click(button, 2)
+            started = time.perf_counter()
+            with tracing.span('multi.click', position_index):
+                if self.click_type == '单击':
+                    self.mouse.click(button)
+                elif self.click_type == '双击':
+                    self.mouse.click(button, 2)
+            if metrics is not None:
+                metrics.record(due, started, time.perf_counter())
+            due = started + interval
                 
             click_count += 1
             
@@ -134,30 +144,39 @@ class MultiPositionClickWorker(QThread):
             if not self.cycle_mode and position_index == 0 and click_count >= len(self.positions):
                 break
                 
-            # 等待下次点击 - 分解为小段sleep以便及时响应停止信号
-            remaining_time = interval
-            while remaining_time > 0 and self.running:
-                sleep_time = min(0.05, remaining_time)  # 每次最多sleep 50ms
-                time.sleep(sleep_time)
-                remaining_time -= sleep_time
+            if motion is not None:
+                # 下一段移动在截止时间之前进行
+                motion += 1
+                leg = legs[position_index]
+                path = leg[motion % len(leg)]
+                continue
+                
+            # 等待下次点击 - 停止开关置位时立即唤醒
+            if kill_switch.wait(interval):
+                break
             
         self.finished.emit()
         
     def stop(self):
         """停止点击"""
         self.running = False
+        self.kill_switch.set()
 
 
 class NativeHotkeyManager:
     """原生热键管理器"""
     
-    def __init__(self, callback_start, callback_stop):
+    def __init__(self, callback_start, callback_stop, callback_profile=None):
         self.callback_start = callback_start
         self.callback_stop = callback_stop
+        self.callback_profile = callback_profile  # 热键切换方案后的通知回调(name)
         self.event_tap = None
         self.run_loop_source = None
         self.monitoring = False
         self.monitor_thread = None
+        self.quartz = None
+        # 预编译的分发表：{(键码, 修饰键掩码): 回调}
+        self.dispatch_table = HotkeyDispatchTable()
         
         # 默认热键配置
         self.hotkey_config = {
@@ -168,25 +187,41 @@ class NativeHotkeyManager:
             'stop': {
                 'ctrl': True, 'option': True, 'shift': False, 'command': False,
                 'key': 'D'
-            }
+            },
+            # 命名方案: {名称: {'switch': 组合键, 'start'/'stop': 可选覆盖, 'job': 连点参数}}
+            'profiles': {}
         }
+        self._compile_bindings()
         
     def update_hotkey_config(self, cfg: dict):
-        """更新热键配置"""
+        """更新热键配置
+
+        新绑定编译完成后整表替换，监听线程保持运行，不存在热键失效的窗口期。
+        """
         if 'start' in cfg:
             self.hotkey_config['start'].update(cfg['start'])
         if 'stop' in cfg:
             self.hotkey_config['stop'].update(cfg['stop'])
-            
-        # 重启监听
-        if self.monitoring:
-            self.stop_monitoring()
-            self.start_monitoring()
+        if 'profiles' in cfg:
+            self.hotkey_config['profiles'] = dict(cfg['profiles'])
+        self._compile_bindings()
+        
+    def switch_profile(self, name):
+        """切换热键方案（可在监听线程中调用）"""
+        if not self.dispatch_table.activate_profile(name):
+            return False
+        if self.callback_profile:
+            self.callback_profile(name)
+        return True
             
     def start_monitoring(self):
         """开始监听热键"""
         if not NATIVE_HOTKEY_AVAILABLE or self.monitoring:
             return False
+        if self.quartz is None:
+            self.quartz = load_quartz()
+            if self.quartz is None:
+                return False
             
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self._run_event_tap, daemon=True)
@@ -196,6 +231,7 @@ class NativeHotkeyManager:
     def stop_monitoring(self):
         """停止监听热键"""
         self.monitoring = False
+        Quartz = self.quartz
         
         if self.event_tap:
             try:
@@ -205,27 +241,26 @@ class NativeHotkeyManager:
                 self.event_tap = None
                 self.run_loop_source = None
             except Exception as e:
-                print(f"停止热键监听时出错: {e}")
+                log.error("停止热键监听时出错: %s", e)
                 
     def _run_event_tap(self):
         """运行事件监听"""
+        Quartz = self.quartz
         try:
             def event_callback(proxy, event_type, event, refcon):
                 try:
                     if event_type == Quartz.kCGEventKeyDown:
                         keycode = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode)
                         flags = Quartz.CGEventGetFlags(event)
-                        
-                        # 检查开始热键
-                        if self._check_hotkey_match(keycode, flags, 'start'):
-                            self.callback_start()
-                            
-                        # 检查停止热键
-                        elif self._check_hotkey_match(keycode, flags, 'stop'):
-                            self.callback_stop()
+                        autorepeat = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventAutorepeat)
+                        # 一次字典查找完成匹配；自动重复与抖动在分发表中过滤
+                        self.dispatch_table.press(keycode, flags, autorepeat)
+                    elif event_type == Quartz.kCGEventKeyUp:
+                        keycode = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode)
+                        self.dispatch_table.release(keycode)
                             
                 except Exception as e:
-                    print(f"热键回调错误: {e}")
+                    log.error("热键回调错误: %s", e)
                     
                 return event
                 
@@ -234,13 +269,13 @@ class NativeHotkeyManager:
                 Quartz.kCGSessionEventTap,
                 Quartz.kCGHeadInsertEventTap,
                 Quartz.kCGEventTapOptionDefault,
-                1 << Quartz.kCGEventKeyDown,
+                (1 << Quartz.kCGEventKeyDown) | (1 << Quartz.kCGEventKeyUp),
                 event_callback,
                 None
             )
             
             if not self.event_tap:
-                print("无法创建事件监听")
+                log.error("无法创建事件监听")
                 return
                 
             # 创建运行循环源
@@ -255,36 +290,107 @@ class NativeHotkeyManager:
                 Quartz.CFRunLoopRunInMode(Quartz.kCFRunLoopDefaultMode, 0.1, False)
                 
         except Exception as e:
-            print(f"热键监听错误: {e}")
-            
-    def _check_hotkey_match(self, keycode, flags, hotkey_type):
-        """检查热键是否匹配"""
-        config = self.hotkey_config[hotkey_type]
-        
-        # 键码映射
-        key_map = {
-            'S': 1, 'D': 2, 'F': 3, 'G': 5, 'H': 4, 'J': 38, 'K': 40, 'L': 37
-        }
-        
-        expected_keycode = key_map.get(config['key'], 1)
-        if keycode != expected_keycode:
-            return False
+            log.error("热键监听错误: %s", e)
             
-        # 检查修饰键
-        ctrl_pressed = bool(flags & Quartz.kCGEventFlagMaskControl)  # type: ignore
-        option_pressed = bool(flags & Quartz.kCGEventFlagMaskAlternate)  # type: ignore
-        shift_pressed = bool(flags & Quartz.kCGEventFlagMaskShift)  # type: ignore
-        command_pressed = bool(flags & Quartz.kCGEventFlagMaskCommand)  # type: ignore
-        
-        return (ctrl_pressed == config['ctrl'] and
-                option_pressed == config['option'] and
-                shift_pressed == config['shift'] and
-                command_pressed == config['command'])
+    def _compile_bindings(self):
+        """将开始/停止热键及方案切换热键编译进分发表"""
+        start_cfg = self.hotkey_config['start']
+        stop_cfg = self.hotkey_config['stop']
+        bindings = [
+            (mods_from_flags(start_cfg), start_cfg.get('key', 'S'), self.callback_start),
+            (mods_from_flags(stop_cfg), stop_cfg.get('key', 'D'), self.callback_stop),
+        ]
+        profile_bindings = {}
+        for name, profile in self.hotkey_config.get('profiles', {}).items():
+            switch = profile.get('switch')
+            if switch and switch.get('key'):
+                bindings.append((mods_from_flags(switch), switch['key'],
+                                 lambda n=name: self.switch_profile(n)))
+            # 方案可覆盖开始/停止组合键，仅在该方案激活时生效
+            own = []
+            if profile.get('start'):
+                own.append((mods_from_flags(profile['start']), profile['start'].get('key'), self.callback_start))
+            if profile.get('stop'):
+                own.append((mods_from_flags(profile['stop']), profile['stop'].get('key'), self.callback_stop))
+            profile_bindings[name] = own
+        self.set_bindings(bindings)
+        self.dispatch_table.set_profiles(profile_bindings)
+
+    def set_bindings(self, bindings):
+        """设置任意数量的热键绑定：[(修饰键列表, 主键, 回调), ...]"""
+        self.dispatch_table.compile(bindings)
+
+
+class EmergencyListenerManager:
+    """紧急停止监听器生命周期管理
+
+    全局鼠标/键盘监听只在连点任务运行期间挂载，任务结束即卸载，
+    空闲时不再处理任何系统输入事件。pynput 监听器无法重复启动，
+    因此每次挂载都会新建监听器实例。
+    """
+
+    def __init__(self, on_mouse_move, on_key_press):
+        # 启用追踪时记录每次回调在监听线程中的耗时
+        self.on_mouse_move = tracing.traced('emergency.on_mouse_move')(on_mouse_move)
+        self.on_key_press = tracing.traced('emergency.on_key_press')(on_key_press)
+        self.kill_switch = None
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self._lock = threading.Lock()
+
+    @property
+    def attached(self):
+        return self.mouse_listener is not None or self.keyboard_listener is not None
+
+    def attach(self, kill_switch=None):
+        """挂载监听器（已挂载时忽略）
+
+        kill_switch 为当前任务的停止开关，trigger() 会直接置位它。
+        """
+        with self._lock:
+            self.kill_switch = kill_switch
+            if self.attached:
+                return True
+            try:
+                from pynput import mouse, keyboard
+                self.mouse_listener = mouse.Listener(on_move=self.on_mouse_move)
+                self.keyboard_listener = keyboard.Listener(on_press=self.on_key_press)
+                self.mouse_listener.start()
+                self.keyboard_listener.start()
+                return True
+            except Exception as e:
+                log.error("紧急停止功能启动失败: %s", e)
+                self._stop_listeners()
+                return False
+
+    def detach(self):
+        """卸载监听器（未挂载时忽略）"""
+        with self._lock:
+            self._stop_listeners()
+            self.kill_switch = None
+
+    def trigger(self):
+        """在监听线程中直接停止当前任务，不依赖GUI线程是否空闲"""
+        tracing.instant('emergency.trigger')
+        kill_switch = self.kill_switch
+        if kill_switch is not None:
+            kill_switch.set()
+
+    def _stop_listeners(self):
+        for listener in (self.mouse_listener, self.keyboard_listener):
+            if listener is not None:
+                try:
+                    listener.stop()
+                except Exception:
+                    pass
+        self.mouse_listener = None
+        self.keyboard_listener = None
 
 
 class AutoClickerMultiPosition(QMainWindow):
     hotkey_start_signal = pyqtSignal()
     hotkey_stop_signal = pyqtSignal()
+    hotkey_profile_signal = pyqtSignal(str)
     emergency_stop_signal = pyqtSignal()
     
     def __init__(self):
@@ -294,14 +400,18 @@ class AutoClickerMultiPosition(QMainWindow):
         self.capturing_position = False
         self.mouse_listener = None
         
-        # 紧急停止相关
-        self.emergency_mouse_listener = None
-        self.emergency_keyboard_listener = None
+        # 紧急停止相关（监听器仅在连点期间挂载）
+        self.emergency_listeners = None
+        self.screen_size = (1920, 1080)
         self.esc_press_count = 0
         self.last_esc_time = 0
         
-        # 配置文件路径
-        self.config_file = os.path.join(os.path.expanduser('~'), '.auto_clicker_multi_config.json')
+        # 统一配置（进程内共享，后台去抖写盘）
+        self.settings = load_settings()
+        # 位置方案库：启动时只读取索引，方案内容选中时才加载
+        self.profile_library = ProfileLibrary()
+        # 权限探测结果缓存：窗口显示后在后台预探测，开始连点时不再阻塞
+        self.permission_cache = PermissionCache()
         
         # 热键配置
         self.hotkey_config = {
@@ -312,13 +422,15 @@ class AutoClickerMultiPosition(QMainWindow):
             'stop': {
                 'ctrl': True, 'option': True, 'shift': False, 'command': False,
                 'key': 'D'
-            }
+            },
+            'profiles': {}
         }
         
 
         
         self.init_ui()
-        self.setup_hotkeys()
+        # 热键后端在窗口第一次绘制后再加载，不拖慢窗口出现
+        startup.after_first_paint(self, self.setup_hotkeys)
         
         # 初始化热键配置UI（在UI创建之后）
         self._refresh_hotkey_ui()
@@ -364,6 +476,24 @@ class AutoClickerMultiPosition(QMainWindow):
         pos_button_layout.addWidget(self.clear_positions_btn)
         
         position_layout.addLayout(pos_button_layout)
+
+        # 位置方案：每个任务一组位置，选中时才从磁盘加载
+        pos_profile_row = QHBoxLayout()
+        pos_profile_row.addWidget(QLabel('位置方案:'))
+        self.cmb_position_profile = QComboBox()
+        self.cmb_position_profile.activated.connect(self.on_position_profile_selected)
+        pos_profile_row.addWidget(self.cmb_position_profile, 1)
+        self.btn_save_position_profile = QPushButton('保存')
+        self.btn_save_position_profile.clicked.connect(self.save_position_profile)
+        pos_profile_row.addWidget(self.btn_save_position_profile)
+        self.btn_delete_position_profile = QPushButton('删除')
+        self.btn_delete_position_profile.clicked.connect(self.delete_position_profile)
+        pos_profile_row.addWidget(self.btn_delete_position_profile)
+        self.btn_import_position_profile = QPushButton('导入')
+        self.btn_import_position_profile.clicked.connect(self.import_position_profile)
+        pos_profile_row.addWidget(self.btn_import_position_profile)
+        position_layout.addLayout(pos_profile_row)
+
         position_group.setLayout(position_layout)
         layout.addWidget(position_group)
         
@@ -412,6 +542,9 @@ class AutoClickerMultiPosition(QMainWindow):
         self.cycle_checkbox = QCheckBox('循环点击所有位置')
         self.cycle_checkbox.setChecked(True)
         cycle_layout.addWidget(self.cycle_checkbox)
+        self.motion_checkbox = QCheckBox('模拟真实鼠标移动轨迹')
+        self.motion_checkbox.setToolTip('沿带弯曲和抖动的路径移动到目标，适用于忽略光标瞬移的程序')
+        cycle_layout.addWidget(self.motion_checkbox)
         basic_layout.addLayout(cycle_layout)
         
         basic_group.setLayout(basic_layout)
@@ -493,6 +626,20 @@ class AutoClickerMultiPosition(QMainWindow):
         btn_row.addWidget(self.btn_apply_hotkey)
         hk_cfg_layout.addLayout(btn_row)
         
+        # 热键方案：每个方案保存一组连点参数，可用 Ctrl+Option+数字 切换
+        profile_row = QHBoxLayout()
+        profile_row.addWidget(QLabel('热键方案:'))
+        self.cmb_hotkey_profile = QComboBox()
+        self.cmb_hotkey_profile.activated.connect(self.on_profile_selected)
+        profile_row.addWidget(self.cmb_hotkey_profile)
+        self.btn_save_profile = QPushButton('保存为方案')
+        self.btn_save_profile.clicked.connect(self.save_hotkey_profile)
+        profile_row.addWidget(self.btn_save_profile)
+        self.btn_delete_profile = QPushButton('删除方案')
+        self.btn_delete_profile.clicked.connect(self.delete_hotkey_profile)
+        profile_row.addWidget(self.btn_delete_profile)
+        hk_cfg_layout.addLayout(profile_row)
+        
         hk_cfg_group.setLayout(hk_cfg_layout)
         hotkey_layout.addWidget(hk_cfg_group)
 
@@ -511,6 +658,10 @@ class AutoClickerMultiPosition(QMainWindow):
         self.current_position_label.setStyleSheet("padding: 5px; background-color: #f0f0f0; border-radius: 3px;")
         layout.addWidget(self.current_position_label)
         
+        # 运行指标（勾选后显示）
+        self.metrics_panel = MetricsPanel()
+        layout.addWidget(self.metrics_panel)
+        
         # 使用说明
         help_group = QGroupBox("使用说明")
         help_layout = QVBoxLayout()
@@ -539,7 +690,8 @@ class AutoClickerMultiPosition(QMainWindow):
         if NATIVE_HOTKEY_AVAILABLE:
             self.hotkey_manager = NativeHotkeyManager(
                 self.hotkey_start_signal.emit,
-                self.hotkey_stop_signal.emit
+                self.hotkey_stop_signal.emit,
+                self.hotkey_profile_signal.emit
             )
             self.hotkey_manager.update_hotkey_config(self.hotkey_config)
             native_ok = self.hotkey_manager.start_monitoring()
@@ -555,11 +707,15 @@ class AutoClickerMultiPosition(QMainWindow):
         # 连接热键信号
         self.hotkey_start_signal.connect(self.start_clicking)
         self.hotkey_stop_signal.connect(self.stop_clicking)
+        self.hotkey_profile_signal.connect(self.on_hotkey_profile)
         self.emergency_stop_signal.connect(self.emergency_stop)
         
-        # 启动紧急停止监听
+        # 准备紧急停止监听（连点开始时才挂载）
         self.setup_emergency_stop()
         
+        # 预先探测权限，第一次开始连点时直接使用结果
+        self.permission_cache.refresh_async()
+        
     def start_position_capture(self):
         """开始捕获位置"""
         if self.capturing_position:
@@ -569,14 +725,16 @@ class AutoClickerMultiPosition(QMainWindow):
         self.capture_position_btn.setText('点击鼠标捕获位置...')
         self.capture_position_btn.setEnabled(False)
         
+        from pynput import mouse
+        from pynput.mouse import Button
+
         def on_click(x, y, button, pressed):
-            print(f"鼠标事件: x={x}, y={y}, button={button}, pressed={pressed}")  # 调试信息
+            log.debug("鼠标事件: x=%s, y=%s, button=%s, pressed=%s", x, y, button, pressed)
             if pressed and button == Button.left:
-                print(f"检测到左键点击: ({x}, {y})")  # 调试信息
+                log.debug("检测到左键点击: (%s, %s)", x, y)
                 # 保存坐标并使用QTimer在主线程中执行UI操作
                 self.captured_x = x
                 self.captured_y = y
-                print("调用QTimer.singleShot")  # 调试信息
                 QTimer.singleShot(0, self.handle_position_capture)
                 return False  # 停止监听
                 
@@ -584,14 +742,14 @@ class AutoClickerMultiPosition(QMainWindow):
             self.mouse_listener = mouse.Listener(on_click=on_click)
             self.mouse_listener.start()
         except Exception as e:
-            print(f"启动鼠标监听失败: {e}")
+            log.error("启动鼠标监听失败: %s", e)
             self.capturing_position = False
             self.capture_position_btn.setText('捕获位置')
             self.capture_position_btn.setEnabled(True)
     
     def handle_position_capture(self):
         """处理位置捕获的UI操作"""
-        print("handle_position_capture函数被调用")  # 调试信息
+        log.debug("handle_position_capture 被调用")
         try:
             x, y = self.captured_x, self.captured_y
             # 确保窗口在最前面
@@ -606,9 +764,8 @@ class AutoClickerMultiPosition(QMainWindow):
             msg.setDefaultButton(QMessageBox.Yes)
             msg.setWindowFlags(msg.windowFlags() | Qt.WindowStaysOnTopHint)  # type: ignore
             
-            print("显示对话框")  # 调试信息
             reply = msg.exec_()
-            print(f"对话框返回: {reply}")  # 调试信息
+            log.debug("对话框返回: %s", reply)
             
             if reply == QMessageBox.Yes:
                 # 询问位置名称
@@ -617,13 +774,13 @@ class AutoClickerMultiPosition(QMainWindow):
                     self.positions.append((int(x), int(y), name.strip()))
                     self.update_position_list()
                     self.save_config()
-                    print(f"位置已添加: {name.strip()} ({int(x)}, {int(y)})")
+                    log.info("位置已添加: %s (%d, %d)", name.strip(), x, y)
                 else:
-                    print("位置添加被取消")
+                    log.debug("位置添加被取消")
             else:
-                print("用户取消添加位置")
+                log.debug("用户取消添加位置")
         except Exception as e:
-            print(f"处理坐标确认时出错: {e}")
+            log.error("处理坐标确认时出错: %s", e)
         finally:
             # 重置捕获状态
             self.capturing_position = False
@@ -632,7 +789,7 @@ class AutoClickerMultiPosition(QMainWindow):
             if self.mouse_listener:
                 self.mouse_listener.stop()
                 self.mouse_listener = None
-            print("捕获状态已重置")
+            log.debug("捕获状态已重置")
         
     def remove_selected_position(self):
         """删除选中的位置"""
@@ -658,49 +815,72 @@ class AutoClickerMultiPosition(QMainWindow):
             item_text = f"{i+1}. {name} ({x}, {y})"
             self.position_list.addItem(item_text)
             
-    def check_accessibility_permission(self):
-        """检查辅助功能权限"""
+    def _refresh_position_profile_combo(self, current=None):
+        """刷新位置方案下拉框（只读索引，不加载方案内容）"""
+        if current is None:
+            current = self.cmb_position_profile.currentData()
+        self.cmb_position_profile.clear()
+        self.cmb_position_profile.addItem('（未保存）', None)
+        for name in self.profile_library.names():
+            info = self.profile_library.info(name) or {}
+            self.cmb_position_profile.addItem(f"{name} ({info.get('count', 0)}个位置)", name)
+        index = self.cmb_position_profile.findData(current)
+        self.cmb_position_profile.setCurrentIndex(max(index, 0))
+
+    def on_position_profile_selected(self, index):
+        """选择位置方案：此时才读取该方案的位置列表"""
+        name = self.cmb_position_profile.itemData(index)
+        if not name:
+            return
+        data = self.profile_library.load(name)
+        if data is None:
+            self.status_label.setText(f'方案 {name} 加载失败')
+            return
+        self.positions = list(data['positions'])
+        self.cycle_checkbox.setChecked(data['cycle_mode'])
+        self.update_position_list()
+        self.save_config()
+        self.status_label.setText(f'已加载位置方案: {name}')
+
+    def save_position_profile(self):
+        """将当前位置列表保存为位置方案"""
+        current = self.cmb_position_profile.currentData() or f'任务{len(self.profile_library.names())+1}'
+        name, ok = QInputDialog.getText(self, '保存位置方案', '方案名称:', text=current)
+        if not ok or not name.strip():
+            return
+        name = name.strip()
         try:
-            # 在打包的应用中，直接尝试执行鼠标操作来检测权限
-            from pynput.mouse import Controller
-            from pynput import mouse
-            
-            # 方法1: 尝试创建鼠标监听器
+            self.profile_library.save(name, self.positions, self.cycle_checkbox.isChecked())
+        except Exception as e:
+            QMessageBox.warning(self, '保存失败', f'保存位置方案失败: {e}')
+            return
+        self._refresh_position_profile_combo(name)
+        self.save_config()
+
+    def delete_position_profile(self):
+        """删除选中的位置方案（当前位置列表保持不变）"""
+        name = self.cmb_position_profile.currentData()
+        if name and self.profile_library.delete(name):
+            self._refresh_position_profile_combo()
+            self.save_config()
+
+    def import_position_profile(self):
+        """导入旧版按任务保存的配置文件为位置方案"""
+        paths, _ = QFileDialog.getOpenFileNames(self, '导入位置方案', os.path.expanduser('~'),
+                                                'JSON 文件 (*.json);;所有文件 (*)')
+        name = None
+        for path in paths:
             try:
-                test_listener = mouse.Listener(on_click=lambda x, y, button, pressed: None)
-                test_listener.start()
-                time.sleep(0.1)
-                test_listener.stop()
-                # 如果能成功创建监听器，说明有权限
-                return True
-            except Exception:
-                pass
-            
-            # 方法2: 尝试鼠标控制
-            mouse_controller = Controller()
-            
-            # 获取当前位置
-            original_pos = mouse_controller.position
-            
-            # 尝试移动鼠标一个很小的距离
-            test_pos = (original_pos[0] + 1, original_pos[1] + 1)
-            mouse_controller.position = test_pos
-            time.sleep(0.05)
-            
-            # 检查是否真的移动了
-            new_pos = mouse_controller.position
-            
-            # 恢复原位置
-            mouse_controller.position = original_pos
-            
-            # 如果位置变化很小，说明有权限
-            if abs(new_pos[0] - test_pos[0]) <= 2 and abs(new_pos[1] - test_pos[1]) <= 2:
-                return True
-            
-            return False
-            
-        except Exception:
-            return False
+                name = self.profile_library.import_file(path)
+            except Exception as e:
+                QMessageBox.warning(self, '导入失败', f'{path}: {e}')
+        if name:
+            self._refresh_position_profile_combo(name)
+            self.on_position_profile_selected(self.cmb_position_profile.currentIndex())
+
+    def check_accessibility_permission(self):
+        """检查辅助功能权限（读取缓存，过期后在后台重新探测）"""
+        return self.permission_cache.check()
     
     def show_permission_dialog(self):
         """显示权限设置对话框"""
@@ -721,6 +901,7 @@ class AutoClickerMultiPosition(QMainWindow):
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
     
+    @tracing.traced('slot.start_clicking')
     def start_clicking(self):
         """开始多位置连点"""
         if self.click_worker and self.click_worker.isRunning():
@@ -741,11 +922,15 @@ class AutoClickerMultiPosition(QMainWindow):
         button_type = self.button_combo.currentText()
         cycle_mode = self.cycle_checkbox.isChecked()
         
+        metrics = ClickMetrics(interval=1.0 / frequency)
         self.click_worker = MultiPositionClickWorker(
-            self.positions, click_type, frequency, max_clicks, button_type, cycle_mode
+            self.positions, click_type, frequency, max_clicks, button_type, cycle_mode,
+            metrics=metrics, human_motion=self.motion_checkbox.isChecked()
         )
+        self.metrics_panel.attach(metrics)
         self.click_worker.finished.connect(self.on_clicking_finished)
         self.click_worker.position_changed.connect(self.on_position_changed)
+        self.attach_emergency_stop()
         self.click_worker.start()
         
         self.start_button.setEnabled(False)
@@ -757,64 +942,64 @@ class AutoClickerMultiPosition(QMainWindow):
         
     def setup_emergency_stop(self):
         """设置紧急停止功能"""
-        try:
-            # 鼠标移动到屏幕角落紧急停止
-            def on_mouse_move(x, y):
-                if self.click_worker and self.click_worker.isRunning():
-                    # 获取屏幕尺寸
-                    screen = QApplication.primaryScreen()
-                    if screen:
-                        screen_rect = screen.geometry()
-                        screen_width = screen_rect.width()
-                        screen_height = screen_rect.height()
+        # 鼠标移动到屏幕角落紧急停止
+        def on_mouse_move(x, y):
+            if self.click_worker and self.click_worker.isRunning():
+                screen_width, screen_height = self.screen_size
+                
+                # 检查是否移动到屏幕四个角落（容差20像素）
+                corner_tolerance = 20
+                if ((x <= corner_tolerance and y <= corner_tolerance) or  # 左上角
+                    (x >= screen_width - corner_tolerance and y <= corner_tolerance) or  # 右上角
+                    (x <= corner_tolerance and y >= screen_height - corner_tolerance) or  # 左下角
+                    (x >= screen_width - corner_tolerance and y >= screen_height - corner_tolerance)):  # 右下角
+                    self.emergency_listeners.trigger()
+                    self.emergency_stop_signal.emit()
+        
+        # 连续按ESC键紧急停止
+        def on_key_press(key):
+            try:
+                from pynput.keyboard import Key
+                # 检查是否按下ESC键
+                if key == Key.esc:
+                    current_time = time.time()
+                    # 如果距离上次按ESC不超过1秒，计数增加
+                    if current_time - self.last_esc_time <= 1.0:
+                        self.esc_press_count += 1
                     else:
-                        screen_width = 1920  # 默认值
-                        screen_height = 1080
+                        self.esc_press_count = 1
                     
-                    # 检查是否移动到屏幕四个角落（容差20像素）
-                    corner_tolerance = 20
-                    if ((x <= corner_tolerance and y <= corner_tolerance) or  # 左上角
-                        (x >= screen_width - corner_tolerance and y <= corner_tolerance) or  # 右上角
-                        (x <= corner_tolerance and y >= screen_height - corner_tolerance) or  # 左下角
-                        (x >= screen_width - corner_tolerance and y >= screen_height - corner_tolerance)):  # 右下角
-                        self.emergency_stop_signal.emit()
-            
-            # 连续按ESC键紧急停止
-            def on_key_press(key):
-                try:
-                    from pynput.keyboard import Key
-                    # 检查是否按下ESC键
-                    if key == Key.esc:
-                        current_time = time.time()
-                        # 如果距离上次按ESC不超过1秒，计数增加
-                        if current_time - self.last_esc_time <= 1.0:
-                            self.esc_press_count += 1
-                        else:
-                            self.esc_press_count = 1
-                        
-                        self.last_esc_time = current_time
-                        print(f"ESC按键检测: 第{self.esc_press_count}次")
-                        
-                        # 连续按3次ESC触发紧急停止
-                        if self.esc_press_count >= 3:
-                            print("触发紧急停止！")
-                            self.esc_press_count = 0
-                            if self.click_worker and self.click_worker.isRunning():
-                                self.emergency_stop_signal.emit()
-                except Exception as e:
-                    print(f"ESC键检测错误: {e}")
-                    pass
-            
-            # 启动监听器
-            from pynput import mouse, keyboard
-            self.emergency_mouse_listener = mouse.Listener(on_move=on_mouse_move)
-            self.emergency_keyboard_listener = keyboard.Listener(on_press=on_key_press)
-            
-            self.emergency_mouse_listener.start()
-            self.emergency_keyboard_listener.start()
-            
-        except Exception as e:
-            print(f"紧急停止功能启动失败: {e}")
+                    self.last_esc_time = current_time
+                    log.debug("ESC按键检测: 第%d次", self.esc_press_count)
+                    
+                    # 连续按3次ESC触发紧急停止
+                    if self.esc_press_count >= 3:
+                        log.warning("触发紧急停止！")
+                        self.esc_press_count = 0
+                        if self.click_worker and self.click_worker.isRunning():
+                            self.emergency_listeners.trigger()
+                            self.emergency_stop_signal.emit()
+            except Exception as e:
+                log.error("ESC键检测错误: %s", e)
+                pass
+        
+        self.emergency_listeners = EmergencyListenerManager(on_mouse_move, on_key_press)
+    
+    def attach_emergency_stop(self):
+        """连点开始时挂载紧急停止监听"""
+        # 屏幕尺寸在GUI线程中读取一次，监听回调中不再访问Qt
+        screen = QApplication.primaryScreen()
+        if screen:
+            screen_rect = screen.geometry()
+            self.screen_size = (screen_rect.width(), screen_rect.height())
+        self.esc_press_count = 0
+        if self.emergency_listeners and self.click_worker:
+            self.emergency_listeners.attach(self.click_worker.kill_switch)
+    
+    def detach_emergency_stop(self):
+        """连点结束时卸载紧急停止监听"""
+        if self.emergency_listeners:
+            self.emergency_listeners.detach()
     
     def emergency_stop(self):
         """紧急停止"""
@@ -836,6 +1021,8 @@ class AutoClickerMultiPosition(QMainWindow):
             
     def on_clicking_finished(self):
         """连点完成"""
+        self.detach_emergency_stop()
+        self.metrics_panel.detach()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.status_label.setText('已停止')
@@ -848,78 +1035,76 @@ class AutoClickerMultiPosition(QMainWindow):
             self.status_label.setStyleSheet("padding: 10px; background-color: #e8f5e8; border-radius: 5px;")
         QTimer.singleShot(3000, reset_status)
         
+    @tracing.traced('slot.on_position_changed')
     def on_position_changed(self, position_index, position_name):
         """位置变更时更新显示"""
         self.current_position_label.setText(f'当前位置: {position_index}. {position_name}')
         
+    @tracing.traced('slot.save_config')
     def save_config(self):
         """保存配置"""
-        config = {
-            'positions': self.positions,
-            'click_type': self.click_type_combo.currentText(),
-            'frequency': self.frequency_spin.value(),
-            'max_clicks': self.max_clicks_spin.value(),
-            'button_type': self.button_combo.currentText(),
-            'cycle_mode': self.cycle_checkbox.isChecked(),
-            'hotkey_config': self.hotkey_config
-        }
-        
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存配置失败: {e}")
+        # update() 内部复制快照，由后台线程去抖后原子写盘，GUI线程不做磁盘I/O
+        self.settings.update(
+            'multi_position',
+            positions=[list(p) for p in self.positions],
+            cycle_mode=self.cycle_checkbox.isChecked(),
+            human_motion=self.motion_checkbox.isChecked(),
+            active_profile=self.cmb_position_profile.currentData() or ''
+        )
+        self.settings.update(
+            'click',
+            click_type=click_type_value(self.click_type_combo.currentText()),
+            frequency=self.frequency_spin.value(),
+            max_clicks=self.max_clicks_spin.value(),
+            button=button_value(self.button_combo.currentText())
+        )
+        self.settings.update(
+            'hotkeys',
+            start_combo=self.hotkey_config['start'],
+            stop_combo=self.hotkey_config['stop'],
+            profiles=self.hotkey_config.get('profiles', {})
+        )
             
     def load_config(self):
         """加载配置"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    
-                # 加载位置
-                if 'positions' in config:
-                    # 加载位置列表，确保坐标为数字类型
-                    loaded_positions = config['positions']
-                    self.positions = []
-                    for pos in loaded_positions:
-                        if isinstance(pos, dict):
-                            # 处理字典格式 {'x': x, 'y': y, 'name': name}
-                            self.positions.append((int(pos['x']), int(pos['y']), pos['name']))
-                        elif isinstance(pos, (list, tuple)) and len(pos) >= 3:
-                            # 处理列表/元组格式 [x, y, name] 或 (x, y, name)
-                            self.positions.append((int(pos[0]), int(pos[1]), pos[2]))
-                        else:
-                            print(f"跳过无效位置数据: {pos}")
-                    self.update_position_list()
-                    
-                # 加载基本设置
-                if 'click_type' in config and hasattr(self, 'click_type_combo'):
-                    index = self.click_type_combo.findText(config['click_type'])
-                    if index >= 0:
-                        self.click_type_combo.setCurrentIndex(index)
-                        
-                if 'frequency' in config and hasattr(self, 'frequency_spin'):
-                    self.frequency_spin.setValue(config['frequency'])
-                    
-                if 'max_clicks' in config and hasattr(self, 'max_clicks_spin'):
-                    self.max_clicks_spin.setValue(config['max_clicks'])
-                    
-                if 'button_type' in config and hasattr(self, 'button_combo'):
-                    index = self.button_combo.findText(config['button_type'])
-                    if index >= 0:
-                        self.button_combo.setCurrentIndex(index)
-                        
-                if 'cycle_mode' in config and hasattr(self, 'cycle_checkbox'):
-                    self.cycle_checkbox.setChecked(config['cycle_mode'])
-                    
-                # 加载热键配置
-                if 'hotkey_config' in config:
-                    self.hotkey_config.update(config['hotkey_config'])
-                    self._refresh_hotkey_ui()
-                    
+            multi = self.settings.section('multi_position')
+            click = self.settings.section('click')
+            hotkeys = self.settings.section('hotkeys')
+
+            # 加载位置，确保坐标为数字类型
+            self.positions = []
+            for pos in multi['positions']:
+                if isinstance(pos, (list, tuple)) and len(pos) >= 3:
+                    self.positions.append((int(pos[0]), int(pos[1]), pos[2]))
+                else:
+                    log.warning("跳过无效位置数据: %s", pos)
+            self.update_position_list()
+
+            # 加载基本设置
+            index = self.click_type_combo.findText(click_type_label(click['click_type']))
+            if index >= 0:
+                self.click_type_combo.setCurrentIndex(index)
+            self.frequency_spin.setValue(max(1, round(click['frequency'])))
+            self.max_clicks_spin.setValue(click['max_clicks'])
+            index = self.button_combo.findText(button_label(click['button']))
+            if index >= 0:
+                self.button_combo.setCurrentIndex(index)
+            self.cycle_checkbox.setChecked(multi['cycle_mode'])
+            self.motion_checkbox.setChecked(multi['human_motion'])
+            self._refresh_position_profile_combo(multi['active_profile'])
+
+            # 加载热键配置
+            self.hotkey_config.update({
+                'start': hotkeys['start_combo'],
+                'stop': hotkeys['stop_combo'],
+                'profiles': hotkeys['profiles']
+            })
+            self._refresh_hotkey_ui()
+            self._push_hotkey_config()
+
         except Exception as e:
-            print(f"加载配置失败: {e}")
+            log.error("加载配置失败: %s", e)
             
     def closeEvent(self, a0):
         """关闭事件"""
@@ -929,12 +1114,10 @@ class AutoClickerMultiPosition(QMainWindow):
             self.mouse_listener.stop()
         
         # 停止紧急停止监听器
-        if self.emergency_mouse_listener:
-            self.emergency_mouse_listener.stop()
-        if self.emergency_keyboard_listener:
-            self.emergency_keyboard_listener.stop()
+        self.detach_emergency_stop()
         
         self.save_config()
+        self.settings.close()
         if a0:
             a0.accept()
         super().closeEvent(a0)
@@ -979,16 +1162,8 @@ class AutoClickerMultiPosition(QMainWindow):
              'key': self.cmb_stop_key.currentText()
          }
          
-         # 更新原生热键管理器
-         if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
-             # 先停止当前监听
-             self.hotkey_manager.stop_monitoring()
-             # 更新配置
-             self.hotkey_manager.update_hotkey_config(self.hotkey_config)
-             # 重新启动监听
-             if not self.hotkey_manager.start_monitoring():
-                 QMessageBox.warning(self, '热键设置', '热键更新失败，请检查权限设置')
-                 return
+         # 更新原生热键管理器（分发表原子替换，监听不中断）
+         self._push_hotkey_config()
              
          # 保存配置
          self.save_config()
@@ -996,6 +1171,107 @@ class AutoClickerMultiPosition(QMainWindow):
          # 显示确认消息
          QMessageBox.information(self, '设置已应用', '热键设置已更新并保存！')
 
+    def _push_hotkey_config(self):
+        """将当前热键配置同步到原生热键管理器，并刷新方案列表"""
+        if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
+            self.hotkey_manager.update_hotkey_config(self.hotkey_config)
+        self._refresh_profile_combo()
+
+    def _refresh_profile_combo(self, current=None):
+        """刷新热键方案下拉框"""
+        if not hasattr(self, 'cmb_hotkey_profile'):
+            return
+        if current is None:
+            current = self.cmb_hotkey_profile.currentText()
+        self.cmb_hotkey_profile.clear()
+        for name, profile in self.hotkey_config.get('profiles', {}).items():
+            key = profile.get('switch', {}).get('key', '')
+            self.cmb_hotkey_profile.addItem(f"{name} (Ctrl+Option+{key})" if key else name, name)
+        index = self.cmb_hotkey_profile.findData(current)
+        if index >= 0:
+            self.cmb_hotkey_profile.setCurrentIndex(index)
+
+    def _collect_job(self):
+        """收集当前界面上的连点参数"""
+        return {
+            'positions': list(self.positions),
+            'click_type': self.click_type_combo.currentText(),
+            'frequency': self.frequency_spin.value(),
+            'max_clicks': self.max_clicks_spin.value(),
+            'button_type': self.button_combo.currentText(),
+            'cycle_mode': self.cycle_checkbox.isChecked()
+        }
+
+    def _apply_job(self, job):
+        """将方案中的连点参数应用到界面"""
+        if 'positions' in job:
+            self.positions = [(int(p[0]), int(p[1]), p[2]) for p in job['positions']]
+            self.update_position_list()
+        index = self.click_type_combo.findText(job.get('click_type', ''))
+        if index >= 0:
+            self.click_type_combo.setCurrentIndex(index)
+        if 'frequency' in job:
+            self.frequency_spin.setValue(job['frequency'])
+        if 'max_clicks' in job:
+            self.max_clicks_spin.setValue(job['max_clicks'])
+        index = self.button_combo.findText(job.get('button_type', ''))
+        if index >= 0:
+            self.button_combo.setCurrentIndex(index)
+        if 'cycle_mode' in job:
+            self.cycle_checkbox.setChecked(job['cycle_mode'])
+
+    def save_hotkey_profile(self):
+        """将当前连点参数保存为热键方案"""
+        profiles = self.hotkey_config.setdefault('profiles', {})
+        name, ok = QInputDialog.getText(self, '保存热键方案', '方案名称:',
+                                        text=f'方案{len(profiles)+1}')
+        if not ok or not name.strip():
+            return
+        name = name.strip()
+        keys = [str(i) for i in range(1, 10)]
+        key, ok = QInputDialog.getItem(self, '保存热键方案', '切换热键 Ctrl+Option+', keys, 0, False)
+        if not ok:
+            return
+        # 同一切换键只保留一个方案
+        for other in list(profiles):
+            if other != name and profiles[other].get('switch', {}).get('key') == key:
+                del profiles[other]
+        profiles[name] = {
+            'switch': {'ctrl': True, 'option': True, 'shift': False, 'command': False, 'key': key},
+            'job': self._collect_job()
+        }
+        self._push_hotkey_config()
+        self._refresh_profile_combo(name)
+        self.save_config()
+
+    def delete_hotkey_profile(self):
+        """删除选中的热键方案"""
+        name = self.cmb_hotkey_profile.currentData()
+        profiles = self.hotkey_config.get('profiles', {})
+        if name in profiles:
+            del profiles[name]
+            self._push_hotkey_config()
+            self.save_config()
+
+    def on_profile_selected(self, index):
+        """在界面中选择热键方案"""
+        name = self.cmb_hotkey_profile.itemData(index)
+        if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
+            self.hotkey_manager.switch_profile(name)
+        else:
+            self.on_hotkey_profile(name)
+
+    def on_hotkey_profile(self, name):
+        """热键方案切换后加载对应的连点参数"""
+        profile = self.hotkey_config.get('profiles', {}).get(name)
+        if not profile:
+            return
+        running = self.click_worker and self.click_worker.isRunning()
+        self._apply_job(profile.get('job', {}))
+        self._refresh_profile_combo(name)
+        if not running:
+            self.status_label.setText(f'已切换方案: {name}')
+
 
 def main():
     app = QApplication(sys.argv)
@@ -1005,6 +1281,7 @@ def main():
     app.setApplicationVersion("2.0")
     
     window = AutoClickerMultiPosition()
+    startup.install_probe(window)
     window.show()
     
     sys.exit(app.exec())
@@ -14,65 +14,64 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                              QGroupBox, QCheckBox, QSlider, QTextEdit, QShortcut)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QCloseEvent, QKeySequence
-from pynput.mouse import Controller, Button
 
-try:
-    # 尝试导入原生macOS热键支持
-    from AppKit import NSApplication
-    from Quartz import (
-        CGEventTapCreate, CGEventTapEnable, CGEventGetIntegerValueField,
-        kCGEventKeyDown, kCGEventFlagsChanged, kCGKeyboardEventKeycode,
-        kCGSessionEventTap, kCGHeadInsertEventTap, kCGEventTapOptionDefault,
-        kCGHIDEventTap, kCGEventTapOptionListenOnly,
-        kCGEventTapDisabledByTimeout, kCGEventTapDisabledByUserInput,
-        CFMachPortCreateRunLoopSource, CFMachPortInvalidate,
-        CFRunLoopGetCurrent, CFRunLoopAddSource, CFRunLoopRunInMode,
-        kCFRunLoopCommonModes, kCFRunLoopDefaultMode
-    )
-    from Quartz import CGEventGetFlags, kCGEventFlagMaskCommand, kCGEventFlagMaskAlternate, kCGEventFlagMaskControl, kCGEventFlagMaskShift
+from config_store import (load_settings, button_label, button_value,
+                          click_type_label, click_type_value)
+from click_engine import PynputMouse
+from click_metrics import ClickMetrics
+from metrics_panel import MetricsPanel
+from hotkey_dispatch import (HotkeyDispatchTable, mods_from_flags, flags_from_mods,
+                             native_hotkey_available, load_quartz)
+import startup
+import tracing
+from app_logging import get_logger
 
-    NATIVE_HOTKEY_AVAILABLE = True
-except Exception:
-    NATIVE_HOTKEY_AVAILABLE = False
+log = get_logger('native')
+
+# 原生macOS热键支持：启动时只检查是否可用，Quartz 在开始监听时才导入
+NATIVE_HOTKEY_AVAILABLE = native_hotkey_available()
 
 
 class ClickWorker(QThread):
     """连点工作线程"""
     finished = pyqtSignal()
     
-    def __init__(self, click_type, frequency, max_clicks, button_type):
+    def __init__(self, click_type, frequency, max_clicks, button_type, mouse=None, metrics=None):
         super().__init__()
         self.click_type = click_type
         self.frequency = frequency
         self.max_clicks = max_clicks
         self.button_type = button_type
         self.running = False
-        self.mouse = Controller()
+        # 鼠标后端可注入（基准测试用假后端）；pynput 在首次连点时才导入
+        self.mouse = mouse if mouse is not None else PynputMouse()
+        self.metrics = metrics  # 可选的 ClickMetrics，界面定时采样
         
     def run(self):
         self.running = True
         click_count = 0
         interval = 1.0 / self.frequency
         
-        # 按钮映射
-        button_map = {
-            '左键': Button.left,
-            '右键': Button.right,
-            '中键': Button.middle
-        }
-        button = button_map.get(self.button_type, Button.left)
+        button = button_value(self.button_type)
+        metrics = self.metrics
+        due = time.perf_counter()
         
         while self.running and (self.max_clicks == 0 or click_count < self.max_clicks):
             try:
-                if self.click_type == '单击':
-                    self.mouse.click(button)
-                elif self.click_type == '双击':
-                    self.mouse.click(button, 2)
+                started = time.perf_counter()
+                with tracing.span('native.click', click_count):
+                    if self.click_type == '单击':
+                        self.mouse.click(button)
+                    elif self.click_type == '双击':
+                        self.mouse.click(button, 2)
+                if metrics is not None:
+                    metrics.record(due, started, time.perf_counter())
                     
                 click_count += 1
                 time.sleep(interval)
+                due = started + interval
             except Exception as e:
-                print(f"点击错误: {e}")
+                log.error("点击错误: %s", e)
                 break
                 
         self.finished.emit()
@@ -81,6 +80,28 @@ class ClickWorker(QThread):
         self.running = False
 
 
+class ProcessClickWorker(QThread):
+    """在独立引擎进程中连点：本线程只等待任务结束，不参与点击"""
+    finished = pyqtSignal()
+
+    def __init__(self, engine, click_type, frequency, max_clicks, button_type):
+        super().__init__()
+        self.engine = engine
+        # 提交后引擎进程立即开始点击；指标直接读共享内存
+        self.metrics = engine.submit(rate=frequency, count=max_clicks,
+                                     button=button_value(button_type), double=click_type == '双击')
+
+    def run(self):
+        while not self.engine.wait(0.1):
+            if not self.engine.alive:
+                log.error("引擎进程意外退出")
+                break
+        self.finished.emit()
+
+    def stop(self):
+        self.engine.stop()
+
+
 class NativeHotkeyManager:
     """原生macOS热键管理器（使用Quartz Event Tap实现全局热键F6/F7）"""
     
@@ -91,43 +112,28 @@ class NativeHotkeyManager:
         self.tap = None
         self.run_loop_source = None
         self.thread = None
-        # macOS 虚拟键码：F6=0x3E(62), F7=0x3F(63)
-        self.VK_F6 = 0x3E
-        self.VK_F7 = 0x3F
-        # Apple 硬件键码与兼容映射
-        self.VK_F6_SET = {97, 62}
-        self.VK_F7_SET = {98, 63}
-        # 组合键配置（动态更新）: 修饰键集合与主键的硬件码集合
-        self.combo_start_modmask = (kCGEventFlagMaskControl | kCGEventFlagMaskAlternate)  # 默认 Ctrl+Option
-        self.combo_stop_modmask = (kCGEventFlagMaskControl | kCGEventFlagMaskAlternate)
-        self.combo_start_keycodes = {1}  # 默认 S
-        self.combo_stop_keycodes = {2}  # 默认 D
+        self.quartz = None
+        # 预编译的分发表：{(键码, 修饰键掩码): 回调}
+        self.dispatch_table = HotkeyDispatchTable()
+        # 默认 Ctrl+Option+S 开始、Ctrl+Option+D 停止，F6/F7 兜底
+        self.update_hotkey_config({
+            'start_mods': ['Ctrl', 'Option'], 'start_key': 'S',
+            'stop_mods': ['Ctrl', 'Option'], 'stop_key': 'D'
+        })
     
     def update_hotkey_config(self, cfg: dict):
-        """从窗口配置计算出需要的标志位与主键硬件码集合"""
-        def mods_to_mask(mods):
-            mask = 0
-            for m in mods:
-                if m == 'Ctrl':
-                    mask |= int(kCGEventFlagMaskControl)
-                elif m == 'Option':
-                    mask |= int(kCGEventFlagMaskAlternate)
-                elif m == 'Shift':
-                    mask |= int(kCGEventFlagMaskShift)
-                elif m == 'Command':
-                    mask |= int(kCGEventFlagMaskCommand)
-            return mask
-        def key_to_codes(k):
-            # 仅支持主键 S/D/F/G/H/J/K/L，使用常见 ANSI 美式布局硬件键码
-            mapping = {
-                'S': 1, 'D': 2, 'F': 3, 'G': 5, 'H': 4, 'J': 38, 'K': 40, 'L': 37
-            }
-            c = mapping.get(k.upper())
-            return {c} if c is not None else set()
-        self.combo_start_modmask = mods_to_mask(cfg.get('start_mods', []))
-        self.combo_stop_modmask = mods_to_mask(cfg.get('stop_mods', []))
-        self.combo_start_keycodes = key_to_codes(cfg.get('start_key', 'S')) or {1}
-        self.combo_stop_keycodes = key_to_codes(cfg.get('stop_key', 'D')) or {2}
+        """根据窗口配置重新编译热键分发表"""
+        self.set_bindings([
+            (cfg.get('start_mods', []), cfg.get('start_key', 'S'), self.callback_start),
+            (cfg.get('stop_mods', []), cfg.get('stop_key', 'D'), self.callback_stop),
+            # 保留 F6/F7 兜底
+            ([], 'F6', self.callback_start),
+            ([], 'F7', self.callback_stop),
+        ])
+
+    def set_bindings(self, bindings):
+        """设置任意数量的热键绑定：[(修饰键列表, 主键, 回调), ...]"""
+        self.dispatch_table.compile(bindings)
 
     def start_monitoring(self):
         """开始监听全局热键"""
@@ -135,22 +141,27 @@ class NativeHotkeyManager:
             return False
         if self.monitoring:
             return True
+        if self.quartz is None:
+            self.quartz = load_quartz()
+            if self.quartz is None:
+                return False
         try:
             self.monitoring = True
             self.thread = threading.Thread(target=self._run_event_tap, daemon=True)
             self.thread.start()
             return True
         except Exception as e:
-            print(f"热键监听启动失败: {e}")
+            log.error("热键监听启动失败: %s", e)
             self.monitoring = False
             return False
     
     def stop_monitoring(self):
         """停止监听全局热键"""
         self.monitoring = False
+        Quartz = self.quartz
         try:
             if self.tap is not None:
-                CFMachPortInvalidate(self.tap)  # type: ignore[name-defined]
+                Quartz.CFMachPortInvalidate(self.tap)
                 self.tap = None
             if self.run_loop_source is not None:
                 self.run_loop_source = None
@@ -158,94 +169,69 @@ class NativeHotkeyManager:
             pass
     
     def _run_event_tap(self):
+        Quartz = self.quartz
         # noinspection PyUnresolvedReferences
         def event_callback(proxy, event_type, event, refcon):
             # 处理tap被系统禁用（超时或用户输入）
-            if event_type in (kCGEventTapDisabledByTimeout, kCGEventTapDisabledByUserInput):  # type: ignore[name-defined]
-                try:
-                    print("[NativeHotkey] 事件Tap被禁用，尝试重新启用...")
-                except Exception:
-                    pass
-                CGEventTapEnable(self.tap, True)  # type: ignore[name-defined]
+            if event_type in (Quartz.kCGEventTapDisabledByTimeout, Quartz.kCGEventTapDisabledByUserInput):
+                log.warning("[NativeHotkey] 事件Tap被禁用，尝试重新启用...")
+                Quartz.CGEventTapEnable(self.tap, True)
                 return event
-            if event_type == kCGEventKeyDown:  # type: ignore[name-defined]
-                keycode = CGEventGetIntegerValueField(event, kCGKeyboardEventKeycode)  # type: ignore[name-defined]
-                flags = CGEventGetFlags(event)  # type: ignore[name-defined]
-                try:
-                    print(f"[NativeHotkey] keyDown keycode={keycode} flags=0x{int(flags):x}")
-                except Exception:
-                    pass
-                # 组合键判定优先，其次保留 F6/F7 兜底
-                if (int(flags) & int(self.combo_start_modmask)) == int(self.combo_start_modmask) and int(keycode) in self.combo_start_keycodes:
-                    self.callback_start()
-                elif (int(flags) & int(self.combo_stop_modmask)) == int(self.combo_stop_modmask) and int(keycode) in self.combo_stop_keycodes:
-                    self.callback_stop()
-                elif int(keycode) in self.VK_F6_SET:
-                    self.callback_start()
-                elif int(keycode) in self.VK_F7_SET:
-                    self.callback_stop()
-
-                # 调试输出：看到任意按键就打印键码与修饰键
-                try:
-                    print(f"[NativeHotkey] keyDown keycode={keycode} flags=0x{int(flags):x}")
-                except Exception:
-                    pass
-                # 组合键方案：Ctrl + Option + S 开始；Ctrl + Option + D 停止
-                want_mod = (kCGEventFlagMaskControl | kCGEventFlagMaskAlternate)  # type: ignore[name-defined]
-                if (int(flags) & want_mod) == want_mod:
-                    # 键位：S=1, D=2 在硬件键码上（美式布局）。为了兼容，保留 F6/F7 触发。
-                    if int(keycode) in (1,) or int(keycode) in self.VK_F6_SET:
-                        self.callback_start()
-                    elif int(keycode) in (2,) or int(keycode) in self.VK_F7_SET:
-                        self.callback_stop()
+            if event_type == Quartz.kCGEventKeyDown:
+                keycode = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode)
+                flags = Quartz.CGEventGetFlags(event)
+                autorepeat = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventAutorepeat)
+                # 一次字典查找完成匹配；自动重复与抖动在分发表中过滤
+                self.dispatch_table.press(keycode, flags, autorepeat)
+            elif event_type == Quartz.kCGEventKeyUp:
+                keycode = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode)
+                self.dispatch_table.release(keycode)
             return event
 
+        # 按键按下/松开事件，修饰键状态从事件标志位中读取
         mask = (
-            (1 << kCGEventKeyDown) |  # type: ignore[name-defined]
-            (1 << kCGEventFlagsChanged)  # type: ignore[name-defined]
+            (1 << Quartz.kCGEventKeyDown) |
+            (1 << Quartz.kCGEventKeyUp)
         )
         # 持有回调引用，避免被GC
         self._event_callback = event_callback
-        self.tap = CGEventTapCreate(  # type: ignore[name-defined]
-            kCGHIDEventTap,  # type: ignore[name-defined]
-            kCGHeadInsertEventTap,  # type: ignore[name-defined]
-            kCGEventTapOptionListenOnly,  # type: ignore[name-defined]
+        self.tap = Quartz.CGEventTapCreate(
+            Quartz.kCGHIDEventTap,
+            Quartz.kCGHeadInsertEventTap,
+            Quartz.kCGEventTapOptionListenOnly,
             mask,
             self._event_callback,
             None
         )
         if not self.tap:
             # HID层失败时回退到Session层
-            try:
-                print("[NativeHotkey] HID层EventTap创建失败，回退到Session层...")
-            except Exception:
-                pass
-            self.tap = CGEventTapCreate(  # type: ignore[name-defined]
-                kCGSessionEventTap,  # type: ignore[name-defined]
-                kCGHeadInsertEventTap,  # type: ignore[name-defined]
-                kCGEventTapOptionListenOnly,  # type: ignore[name-defined]
+            log.warning("[NativeHotkey] HID层EventTap创建失败，回退到Session层...")
+            self.tap = Quartz.CGEventTapCreate(
+                Quartz.kCGSessionEventTap,
+                Quartz.kCGHeadInsertEventTap,
+                Quartz.kCGEventTapOptionListenOnly,
                 mask,
                 self._event_callback,
                 None
             )
         if not self.tap:
-            print("[NativeHotkey] EventTap创建失败，请检查输入监控权限")
+            log.error("[NativeHotkey] EventTap创建失败，请检查输入监控权限")
             self.monitoring = False
             return
 
-        self.run_loop_source = CFMachPortCreateRunLoopSource(None, self.tap, 0)  # type: ignore[name-defined]
-        loop = CFRunLoopGetCurrent()  # type: ignore[name-defined]
-        CFRunLoopAddSource(loop, self.run_loop_source, kCFRunLoopCommonModes)  # type: ignore[name-defined]
-        CGEventTapEnable(self.tap, True)  # type: ignore[name-defined]
-        print("[NativeHotkey] 全局热键监听已启动 (Quartz Event Tap)")
+        self.run_loop_source = Quartz.CFMachPortCreateRunLoopSource(None, self.tap, 0)
+        loop = Quartz.CFRunLoopGetCurrent()
+        Quartz.CFRunLoopAddSource(loop, self.run_loop_source, Quartz.kCFRunLoopCommonModes)
+        Quartz.CGEventTapEnable(self.tap, True)
+        log.info("[NativeHotkey] 全局热键监听已启动 (Quartz Event Tap)")
 
         while self.monitoring:
-            CFRunLoopRunInMode(kCFRunLoopDefaultMode, 0.2, True)  # type: ignore[name-defined]
+            Quartz.CFRunLoopRunInMode(Quartz.kCFRunLoopDefaultMode, 0.2, True)
 
         try:
             if self.tap:
-                CGEventTapEnable(self.tap, False)  # type: ignore[name-defined]
-                CFMachPortInvalidate(self.tap)  # type: ignore[name-defined]
+                Quartz.CGEventTapEnable(self.tap, False)
+                Quartz.CFMachPortInvalidate(self.tap)
                 self.tap = None
         except Exception:
             pass
@@ -258,7 +244,8 @@ class AutoClickerNative(QMainWindow):
         super().__init__()
         self.click_worker = None
         self.hotkey_manager = None
-        self.config_file = 'config_native.json'
+        self.engine_process = None  # 独立进程引擎（engine_process.EngineProcess）
+        self.settings = load_settings()
         # 默认热键配置（界面与原生监听共用）
         self.hotkey_defaults = {
             'start_mods': ['Ctrl', 'Option'],
@@ -272,7 +259,9 @@ class AutoClickerNative(QMainWindow):
         self.hotkey_stop_signal.connect(self.stop_clicking)
         self.init_ui()
         self.load_config()
-        self.setup_hotkeys()
+        # 热键后端在窗口第一次绘制后再加载，不拖慢窗口出现
+        startup.after_first_paint(self, self.setup_hotkeys)
+        startup.after_first_paint(self, lambda: self._on_isolated_toggled(self.isolated_checkbox.isChecked()))
         # 初始化热键设置控件显示
         self._refresh_hotkey_ui()
         
@@ -330,6 +319,11 @@ class AutoClickerNative(QMainWindow):
         button_layout.addWidget(self.button_combo)
         basic_layout.addLayout(button_layout)
         
+        # 独立进程运行：点击节奏不受界面重绘与监听线程影响
+        self.isolated_checkbox = QCheckBox('在独立进程中运行连点')
+        self.isolated_checkbox.toggled.connect(self._on_isolated_toggled)
+        basic_layout.addWidget(self.isolated_checkbox)
+        
         basic_group.setLayout(basic_layout)
         layout.addWidget(basic_group)
         
@@ -421,6 +415,10 @@ class AutoClickerNative(QMainWindow):
         self.status_label.setStyleSheet("padding: 10px; background-color: #e8f5e8; border-radius: 5px;")
         layout.addWidget(self.status_label)
         
+        # 运行指标（勾选后显示）
+        self.metrics_panel = MetricsPanel()
+        layout.addWidget(self.metrics_panel)
+        
         # 使用说明
         help_group = QGroupBox("使用说明")
         help_layout = QVBoxLayout()
@@ -482,8 +480,19 @@ class AutoClickerNative(QMainWindow):
         max_clicks = self.max_clicks_spin.value()
         button_type = self.button_combo.currentText()
         
-        self.click_worker = ClickWorker(click_type, frequency, max_clicks, button_type)
+        self.click_worker = None
+        if self.isolated_checkbox.isChecked():
+            try:
+                self.click_worker = ProcessClickWorker(self._engine_process(), click_type,
+                                                       frequency, max_clicks, button_type)
+            except Exception as e:
+                log.error("独立进程连点启动失败，改为在本进程中运行: %s", e)
+                self._close_engine_process()
+        if self.click_worker is None:
+            self.click_worker = ClickWorker(click_type, frequency, max_clicks, button_type,
+                                            metrics=ClickMetrics(interval=1.0 / frequency))
         self.click_worker.finished.connect(self.on_clicking_finished)
+        self.metrics_panel.attach(self.click_worker.metrics)
         self.click_worker.start()
         
         self.start_button.setEnabled(False)
@@ -498,8 +507,26 @@ class AutoClickerNative(QMainWindow):
         if self.click_worker:
             self.click_worker.stop()
             
+    def _engine_process(self):
+        """引擎进程（首次使用时创建并启动）"""
+        if self.engine_process is None:
+            from engine_process import EngineProcess
+            self.engine_process = EngineProcess().start()
+        return self.engine_process
+
+    def _close_engine_process(self):
+        if self.engine_process is not None:
+            self.engine_process.close()
+            self.engine_process = None
+
+    def _on_isolated_toggled(self, checked):
+        # 勾选时预先启动引擎进程，开始连点时不再等待进程启动
+        if checked and self.isVisible():
+            self._engine_process()
+
     def on_clicking_finished(self):
         """连点完成"""
+        self.metrics_panel.detach()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.status_label.setText('已停止')
@@ -513,44 +540,39 @@ class AutoClickerNative(QMainWindow):
         
     def save_config(self):
         """保存配置"""
-        config = {
-            'click_type': self.click_type_combo.currentText(),
-            'frequency': self.frequency_spin.value(),
-            'max_clicks': self.max_clicks_spin.value(),
-            'button_type': self.button_combo.currentText(),
-            # 持久化热键配置
-            'hotkey_config': self.hotkey_config
-        }
-        
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存配置失败: {e}")
+        self.settings.update(
+            'click',
+            click_type=click_type_value(self.click_type_combo.currentText()),
+            frequency=self.frequency_spin.value(),
+            max_clicks=self.max_clicks_spin.value(),
+            button=button_value(self.button_combo.currentText()),
+            isolated=self.isolated_checkbox.isChecked()
+        )
+        # 热键以组合键形式保存，与多位置版共用
+        cfg = self.hotkey_config
+        self.settings.update(
+            'hotkeys',
+            start_combo=flags_from_mods(cfg['start_mods'], cfg['start_key']),
+            stop_combo=flags_from_mods(cfg['stop_mods'], cfg['stop_key'])
+        )
             
     def load_config(self):
-        """加载配置"""
-        if not os.path.exists(self.config_file):
-            return
-            
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                
-            self.click_type_combo.setCurrentText(config.get('click_type', '单击'))
-            self.frequency_spin.setValue(config.get('frequency', 10))
-            self.max_clicks_spin.setValue(config.get('max_clicks', 0))
-            self.button_combo.setCurrentText(config.get('button_type', '左键'))
-            # 读取热键配置
-            hk = config.get('hotkey_config')
-            if isinstance(hk, dict):
-                # 合并到默认值，避免缺项
-                merged = dict(self.hotkey_defaults)
-                merged.update(hk)
-                self.hotkey_config = merged
-        
-        except Exception as e:
-            print(f"加载配置失败: {e}")
+        """加载配置（统一配置在进程内只解析一次）"""
+        click = self.settings.section('click')
+        hotkeys = self.settings.section('hotkeys')
+        self.click_type_combo.setCurrentText(click_type_label(click['click_type']))
+        self.frequency_spin.setValue(max(1, round(click['frequency'])))
+        self.max_clicks_spin.setValue(click['max_clicks'])
+        self.button_combo.setCurrentText(button_label(click['button']))
+        self.isolated_checkbox.setChecked(click['isolated'])
+        # 读取热键配置
+        start, stop = hotkeys['start_combo'], hotkeys['stop_combo']
+        self.hotkey_config = {
+            'start_mods': mods_from_flags(start),
+            'start_key': start.get('key', self.hotkey_defaults['start_key']),
+            'stop_mods': mods_from_flags(stop),
+            'stop_key': stop.get('key', self.hotkey_defaults['stop_key'])
+        }
             
     def apply_hotkey_settings(self):
         """从UI读取并应用新的热键设置，同时保存到配置"""
@@ -571,8 +593,8 @@ class AutoClickerNative(QMainWindow):
         self.hotkey_config['stop_key'] = self.cmb_stop_key.currentText()
         # 持久化到文件
         self.save_config()
-        # 应用到原生监听（无需重启）
-        if self.hotkey_manager and self.hotkey_manager.monitoring:
+        # 应用到原生监听（分发表原子替换，无需重启）
+        if self.hotkey_manager:
             self.hotkey_manager.update_hotkey_config(self.hotkey_config)
         # 更新状态提示
         self.status_label.setText('已应用新的热键设置')
@@ -603,6 +625,8 @@ class AutoClickerNative(QMainWindow):
             self.click_worker.stop()
         if self.hotkey_manager:
             self.hotkey_manager.stop_monitoring()
+        self._close_engine_process()
+        self.settings.close()
         if a0:
             a0.accept()
 
@@ -613,9 +637,10 @@ def main():
     
     # 检查权限提示
     if not NATIVE_HOTKEY_AVAILABLE:
-        print("注意: 原生热键库不可用，将使用界面按钮控制")
+        log.info("注意: 原生热键库不可用，将使用界面按钮控制")
     
     window = AutoClickerNative()
+    startup.install_probe(window)
     window.show()
     
     sys.exit(app.exec_())
@@ -13,50 +13,44 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                              QCheckBox, QGroupBox, QTextEdit)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont
-from pynput.mouse import Controller, Button
+
+from config_store import (load_settings, button_label, button_value,
+                          click_type_label, click_type_value)
+from click_engine import ClickEngine, PynputMouse, double_click
+import startup
 
 
 class ClickWorker(QThread):
     click_signal = pyqtSignal(int)
     
-    def __init__(self, config):
+    def __init__(self, config, mouse=None):
         super().__init__()
         self.config = config
         self.running = False
-        self.mouse = Controller()
+        # 鼠标后端可注入（基准测试用假后端）；pynput 在首次连点时才导入
+        self.mouse = mouse if mouse is not None else PynputMouse()
+        self.kill_switch = threading.Event()
         self.click_count = 0
         
     def run(self):
         self.running = True
         self.click_count = 0
         
-        button_map = {
-            '左键': Button.left,
-            '右键': Button.right,
-            '中键': Button.middle
-        }
-        button = button_map[self.config['button']]
-        
-        interval = 1.0 / self.config['frequency']
-        
-        while self.running and self.click_count < self.config['max_clicks']:
-            if self.config['click_type'] == '单击':
-                self.mouse.click(button)
-            else:  # 双击
-                self.mouse.click(button)
-                time.sleep(0.01)  # 短暂延迟
-                self.mouse.click(button)
-            
-            self.click_count += 1
-            self.click_signal.emit(self.click_count)
-            
-            if not self.running:
-                break
-                
-            time.sleep(interval)
+        # 双击的第二次点击由引擎在同一条截止时间线上调度，不再额外 sleep
+        action = double_click(gap=0.01) if self.config['click_type'] != '单击' else None
+        engine = ClickEngine(rate=self.config['frequency'], count=self.config['max_clicks'],
+                             button=button_value(self.config['button']), action=action,
+                             mouse=self.mouse, kill_switch=self.kill_switch, on_click=self._on_click)
+        engine.run()
+        self.running = False
+    
+    def _on_click(self, index, position):
+        self.click_count = index + 1
+        self.click_signal.emit(self.click_count)
     
     def stop(self):
         self.running = False
+        self.kill_switch.set()
 
 
 class MouseClicker(QMainWindow):
@@ -69,6 +63,7 @@ class MouseClicker(QMainWindow):
             'button': '左键',
             'click_type': '单击'
         }
+        self.settings = load_settings()
         self.load_config()
         self.init_ui()
         
@@ -203,24 +198,29 @@ class MouseClicker(QMainWindow):
         self.count_label.setText(f"点击次数: {count}")
         
     def load_config(self):
-        try:
-            with open('config.json', 'r') as f:
-                self.config.update(json.load(f))
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+        # 从统一配置读取（进程内只解析一次），限制在本界面的取值范围内
+        click = self.settings.section('click')
+        self.config['frequency'] = max(1, min(100, round(click['frequency'])))
+        self.config['max_clicks'] = max(1, min(10000, click['max_clicks'])) if click['max_clicks'] else self.config['max_clicks']
+        self.config['button'] = button_label(click['button'])
+        self.config['click_type'] = click_type_label(click['click_type'])
             
     def save_config(self):
-        try:
-            with open('config.json', 'w') as f:
-                json.dump(self.config, f, indent=2)
-        except Exception:
-            pass
+        # 写回统一配置，由后台线程去抖后写盘
+        self.settings.update(
+            'click',
+            frequency=self.config['frequency'],
+            max_clicks=self.config['max_clicks'],
+            button=button_value(self.config['button']),
+            click_type=click_type_value(self.config['click_type'])
+        )
             
     def closeEvent(self, event):
         if self.worker and self.worker.isRunning():
             self.worker.stop()
             self.worker.wait()
         self.save_config()
+        self.settings.close()
         event.accept()
 
 
@@ -229,6 +229,7 @@ def main():
     app.setStyle('Fusion')
     
     window = MouseClicker()
+    startup.install_probe(window)
     window.show()
     
     sys.exit(app.exec_())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动时间基准 - 测量每个入口从启动进程到主窗口第一次绘制的时间
+每个入口在独立的临时 HOME/工作目录中多次冷启动，取中位数与
+startup_budget.json 中的预算比较；超出预算（含容差）或首次绘制前
+已经导入了应推迟加载的模块（pynput / keyboard / Quartz 等）时返回非零。
+
+    python3 bench_startup.py              # 测量并检查预算
+    python3 bench_startup.py --runs 10    # 每个入口启动 10 次
+    python3 bench_startup.py --update     # 用本机测量结果重写预算
+
+没有图形界面的环境（CI、SSH）自动使用 Qt 的 offscreen 平台。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from startup import PROBE_ENV_VAR, READY_MARKER
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BUDGET_FILE = os.path.join(ROOT, 'startup_budget.json')
+
+ENTRY_POINTS = (
+    'auto_clicker.py',
+    'auto_clicker_simple.py',
+    'auto_clicker_hotkey.py',
+    'auto_clicker_native.py',
+    'auto_clicker_multi_position.py',
+)
+
+# 首次绘制前不应导入的模块：平台后端与不常用的子系统
+DEFERRED_MODULES = ('pynput', 'keyboard', 'Quartz', 'AppKit', 'Xlib', 'configparser')
+
+
+def measure_once(entry, timeout=30.0):
+    """冷启动一次入口，返回 (首次绘制耗时毫秒, 已导入的顶层模块集合)"""
+    env = dict(os.environ)
+    env[PROBE_ENV_VAR] = '1'
+    if not env.get('DISPLAY') and sys.platform.startswith('linux'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    with tempfile.TemporaryDirectory() as home:
+        # 独立的 HOME 与工作目录：不读写用户的真实配置
+        env['HOME'] = home
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, entry)],
+            cwd=home, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        try:
+            for line in proc.stdout:
+                if line.startswith(READY_MARKER):
+                    elapsed = (time.perf_counter() - start) * 1000
+                    modules = set(line[len(READY_MARKER):].strip().split(','))
+                    proc.wait(timeout)
+                    return elapsed, modules
+            raise RuntimeError(f"{entry} 在显示窗口前退出 (返回码 {proc.wait(timeout)})")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+def load_budget():
+    try:
+        with open(BUDGET_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'tolerance': 0.25, 'budgets_ms': {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量各入口的启动时间')
+    parser.add_argument('--runs', type=int, default=5, help='每个入口的启动次数')
+    parser.add_argument('--update', action='store_true', help='用本次测量结果重写预算文件')
+    parser.add_argument('entries', nargs='*', help='只测量指定入口')
+    args = parser.parse_args()
+
+    budget = load_budget()
+    budgets = budget.setdefault('budgets_ms', {})
+    tolerance = budget.get('tolerance', 0.25)
+    entries = args.entries or ENTRY_POINTS
+
+    print("启动时间基准（启动进程 -> 主窗口首次绘制）")
+    print("=" * 60)
+    failed = False
+    for entry in entries:
+        try:
+            results = [measure_once(entry) for _ in range(args.runs)]
+        except Exception as e:
+            print(f"❌ {entry}: {e}")
+            failed = True
+            continue
+        times = [t for t, _ in results]
+        median = statistics.median(times)
+        eager = sorted(set().union(*(m for _, m in results)) & set(DEFERRED_MODULES))
+        limit = budgets.get(entry)
+
+        line = f"{entry:34s} 中位数 {median:7.1f} ms  最快 {min(times):7.1f} ms"
+        if args.update:
+            # 预算取整到 10ms，留出机器间差异的余量由 tolerance 负责
+            budgets[entry] = int(-(-median // 10) * 10)
+            print(f"📝 {line}  -> 预算 {budgets[entry]} ms")
+        elif limit is None:
+            print(f"⚠️  {line}  (无预算)")
+        elif median > limit * (1 + tolerance):
+            print(f"❌ {line}  超出预算 {limit} ms (+{tolerance:.0%})")
+            failed = True
+        else:
+            print(f"✅ {line}  预算 {limit} ms")
+        if eager:
+            print(f"   ❌ 首次绘制前已导入: {', '.join(eager)}")
+            failed = True
+
+    if args.update:
+        with open(BUDGET_FILE, 'w', encoding='utf-8') as f:
+            json.dump(budget, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"\n已更新 {os.path.basename(BUDGET_FILE)}")
+    if failed:
+        print("\n❌ 启动时间检查未通过")
+        sys.exit(1)
+    print("\n✅ 启动时间检查通过")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连点工作线程基准 - 用内存中的假鼠标后端测量每种工作线程的实际表现
+不注入任何真实事件，也不需要显示器；每种工作线程、每个目标频率测量：
+- 实际点击频率 (cps) 与目标频率之比
+- 相邻点击间隔相对目标间隔的抖动 p50 / p99 / max（毫秒）
+- 停止延迟：调用 stop() 到线程结束的时间（毫秒）
+- CPU 时间：工作线程消耗的 CPU 时间及每次点击的平均值（微秒）
+
+    python3 bench_workers.py                          # 打印结果表
+    python3 bench_workers.py --output bench.json      # 同时保存 JSON
+    python3 bench_workers.py --compare old.json       # 与之前的结果对比
+    python3 bench_workers.py --rates 50,200 --seconds 2 --workers engine,multi
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from array import array
+
+from click_engine import ClickEngine, timing_summary
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeMouse:
+    """假鼠标后端：只记录每次点击的时间戳"""
+
+    def __init__(self):
+        self.timestamps = array('d')
+        self.moves = 0
+
+    def move(self, x, y):
+        self.moves += 1
+
+    def position(self):
+        return (0, 0)
+
+    def click(self, button='left', count=1):
+        self.timestamps.append(time.perf_counter())
+
+
+def _make_engine(rate, max_clicks, mouse):
+    return ClickEngine(rate=rate, count=max_clicks, mouse=mouse)
+
+
+def _make_scheduler(rate, max_clicks, mouse):
+    from job_scheduler import ClickJob, JobScheduler
+    scheduler = JobScheduler(mouse=mouse)
+    scheduler.submit(ClickJob(rate=rate, count=max_clicks))
+    return scheduler
+
+
+def _make_auto_clicker(rate, max_clicks, mouse):
+    from auto_clicker import ClickThread
+    return ClickThread('left', max(1, round(1000.0 / rate)), max_clicks, mouse=mouse)
+
+
+def _make_simple(rate, max_clicks, mouse):
+    from auto_clicker_simple import ClickWorker
+    config = {'frequency': rate, 'max_clicks': max_clicks, 'button': '左键', 'click_type': '单击'}
+    return ClickWorker(config, mouse=mouse)
+
+
+def _make_hotkey(rate, max_clicks, mouse):
+    from auto_clicker_hotkey import ClickWorker
+    config = {'frequency': rate, 'max_clicks': max_clicks, 'button': '左键', 'click_type': '单击'}
+    return ClickWorker(config, mouse=mouse)
+
+
+def _make_native(rate, max_clicks, mouse):
+    from auto_clicker_native import ClickWorker
+    return ClickWorker('单击', rate, max_clicks, '左键', mouse=mouse)
+
+
+def _make_multi(rate, max_clicks, mouse):
+    from auto_clicker_multi_position import MultiPositionClickWorker
+    positions = [(100, 100, '位置1'), (200, 200, '位置2'), (300, 300, '位置3')]
+    return MultiPositionClickWorker(positions, '单击', rate, max_clicks, '左键', True, mouse=mouse)
+
+
+def _make_multi_motion(rate, max_clicks, mouse):
+    from auto_clicker_multi_position import MultiPositionClickWorker
+    positions = [(100, 100, '位置1'), (600, 400, '位置2'), (300, 700, '位置3')]
+    return MultiPositionClickWorker(positions, '单击', rate, max_clicks, '左键', True, mouse=mouse,
+                                    human_motion=True)
+
+
+# 名称 -> (类名, 构造函数(频率, 最大次数, 鼠标后端))
+WORKERS = {
+    'engine': ('click_engine.ClickEngine', _make_engine),
+    'scheduler': ('job_scheduler.JobScheduler', _make_scheduler),
+    'auto_clicker': ('auto_clicker.ClickThread', _make_auto_clicker),
+    'simple': ('auto_clicker_simple.ClickWorker', _make_simple),
+    'hotkey': ('auto_clicker_hotkey.ClickWorker', _make_hotkey),
+    'native': ('auto_clicker_native.ClickWorker', _make_native),
+    'multi': ('auto_clicker_multi_position.MultiPositionClickWorker', _make_multi),
+    'multi_motion': ('auto_clicker_multi_position.MultiPositionClickWorker(human_motion)', _make_multi_motion),
+}
+
+
+def run_worker(worker):
+    """在普通线程中执行工作线程的 run()，返回 (线程, CPU 时间记录)"""
+    cpu = {}
+
+    def target():
+        start = time.thread_time()
+        worker.run()
+        cpu['seconds'] = time.thread_time() - start
+        cpu['finished'] = time.perf_counter()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, cpu
+
+
+def measure_throughput(factory, rate, seconds):
+    """按目标频率点击固定次数，统计实际频率、抖动与 CPU 时间"""
+    clicks = max(20, int(rate * seconds))
+    mouse = FakeMouse()
+    worker = factory(rate, clicks, mouse)
+    thread, cpu = run_worker(worker)
+    thread.join(seconds * 10 + 5)
+    if thread.is_alive():
+        worker.stop()
+        thread.join(1.0)
+    summary = timing_summary(mouse.timestamps, 1.0 / rate)
+    summary['cpu_s'] = round(cpu.get('seconds', 0.0), 4)
+    summary['cpu_per_click_us'] = round(cpu.get('seconds', 0.0) / max(1, summary['clicks']) * 1e6, 2)
+    return summary
+
+
+def measure_stop_latency(factory, rate, trials=5):
+    """运行中调用 stop()，测量到线程结束的时间（毫秒）"""
+    latencies = []
+    for _ in range(trials):
+        mouse = FakeMouse()
+        worker = factory(rate, 10 ** 9, mouse)
+        thread, cpu = run_worker(worker)
+        # 等到已经开始点击再停止，停止时刻落在随机的间隔相位上
+        deadline = time.perf_counter() + 1.0
+        while len(mouse.timestamps) < 3 and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        time.sleep((1.0 / rate) * (len(latencies) + 0.5) / trials)
+        stopped = time.perf_counter()
+        worker.stop()
+        thread.join(5.0)
+        latencies.append((cpu.get('finished', time.perf_counter()) - stopped) * 1000)
+    latencies.sort()
+    return {
+        'p50': round(statistics.median(latencies), 3),
+        'max': round(latencies[-1], 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_table(results):
+    print(f"{'工作线程':14s} {'目标':>6s} {'实际':>9s} {'达成':>7s} "
+          f"{'p50ms':>7s} {'p99ms':>7s} {'maxms':>7s} {'停止ms':>8s} {'CPU/次us':>9s}")
+    for r in results:
+        print(f"{r['worker']:14s} {r['target_cps']:6g} {r['achieved_cps']:9.2f} "
+              f"{r['achieved_cps'] / r['target_cps']:7.1%} "
+              f"{r['jitter_ms']['p50']:7.3f} {r['jitter_ms']['p99']:7.3f} {r['jitter_ms']['max']:7.3f} "
+              f"{r['stop_latency_ms']['max']:8.2f} {r['cpu_per_click_us']:9.1f}")
+
+
+def print_comparison(results, baseline):
+    old = {(r['worker'], r['target_cps']): r for r in baseline.get('results', [])}
+    print(f"\n与 {baseline.get('commit') or '基准'} 对比（新 - 旧）:")
+    print(f"{'工作线程':14s} {'目标':>6s} {'Δ实际cps':>10s} {'Δp99ms':>9s} {'Δ停止ms':>9s} {'ΔCPU/次us':>10s}")
+    for r in results:
+        o = old.get((r['worker'], r['target_cps']))
+        if not o:
+            continue
+        print(f"{r['worker']:14s} {r['target_cps']:6g} "
+              f"{r['achieved_cps'] - o['achieved_cps']:+10.2f} "
+              f"{r['jitter_ms']['p99'] - o['jitter_ms']['p99']:+9.3f} "
+              f"{r['stop_latency_ms']['max'] - o['stop_latency_ms']['max']:+9.2f} "
+              f"{r['cpu_per_click_us'] - o['cpu_per_click_us']:+10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='连点工作线程基准（假鼠标后端）')
+    parser.add_argument('--rates', default='10,100,500', help='目标频率列表（次/秒），逗号分隔')
+    parser.add_argument('--seconds', type=float, default=1.0, help='每项测量的目标时长')
+    parser.add_argument('--workers', default=','.join(WORKERS), help='要测量的工作线程，逗号分隔')
+    parser.add_argument('--output', help='把结果写入 JSON 文件')
+    parser.add_argument('--json', action='store_true', help='向标准输出打印 JSON 而不是表格')
+    parser.add_argument('--compare', help='与之前保存的 JSON 结果对比')
+    args = parser.parse_args()
+
+    # 工作线程都是 QThread 子类；不创建窗口，无显示器时使用 offscreen 平台
+    if not os.environ.get('DISPLAY') and sys.platform.startswith('linux'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    rates = [float(r) for r in args.rates.split(',') if r]
+    results = []
+    for name in [w for w in args.workers.split(',') if w]:
+        if name not in WORKERS:
+            parser.error(f"未知的工作线程: {name}（可选: {', '.join(WORKERS)}）")
+        label, factory = WORKERS[name]
+        for rate in rates:
+            summary = measure_throughput(factory, rate, args.seconds)
+            results.append({
+                'worker': name,
+                'class': label,
+                'target_cps': rate,
+                'achieved_cps': summary['achieved_rate'],
+                'clicks': summary['clicks'],
+                'jitter_ms': summary['jitter_ms'],
+                'stop_latency_ms': measure_stop_latency(factory, rate),
+                'cpu_s': summary['cpu_s'],
+                'cpu_per_click_us': summary['cpu_per_click_us'],
+            })
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seconds': args.seconds,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        print_table(results)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连点引擎 - 不依赖 Qt 的点击调度核心
+按截止时间调度每一次点击（第 i 次点击安排在 开始时间 + i × 间隔），
+sleep 的误差不会逐次累积；停止通过 threading.Event 立即唤醒等待。
+鼠标后端可以注入：默认使用 pynput（首次使用时才导入），
+测试与基准可以传入只记录调用的假后端。
+"""
+
+import math
+import threading
+import time
+from array import array
+
+import tracing
+
+BUTTONS = ('left', 'right', 'middle')
+
+
+class PynputMouse:
+    """pynput 鼠标后端：move(x, y) / click(按键名, 次数) / press / release / position()"""
+
+    def __init__(self):
+        from pynput.mouse import Button, Controller
+        self._controller = Controller()
+        self._buttons = {name: getattr(Button, name) for name in BUTTONS}
+
+    def move(self, x, y):
+        self._controller.position = (x, y)
+
+    def position(self):
+        return self._controller.position
+
+    def click(self, button='left', count=1):
+        self._controller.click(self._buttons.get(button, self._buttons['left']), count)
+
+    def press(self, button='left'):
+        self._controller.press(self._buttons.get(button, self._buttons['left']))
+
+    def release(self, button='left'):
+        self._controller.release(self._buttons.get(button, self._buttons['left']))
+
+
+class NullMouse:
+    """不注入任何事件的后端：只计数（--dry-run 演练用）"""
+
+    def __init__(self):
+        self.clicks = 0
+        self._position = (0, 0)
+
+    def move(self, x, y):
+        self._position = (x, y)
+
+    def position(self):
+        return self._position
+
+    def click(self, button='left', count=1):
+        self.clicks += count
+
+    def press(self, button='left'):
+        pass
+
+    def release(self, button='left'):
+        pass
+
+
+# 动作步骤：(相对动作开始的秒数, 操作, 参数1, 参数2)；按键为 None 时使用本次点击的按键
+STEP_MOVE, STEP_PRESS, STEP_RELEASE, STEP_CLICK = range(4)
+
+
+def double_click(button=None, gap=0.05):
+    """两次单击，间隔 gap 秒"""
+    return ((0.0, STEP_CLICK, button, 1), (gap, STEP_CLICK, button, 1))
+
+
+def hold(button=None, duration=0.1):
+    """按下并保持 duration 秒后松开"""
+    return ((0.0, STEP_PRESS, button, None), (duration, STEP_RELEASE, button, None))
+
+
+def drag(start, end, button=None, duration=0.2, rate=120):
+    """在 start 按下，沿直线用 duration 秒移动到 end 后松开"""
+    (x0, y0), (x1, y1) = start, end
+    n = max(1, int(round(duration * rate)))
+    steps = [(0.0, STEP_MOVE, x0, y0), (0.0, STEP_PRESS, button, None)]
+    for k in range(1, n + 1):
+        steps.append((duration * k / n, STEP_MOVE, round(x0 + (x1 - x0) * k / n), round(y0 + (y1 - y0) * k / n)))
+    steps.append((duration, STEP_RELEASE, button, None))
+    return tuple(steps)
+
+
+def chord(buttons, duration=0.05):
+    """同时按下多个按键，保持 duration 秒后按相反顺序松开"""
+    buttons = tuple(buttons)
+    return (tuple((0.0, STEP_PRESS, b, None) for b in buttons)
+            + tuple((duration, STEP_RELEASE, b, None) for b in reversed(buttons)))
+
+
+def number(value, field, minimum=None, integer=False):
+    """检查参数为有限的数值（不接受字符串与布尔值），无效时抛出 ValueError
+
+    minimum 为允许的最小值（不含；integer 为 True 时包含），integer 要求整数。
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{field} 必须是数值: {value!r}")
+    if integer:
+        if value != int(value):
+            raise ValueError(f"{field} 必须是整数: {value!r}")
+        value = int(value)
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{field} 不能小于 {minimum}: {value}")
+    elif minimum is not None and not value > minimum:
+        raise ValueError(f"{field} 必须大于 {minimum}: {value}")
+    return value
+
+
+def _point(spec, key):
+    value = spec.get(key)
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError(f"{key} 必须是 [x, y]: {value!r}")
+    return tuple(number(v, f"{key} 的坐标", integer=True) for v in value)
+
+
+def action_from_spec(spec):
+    """JSON 动作描述 -> 动作步骤，参数无效时抛出 ValueError
+
+        {"type": "hold", "duration": 0.15, "button": "right"}
+        {"type": "double", "gap": 0.08}
+        {"type": "drag", "from": [100, 200], "to": [400, 200], "duration": 0.3}
+        {"type": "chord", "buttons": ["left", "right"], "duration": 0.05}
+
+    时长与间隔为非负秒数，坐标为整数，按键取 BUTTONS 中的名称。
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"动作必须是 JSON 对象: {spec!r}")
+    kind = spec.get('type')
+    button = spec.get('button')
+    if button is not None and button not in BUTTONS:
+        raise ValueError(f"按键无效: {button!r}")
+
+    def seconds(key, default):
+        value = number(spec.get(key, default), key)
+        if value < 0:
+            raise ValueError(f"{key} 不能小于 0: {value}")
+        return float(value)
+
+    if kind == 'hold':
+        return hold(button, seconds('duration', 0.1))
+    if kind == 'double':
+        return double_click(button, seconds('gap', 0.05))
+    if kind == 'drag':
+        return drag(_point(spec, 'from'), _point(spec, 'to'), button, seconds('duration', 0.2))
+    if kind == 'chord':
+        buttons = spec.get('buttons')
+        if (not isinstance(buttons, (list, tuple)) or len(buttons) < 2
+                or any(b not in BUTTONS for b in buttons) or len(set(buttons)) != len(buttons)):
+            raise ValueError(f"chord 需要至少两个不同的有效按键: {buttons!r}")
+        return chord(buttons, seconds('duration', 0.05))
+    raise ValueError(f"未知的动作类型: {kind!r}")
+
+
+def perform(action, mouse, button, base, kill_switch):
+    """从 base 时刻起按时间线执行动作步骤
+
+    返回 (是否完成, 第一步完成的时刻)。中途停止时松开已按下的按键。
+    """
+    clock = time.perf_counter
+    pressed = []
+    first_done = None
+    for offset, op, a, b in action:
+        delay = base + offset - clock()
+        if delay > 0 and kill_switch.wait(delay):
+            for held in reversed(pressed):
+                mouse.release(held)
+            return False, first_done or clock()
+        if op == STEP_MOVE:
+            mouse.move(a, b)
+        elif op == STEP_CLICK:
+            mouse.click(a or button, b)
+        elif op == STEP_PRESS:
+            mouse.press(a or button)
+            pressed.append(a or button)
+        else:
+            mouse.release(a or button)
+            if (a or button) in pressed:
+                pressed.remove(a or button)
+        if first_done is None:
+            first_done = clock()
+    return True, first_done
+
+
+def recorded_button(value):
+    """录制事件中的按键（如 'Button.right'）-> 按键名"""
+    text = str(value or '')
+    return 'right' if 'right' in text else 'middle' if 'middle' in text else 'left'
+
+
+def percentile(sorted_values, fraction):
+    """已排序序列的百分位数（线性插值），空序列返回 0"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * fraction
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def timing_summary(timestamps, interval=None, offsets=None):
+    """根据点击时间戳统计实际频率与抖动（毫秒）
+
+    固定间隔时抖动为 |实际间隔 - 目标间隔|；给出 offsets（按录制节奏回放）
+    时为每次点击相对计划时间的偏差 |(t_i - t_0) - (offset_i - offset_0)|。
+    """
+    clicks = len(timestamps)
+    elapsed = timestamps[-1] - timestamps[0] if clicks > 1 else 0.0
+    if offsets is not None:
+        deviations = sorted(abs((t - timestamps[0]) - (o - offsets[0])) * 1000
+                            for t, o in zip(timestamps[1:], offsets[1:]))
+    else:
+        gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
+        if interval is None and gaps:
+            interval = sum(gaps) / len(gaps)
+        deviations = sorted(abs(g - interval) * 1000 for g in gaps)
+    return {
+        'clicks': clicks,
+        'achieved_rate': round((clicks - 1) / elapsed, 3) if elapsed > 0 else 0.0,
+        'jitter_ms': {
+            'p50': round(percentile(deviations, 0.50), 4),
+            'p99': round(percentile(deviations, 0.99), 4),
+            'max': round(deviations[-1], 4) if deviations else 0.0,
+        },
+    }
+
+
+class ClickEngine:
+    """连点引擎
+
+    rate 为每秒点击次数；positions 为 [(x, y, ...), ...]，为空时在当前
+    光标位置点击。count 为 0 表示不限次数，duration 为 None 表示不限时长。
+    offsets 给出每一次点击相对开始时间的偏移（秒），用于按录制的节奏
+    回放，此时忽略 rate 与 cycle。program 为 macro.compile_macro() 编译的宏，
+    给出时按宏执行（count / duration 仍然限制总点击次数与时长）。
+    action 为 hold() / drag() / chord() / double_click() 等生成的动作步骤，
+    给出时每次点击改为执行该动作（各步骤相对本次截止时间精确调度）。
+    """
+
+    def __init__(self, rate=10.0, count=0, duration=None, positions=None,
+                 button='left', double=False, cycle=True, offsets=None,
+                 mouse=None, kill_switch=None, on_click=None, metrics=None, program=None,
+                 action=None):
+        self.rate = float(rate)
+        self.interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        self.count = int(count)
+        self.duration = duration
+        self.positions = list(positions or [])
+        self.button = button
+        self.double = double
+        self.cycle = cycle
+        self.offsets = list(offsets) if offsets is not None else None
+        self.mouse = mouse
+        self.kill_switch = kill_switch if kill_switch is not None else threading.Event()
+        self.on_click = on_click  # 回调(序号, 位置)，在点击线程中调用
+        self.metrics = metrics  # 可选的 click_metrics.ClickMetrics
+        self.program = program
+        self.action = tuple(action) if action else None
+        self.timestamps = array('d')
+
+    @classmethod
+    def from_recording(cls, events, speed=1.0, **kwargs):
+        """由录制的事件列表构造引擎（按原始节奏回放其中的点击事件）"""
+        clicks = [e for e in events if e.get('type') == 'click']
+        if not clicks:
+            return cls(count=0, positions=[], offsets=[], **kwargs)
+        start = clicks[0]['timestamp']
+        positions = [(int(e['x']), int(e['y']), recorded_button(e.get('button')))
+                     for e in clicks]
+        offsets = [(e['timestamp'] - start) / speed for e in clicks]
+        rate = (len(offsets) - 1) / offsets[-1] if len(offsets) > 1 and offsets[-1] > 0 else 0.0
+        return cls(rate=rate, count=len(clicks), positions=positions, offsets=offsets, **kwargs)
+
+    def stop(self):
+        """停止（可在任意线程调用，立即唤醒等待中的点击线程）"""
+        self.kill_switch.set()
+
+    def _limit(self):
+        if self.offsets is not None:
+            return len(self.offsets)
+        limit = self.count if self.count > 0 else None
+        if not self.cycle and self.positions:
+            limit = min(limit or len(self.positions), len(self.positions))
+        return limit
+
+    def run(self):
+        """在当前线程中执行，结束后返回统计信息"""
+        mouse = self.mouse if self.mouse is not None else PynputMouse()
+        self.mouse = mouse
+        if self.program is not None:
+            return self._run_program(mouse)
+        kill_switch = self.kill_switch
+        metrics = self.metrics
+        positions = self.positions
+        offsets = self.offsets
+        interval = self.interval
+        clicks_per_step = 2 if self.double else 1
+        action = self.action
+        limit = self._limit()
+        timestamps = self.timestamps = array('d')
+
+        start = time.perf_counter()
+        end = start + self.duration if self.duration else None
+        stopped_by = 'count'
+        i = 0
+        while limit is None or i < limit:
+            due = start + (offsets[i] if offsets is not None else i * interval)
+            if end is not None and due > end:
+                stopped_by = 'duration'
+                break
+            delay = due - time.perf_counter()
+            if delay > 0 and kill_switch.wait(delay):
+                stopped_by = 'stop'
+                break
+            if kill_switch.is_set():
+                stopped_by = 'stop'
+                break
+
+            position = positions[i % len(positions)] if positions else None
+            if position is not None:
+                mouse.move(position[0], position[1])
+            button = position[2] if position is not None and len(position) > 2 and position[2] in BUTTONS else self.button
+            started = time.perf_counter()
+            trace_start = tracing.now() if tracing.enabled else 0
+            if action is None:
+                mouse.click(button, clicks_per_step)
+                finished = time.perf_counter()
+            else:
+                # 动作的各步骤相对本次点击开始时刻调度（落后时整体顺延，按住时长不变）
+                done, finished = perform(action, mouse, button, max(due, started), kill_switch)
+                if not done:
+                    stopped_by = 'stop'
+                    break
+            if trace_start:
+                tracing.complete('engine.click', trace_start, tracing.now(), i)
+            timestamps.append(finished)
+            if metrics is not None:
+                metrics.record(due, started, finished)
+            if self.on_click:
+                self.on_click(i, position)
+            i += 1
+
+        summary = timing_summary(timestamps, interval if interval > 0 else None, offsets)
+        summary.update({
+            'target_rate': round(self.rate, 3),
+            'elapsed_s': round(time.perf_counter() - start, 4),
+            'stopped_by': stopped_by,
+        })
+        return summary
+
+    def _run_program(self, mouse):
+        from macro import execute
+        timestamps = self.timestamps = array('d')
+        start = time.perf_counter()
+        stopped_by, steps = execute(self.program, mouse, self.kill_switch, timestamps,
+                                    count=self.count, duration=self.duration,
+                                    metrics=self.metrics, on_click=self.on_click)
+        summary = timing_summary(timestamps)
+        summary.update({
+            'target_rate': round(self.rate, 3),
+            'elapsed_s': round(time.perf_counter() - start, 4),
+            'stopped_by': stopped_by,
+            'steps': steps,
+        })
+        return summary
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连点运行指标 - 工作线程写入环形缓冲区，界面按需采样
+每次点击只在预分配的数组中写三个浮点数并递增计数，不发信号、不加锁；
+界面用定时器调用 snapshot() 计算滑动窗口频率、抖动直方图、
+错过截止时间次数与注入调用耗时。
+"""
+
+import time
+from array import array
+
+# 抖动直方图分桶上界（毫秒），最后一桶为其余所有
+JITTER_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class ClickMetrics:
+    """点击时间记录（单写多读）
+
+    record(due, started, finished)：
+    - due      计划点击时间
+    - started  实际开始注入的时间
+    - finished 注入调用返回的时间
+    均为 time.perf_counter() 的值。started - due 超过 miss_threshold
+    计为一次错过截止时间。读取方不加锁，可能读到正在被覆盖的槽位，
+    对统计显示的影响可以忽略。
+    """
+
+    def __init__(self, interval=0.1, capacity=4096, miss_threshold=None):
+        self.capacity = capacity
+        self.interval = interval
+        # 默认：晚于计划半个间隔（至少 1ms）视为跟不上
+        self.miss_threshold = miss_threshold if miss_threshold is not None else max(interval / 2, 0.001)
+        self._due = array('d', bytes(8 * capacity))
+        self._started = array('d', bytes(8 * capacity))
+        self._finished = array('d', bytes(8 * capacity))
+        self.count = 0
+        self.missed = 0
+
+    def record(self, due, started, finished):
+        """（工作线程）记录一次点击"""
+        slot = self.count % self.capacity
+        self._due[slot] = due
+        self._started[slot] = started
+        self._finished[slot] = finished
+        if started - due > self.miss_threshold:
+            self.missed += 1
+        self.count += 1
+
+    def snapshot(self, window=1.0, now=None):
+        """（界面线程）统计最近 window 秒内的点击"""
+        now = time.perf_counter() if now is None else now
+        count = self.count
+        n = min(count, self.capacity)
+        lateness = []
+        latency = []
+        for k in range(count - n, count):
+            slot = k % self.capacity
+            started = self._started[slot]
+            if now - started > window:
+                continue
+            lateness.append(max(0.0, started - self._due[slot]) * 1000)
+            latency.append((self._finished[slot] - started) * 1000)
+
+        histogram = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        for value in lateness:
+            for i, bound in enumerate(JITTER_BUCKETS_MS):
+                if value < bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[-1] += 1
+        latency.sort()
+        return {
+            'total': count,
+            'missed': self.missed,
+            'rate': len(lateness) / window,
+            'target_rate': 1.0 / self.interval if self.interval > 0 else 0.0,
+            'jitter_histogram': histogram,
+            'latency_ms': {
+                'p50': _percentile(latency, 0.50),
+                'p99': _percentile(latency, 0.99),
+                'max': latency[-1] if latency else 0.0,
+            },
+        }
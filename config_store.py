@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置存储 - 后台去抖、原子写盘
+GUI 线程只提交配置快照并标记为脏，由后台线程在短暂静默后
+写入临时文件再 os.replace 替换，热键启动等操作不会阻塞在磁盘 I/O 上。
+Settings 在此之上提供统一的带版本配置文件，并自动迁移旧版本的配置。
+"""
+
+import copy
+import io
+import json
+import os
+import threading
+import time
+
+from app_logging import get_logger
+
+log = get_logger('config_store')
+
+
+def dump_json(data):
+    """JSON 序列化（保留中文）"""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def dump_ini(data):
+    """{节名: {键: 值}} -> INI 文本"""
+    import configparser
+    parser = configparser.ConfigParser()
+    for section, values in data.items():
+        parser[section] = {k: str(v) for k, v in values.items()}
+    buf = io.StringIO()
+    parser.write(buf)
+    return buf.getvalue()
+
+
+def atomic_write(path, text):
+    """先写同目录临时文件并 fsync，再 os.replace 原子替换目标文件"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigStore:
+    """配置存储
+
+    save() 只记录最新快照并唤醒后台线程；后台线程等到 delay 秒内
+    没有新的修改后再写盘（连续修改合并为一次写入）。写入时先写
+    同目录下的临时文件，再用 os.replace 原子替换，中途崩溃不会
+    留下半个配置文件。flush() 在调用线程中立即写出未保存的修改，
+    用于程序退出。
+    """
+
+    def __init__(self, path, serializer=dump_json, delay=0.5):
+        self.path = path
+        self.serializer = serializer
+        self.delay = delay
+        self._pending = None
+        self._last_change = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def dirty(self):
+        return self._pending is not None
+
+    def save(self, data):
+        """提交配置快照（不阻塞）"""
+        with self._cond:
+            self._pending = data
+            self._last_change = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """立即写出未保存的修改（后台线程正在写盘时等待其完成）"""
+        with self._write_lock:
+            with self._cond:
+                data = self._pending
+                self._pending = None
+            if data is not None:
+                self._write(data)
+
+    def close(self):
+        """写出未保存的修改并结束后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # 去抖：直到 delay 秒内没有新的修改
+                while not self._closed:
+                    remaining = self._last_change + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+
+    def _write(self, data):
+        try:
+            atomic_write(self.path, self.serializer(data))
+        except Exception as e:
+            log.error("保存配置失败: %s", e)
+
+
+# ---------------------------------------------------------------------------
+# 统一配置：单个带版本号的文件 + 类型化 schema + 旧配置自动迁移
+# ---------------------------------------------------------------------------
+
+SCHEMA_VERSION = 1
+SETTINGS_FILE = os.path.join(os.path.expanduser('~'), '.auto_clicker_settings.json')
+
+# 旧版本各界面各自维护的配置文件（按迁移顺序，后者覆盖前者的同名设置）
+LEGACY_FILES = ('config.ini', 'config.json', 'config_hotkey.json', 'config_native.json')
+LEGACY_MULTI_FILE = os.path.join(os.path.expanduser('~'), '.auto_clicker_multi_config.json')
+
+BUTTON_LABELS = {'left': '左键', 'right': '右键', 'middle': '中键'}
+CLICK_TYPE_LABELS = {'single': '单击', 'double': '双击'}
+
+
+def _combo(key):
+    return {'ctrl': True, 'option': True, 'shift': False, 'command': False, 'key': key}
+
+
+# 节名 -> {字段名: (类型, 默认值)}
+SCHEMA = {
+    'click': {
+        'button': (str, 'left'),          # left / right / middle
+        'click_type': (str, 'single'),    # single / double
+        'frequency': (float, 10.0),       # 次/秒
+        'max_clicks': (int, 0),           # 0 = 无限
+        'hold_mode': (bool, False),
+        'isolated': (bool, False),        # 在独立进程中运行连点引擎（原生热键版）
+    },
+    'hotkeys': {
+        'toggle_key': (str, 'f6'),        # 单键开始/停止（auto_clicker.py）
+        'start_key': (str, 'f6'),         # 单键开始（auto_clicker_hotkey.py）
+        'stop_key': (str, 'f7'),          # 单键停止（auto_clicker_hotkey.py）
+        'start_combo': (dict, _combo('S')),  # 组合键开始（原生热键版）
+        'stop_combo': (dict, _combo('D')),   # 组合键停止（原生热键版）
+        'profiles': (dict, {}),           # 热键方案
+    },
+    'multi_position': {
+        'positions': (list, []),          # [[x, y, name], ...]
+        'cycle_mode': (bool, True),
+        'human_motion': (bool, False),    # 沿拟人轨迹移动到目标（trajectory.py）
+        'active_profile': (str, ''),      # 当前选中的位置方案（profile_library）
+    },
+}
+
+
+def button_label(value):
+    """'left' -> '左键'"""
+    return BUTTON_LABELS.get(value, BUTTON_LABELS['left'])
+
+
+def button_value(label):
+    """'左键' -> 'left'（也接受 'left' 本身）"""
+    for value, text in BUTTON_LABELS.items():
+        if label in (value, text):
+            return value
+    return 'left'
+
+
+def click_type_label(value):
+    """'single' -> '单击'"""
+    return CLICK_TYPE_LABELS.get(value, CLICK_TYPE_LABELS['single'])
+
+
+def click_type_value(label):
+    """'单击' -> 'single'（也接受 'single' 本身）"""
+    for value, text in CLICK_TYPE_LABELS.items():
+        if label in (value, text):
+            return value
+    return 'single'
+
+
+def _coerce(value, kind, default):
+    """按 schema 类型转换字段值，无法转换时使用默认值"""
+    try:
+        if kind is bool:
+            if isinstance(value, str):
+                return value.strip().lower() in ('1', 'true', 'yes', 'on')
+            return bool(value)
+        if kind in (int, float):
+            return kind(value)
+        if kind is str:
+            return str(value)
+        if isinstance(value, kind):
+            return copy.deepcopy(value)
+    except (TypeError, ValueError):
+        pass
+    return copy.deepcopy(default)
+
+
+def validate(data):
+    """按 schema 补齐缺失字段、转换类型并丢弃未知字段"""
+    result = {'version': SCHEMA_VERSION}
+    for section, fields in SCHEMA.items():
+        source = data.get(section) if isinstance(data.get(section), dict) else {}
+        result[section] = {
+            name: _coerce(source[name], kind, default) if name in source else copy.deepcopy(default)
+            for name, (kind, default) in fields.items()
+        }
+    return result
+
+
+def _read_legacy(path):
+    if path.endswith('.ini'):
+        import configparser
+        parser = configparser.ConfigParser()
+        parser.read(path, encoding='utf-8')
+        return {name: dict(parser[name]) for name in parser.sections()}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _migrate_legacy_file(name, raw, data):
+    """将一个旧配置文件的内容合并进统一配置"""
+    click, hotkeys, multi = data['click'], data['hotkeys'], data['multi_position']
+    if name == 'config.ini':
+        ini = raw.get('Settings', {})
+        if 'click_type' in ini:
+            click['button'] = ini['click_type']
+        if 'interval' in ini and float(ini['interval']) > 0:
+            click['frequency'] = 1000.0 / float(ini['interval'])
+        for key in ('max_clicks', 'hold_mode'):
+            if key in ini:
+                click[key] = ini[key]
+        if 'hotkey' in ini:
+            hotkeys['toggle_key'] = ini['hotkey']
+        return
+    # JSON 版本的通用字段
+    for key in ('frequency', 'max_clicks'):
+        if key in raw:
+            click[key] = raw[key]
+    if 'button' in raw or 'button_type' in raw:
+        click['button'] = button_value(raw.get('button', raw.get('button_type')))
+    if 'click_type' in raw:
+        click['click_type'] = click_type_value(raw['click_type'])
+    if 'hotkey_start' in raw:
+        hotkeys['start_key'] = raw['hotkey_start']
+    if 'hotkey_stop' in raw:
+        hotkeys['stop_key'] = raw['hotkey_stop']
+    hk = raw.get('hotkey_config')
+    if isinstance(hk, dict):
+        from hotkey_dispatch import flags_from_mods
+        if 'start_mods' in hk or 'start_key' in hk:   # 原生热键版格式
+            hotkeys['start_combo'] = flags_from_mods(hk.get('start_mods', []), hk.get('start_key', 'S'))
+            hotkeys['stop_combo'] = flags_from_mods(hk.get('stop_mods', []), hk.get('stop_key', 'D'))
+        if isinstance(hk.get('start'), dict):         # 多位置版格式
+            hotkeys['start_combo'] = hk['start']
+        if isinstance(hk.get('stop'), dict):
+            hotkeys['stop_combo'] = hk['stop']
+        if isinstance(hk.get('profiles'), dict):
+            hotkeys['profiles'] = hk['profiles']
+    if 'positions' in raw:
+        positions = []
+        for pos in raw['positions']:
+            if isinstance(pos, dict):
+                positions.append([int(pos['x']), int(pos['y']), pos['name']])
+            elif isinstance(pos, (list, tuple)) and len(pos) >= 3:
+                positions.append([int(pos[0]), int(pos[1]), pos[2]])
+        multi['positions'] = positions
+    if 'cycle_mode' in raw:
+        multi['cycle_mode'] = raw['cycle_mode']
+
+
+def migrate_legacy(legacy_dir='.', multi_file=LEGACY_MULTI_FILE):
+    """读取所有旧配置文件并转换为统一配置；没有任何旧文件时返回 None"""
+    data = validate({})
+    found = False
+    paths = [(name, os.path.join(legacy_dir, name)) for name in LEGACY_FILES]
+    paths.append(('multi', multi_file))
+    for name, path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            _migrate_legacy_file(name, _read_legacy(path), data)
+            found = True
+        except Exception as e:
+            print(f"迁移旧配置 {path} 失败: {e}")
+    return validate(data) if found else None
+
+
+class Settings:
+    """统一配置
+
+    启动时只解析一个小文件；文件不存在时自动迁移旧版本的各个配置文件。
+    各界面通过 section() 读取同一份已解析的数据，通过 update() 修改，
+    修改经 ConfigStore 去抖后在后台原子写盘。
+    """
+
+    def __init__(self, path=SETTINGS_FILE, legacy_dir='.'):
+        self.path = path
+        self.store = ConfigStore(path)
+        self._lock = threading.Lock()
+        self.data = self._load(legacy_dir)
+
+    def _load(self, legacy_dir):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return validate(json.load(f))
+            except Exception as e:
+                print(f"加载配置失败: {e}")
+                return validate({})
+        data = migrate_legacy(legacy_dir)
+        if data is None:
+            return validate({})
+        # 迁移结果写回统一文件，下次启动只需解析这一个文件
+        self.store.save(copy.deepcopy(data))
+        return data
+
+    def section(self, name):
+        """返回某一节的副本"""
+        with self._lock:
+            return copy.deepcopy(self.data[name])
+
+    def get(self, section, key):
+        with self._lock:
+            return copy.deepcopy(self.data[section][key])
+
+    def update(self, section, **values):
+        """按 schema 修改字段并提交后台保存"""
+        fields = SCHEMA[section]
+        with self._lock:
+            target = self.data[section]
+            for key, value in values.items():
+                if key in fields:
+                    kind, default = fields[key]
+                    target[key] = _coerce(value, kind, default)
+            snapshot = copy.deepcopy(self.data)
+        self.store.save(snapshot)
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def load_settings(path=None):
+    """获取进程内共享的统一配置（首次调用时加载）"""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings(path or SETTINGS_FILE)
+        return _settings
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地控制接口 - Unix 域套接字上的换行分隔 JSON（asyncio）
+测试编排程序可以不经过界面按钮或全局热键，直接启动/停止连点任务、
+加载位置方案、实时修改频率与位置，并订阅运行指标。所有任务在同一个
+JobScheduler 调度线程上运行。
+
+每行一个请求，服务端按顺序每行回复一个结果（带上请求中的 "id"）；
+请求可以连续发送而不必等待回复（流水线），每秒数百次重新配置也没有问题。
+
+    {"cmd": "ping"}
+    {"cmd": "start", "name": "A", "rate": 20, "positions": [[100, 200]], "count": 0}
+    {"cmd": "update", "job": "A", "rate": 50, "profile": "任务1"}
+    {"cmd": "stop", "job": "A"}                 # 不给 job 时停止全部任务
+    {"cmd": "jobs"}
+    {"cmd": "profiles"}
+    {"cmd": "metrics", "interval": 0.5}          # 订阅：之后持续推送 {"event": "metrics", ...}
+    {"cmd": "unsubscribe"}
+
+    python3 -m control_server                       # 启动服务
+    python3 -m control_server --send '{"cmd": "jobs"}'
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+from app_logging import get_logger
+from click_engine import NullMouse, number
+from click_metrics import ClickMetrics
+from job_scheduler import RECONFIGURABLE, JobScheduler, job_from_spec, profile_positions
+
+log = get_logger('control_server')
+
+DEFAULT_SOCKET = os.path.join(os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir(),
+                              f"auto_clicker-{os.getuid() if hasattr(os, 'getuid') else 'user'}.sock")
+LINE_LIMIT = 1 << 20          # 单行请求上限（位置列表可能较长）
+DRAIN_THRESHOLD = 1 << 16     # 写缓冲超过该值时才等待对端读取
+FINISHED_LIMIT = 64           # 最多保留的已结束任务（供 jobs 命令查询，最早启动的先丢弃）
+
+
+class Session:
+    """一个客户端连接"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.stream_task = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+
+    def stream_done(self, task):
+        """指标推送任务意外结束时记录日志并通知客户端"""
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        if isinstance(error, ConnectionError):
+            return
+        log.error("指标推送出错: %s: %s", type(error).__name__, error)
+        if self.stream_task is task:
+            self.stream_task = None
+        try:
+            self.send({'event': 'error', 'error': f"指标推送已停止: {type(error).__name__}: {error}"})
+        except Exception:
+            pass
+
+    def close(self):
+        if self.stream_task is not None:
+            self.stream_task.cancel()
+            self.stream_task = None
+
+
+class ControlServer:
+    """控制接口服务端：请求在事件循环中逐行处理，任务交给调度线程执行"""
+
+    def __init__(self, path=DEFAULT_SOCKET, scheduler=None):
+        self.path = path
+        self.scheduler = scheduler if scheduler is not None else JobScheduler()
+        self.jobs = {}       # 任务名 -> ClickJob（保留最近一次同名任务）
+        self._numbers = itertools.count(1)
+        self.server = None
+        self.handlers = {
+            'ping': self.cmd_ping,
+            'start': self.cmd_start,
+            'stop': self.cmd_stop,
+            'update': self.cmd_update,
+            'jobs': self.cmd_jobs,
+            'profiles': self.cmd_profiles,
+            'metrics': self.cmd_metrics,
+            'unsubscribe': self.cmd_unsubscribe,
+        }
+
+    # ---- 请求处理 -------------------------------------------------------
+
+    def handle(self, request, session):
+        """处理一条请求，返回回复（不含 id）"""
+        handler = self.handlers.get(request.get('cmd'))
+        if handler is None:
+            return {'ok': False, 'error': f"未知命令: {request.get('cmd')!r}"}
+        try:
+            result = handler(request, session)
+        except (ValueError, KeyError, TypeError) as e:
+            return {'ok': False, 'error': str(e)}
+        result['ok'] = True
+        return result
+
+    def _job(self, request):
+        name = request.get('job')
+        job = self.jobs.get(name)
+        if job is None:
+            raise ValueError(f"没有名为 {name!r} 的任务")
+        return job
+
+    def cmd_ping(self, request, session):
+        return {'pong': True}
+
+    def cmd_start(self, request, session):
+        name = request.get('name')
+        if not name:
+            name = f"job{next(self._numbers)}"
+            while name in self.jobs:
+                name = f"job{next(self._numbers)}"
+        old = self.jobs.get(name)
+        if old is not None and not old.finished:
+            raise ValueError(f"任务 {name} 正在运行")
+        job = job_from_spec(dict(request, name=name))
+        job.metrics = ClickMetrics(interval=job.interval or 1.0)
+        # 同名任务重新插入到末尾，已结束的任务按启动先后淘汰
+        self.jobs.pop(name, None)
+        self.jobs[name] = self.scheduler.submit(job)
+        self._forget_finished()
+        return {'job': name}
+
+    def _forget_finished(self):
+        """已结束的任务超过 FINISHED_LIMIT 时丢弃最早启动的"""
+        finished = [name for name, job in self.jobs.items() if job.finished]
+        for name in finished[:max(0, len(finished) - FINISHED_LIMIT)]:
+            del self.jobs[name]
+
+    def cmd_stop(self, request, session):
+        if request.get('job') is not None:
+            targets = [self._job(request)]
+        else:
+            targets = list(self.jobs.values())
+        stopped = []
+        for job in targets:
+            if not job.finished:
+                self.scheduler.cancel(job)
+                stopped.append(job.name)
+        return {'stopped': stopped}
+
+    def cmd_update(self, request, session):
+        job = self._job(request)
+        changes = {k: v for k, v in request.items() if k in RECONFIGURABLE}
+        if request.get('profile'):
+            changes['positions'], _ = profile_positions(request['profile'])
+        self.scheduler.reconfigure(job, **changes)
+        return {'job': job.name}
+
+    def _job_info(self, job):
+        info = {
+            'name': job.name,
+            'running': not job.finished,
+            'clicks': job.metrics.count if job.metrics is not None else job.index,
+            'target_rate': round(job.rate, 3),
+            'positions': len(job.positions),
+        }
+        if job.summary is not None:
+            info['summary'] = job.summary
+            if 'error' in job.summary:
+                info['error'] = job.summary['error']
+        return info
+
+    def cmd_jobs(self, request, session):
+        return {'jobs': [self._job_info(job) for job in self.jobs.values()]}
+
+    def cmd_profiles(self, request, session):
+        from profile_library import ProfileLibrary
+        return {'profiles': ProfileLibrary().names()}
+
+    def cmd_metrics(self, request, session):
+        interval = max(0.05, number(request.get('interval', 1.0), 'interval', minimum=0))
+        window = float(number(request.get('window', 1.0), 'window', minimum=0))
+        names = request.get('jobs')
+        session.close()
+        session.stream_task = asyncio.get_running_loop().create_task(
+            self._stream_metrics(session, names, interval, window))
+        session.stream_task.add_done_callback(session.stream_done)
+        return {'subscribed': True, 'interval': interval}
+
+    def cmd_unsubscribe(self, request, session):
+        session.close()
+        return {'subscribed': False}
+
+    async def _stream_metrics(self, session, names, interval, window):
+        while True:
+            for name, job in list(self.jobs.items()):
+                if names is not None and name not in names:
+                    continue
+                if job.metrics is None or (job.finished and names is None):
+                    continue
+                snapshot = job.metrics.snapshot(window)
+                snapshot.update({'event': 'metrics', 'job': name, 'running': not job.finished})
+                session.send(snapshot)
+            await session.writer.drain()
+            await asyncio.sleep(interval)
+
+    # ---- 连接与生命周期 --------------------------------------------------
+
+    async def _serve_client(self, reader, writer):
+        session = Session(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    session.send({'ok': False, 'error': '请求过长'})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('请求必须是 JSON 对象')
+                except ValueError as e:
+                    session.send({'ok': False, 'error': f"无效的 JSON: {e}"})
+                    continue
+                response = self.handle(request, session)
+                if 'id' in request:
+                    response['id'] = request['id']
+                session.send(response)
+                # 流水线请求连续处理，写缓冲较大时才让出给对端读取
+                if writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            session.close()
+            writer.close()
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.path)
+        else:
+            raise OSError(f"控制接口已在运行: {self.path}")
+        finally:
+            probe.close()
+
+    async def serve(self, stop_event=None):
+        """运行直到 stop_event 被置位（None 时一直运行）"""
+        self._remove_stale_socket()
+        self.scheduler.start()
+        self.server = await asyncio.start_unix_server(self._serve_client, path=self.path, limit=LINE_LIMIT)
+        os.chmod(self.path, 0o600)
+        log.info("控制接口已启动: %s", self.path)
+        try:
+            if stop_event is None:
+                await self.server.serve_forever()
+            else:
+                await stop_event.wait()
+        finally:
+            self.server.close()
+            await self.server.wait_closed()
+            self.scheduler.close(1.0)
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def send(path, requests, timeout=5.0):
+    """同步客户端：一次性发送全部请求（流水线），按顺序返回对应的回复"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(b''.join(json.dumps(r, ensure_ascii=False).encode('utf-8') + b'\n' for r in requests))
+        stream = sock.makefile('rb')
+        responses = []
+        while len(responses) < len(requests):
+            line = stream.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if 'event' not in message:
+                responses.append(message)
+        return responses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m control_server', description='连点器本地控制接口')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'套接字路径（默认 {DEFAULT_SOCKET}）')
+    parser.add_argument('--dry-run', action='store_true', help='不注入鼠标事件，只按计划计时')
+    parser.add_argument('--send', action='append', metavar='JSON', help='作为客户端发送请求并打印回复（可重复）')
+    args = parser.parse_args(argv)
+    if not hasattr(socket, 'AF_UNIX'):
+        raise SystemExit('当前平台不支持 Unix 域套接字')
+
+    if args.send:
+        for response in send(args.socket, [json.loads(text) for text in args.send]):
+            print(json.dumps(response, ensure_ascii=False))
+        return 0
+
+    server = ControlServer(args.socket, JobScheduler(mouse=NullMouse() if args.dry_run else None))
+
+    async def run():
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop_event.set)
+        await server.serve(stop_event)
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
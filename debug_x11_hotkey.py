@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调试 X11 全局热键后端
+在 Xvfb 中用 XTest 合成按键，验证只有注册的组合键会触发回调：
+    xvfb-run -a python3 debug_x11_hotkey.py
+"""
+
+import sys
+import threading
+import time
+
+from x11_hotkeys import X11_HOTKEY_AVAILABLE, X11HotkeyManager
+
+
+def send_combo(display, mods, key):
+    """用 XTest 发送一次组合键（按下修饰键 -> 主键 -> 逆序释放）"""
+    from Xlib import X, XK
+    from Xlib.ext import xtest
+
+    mod_keysyms = {'Ctrl': 'Control_L', 'Option': 'Alt_L', 'Shift': 'Shift_L', 'Command': 'Super_L'}
+    codes = [display.keysym_to_keycode(XK.string_to_keysym(mod_keysyms[m])) for m in mods]
+    name = key.lower() if len(key) == 1 else key
+    codes.append(display.keysym_to_keycode(XK.string_to_keysym(name)))
+    for code in codes:
+        xtest.fake_input(display, X.KeyPress, code)
+    for code in reversed(codes):
+        xtest.fake_input(display, X.KeyRelease, code)
+    display.sync()
+
+
+def test_x11_hotkeys():
+    """测试注册组合键的触发与未注册按键的过滤"""
+    print("=== X11 热键测试 ===")
+    from Xlib import display as xdisplay
+
+    hits = []
+    fired = threading.Event()
+
+    def on_hotkey(name):
+        hits.append(name)
+        fired.set()
+
+    manager = X11HotkeyManager()
+    manager.set_bindings([
+        (['Ctrl', 'Option'], 'S', lambda: on_hotkey('start')),
+        (['Ctrl', 'Option'], 'D', lambda: on_hotkey('stop')),
+        ([], 'F6', lambda: on_hotkey('f6')),
+    ])
+    if not manager.start_monitoring():
+        print("❌ 无法启动 X11 热键监听")
+        return False
+
+    sender = xdisplay.Display()
+    try:
+        cases = [
+            ((['Ctrl', 'Option'], 'S'), 'start'),
+            ((['Ctrl', 'Option'], 'D'), 'stop'),
+            (([], 'F6'), 'f6'),
+            ((['Ctrl'], 'S'), None),   # 修饰键不完整，不应触发
+            (([], 'A'), None),         # 未注册按键，不应触发
+        ]
+        ok = True
+        for (mods, key), expected in cases:
+            hits.clear()
+            fired.clear()
+            t0 = time.perf_counter()
+            send_combo(sender, mods, key)
+            fired.wait(0.5)
+            latency = (time.perf_counter() - t0) * 1000
+            got = hits[0] if hits else None
+            combo = '+'.join(mods + [key])
+            if got == expected:
+                print(f"✅ {combo}: {got} ({latency:.2f} ms)" if got else f"✅ {combo}: 未触发")
+            else:
+                print(f"❌ {combo}: 期望 {expected}，实际 {got}")
+                ok = False
+
+        # 运行中替换绑定，监听不重启
+        hits.clear()
+        fired.clear()
+        manager.set_bindings([(['Shift'], 'F7', lambda: on_hotkey('swapped'))])
+        time.sleep(0.3)
+        send_combo(sender, ['Shift'], 'F7')
+        fired.wait(0.5)
+        if hits == ['swapped']:
+            print("✅ 运行中替换绑定生效")
+        else:
+            print(f"❌ 运行中替换绑定失败: {hits}")
+            ok = False
+        return ok
+    finally:
+        sender.close()
+        manager.stop_monitoring()
+
+
+def main():
+    print("X11 热键后端调试工具")
+    print("=" * 40)
+
+    if not X11_HOTKEY_AVAILABLE:
+        print("❌ X11 不可用：请安装 python-xlib 并在 X 会话或 xvfb-run 中运行")
+        sys.exit(1)
+
+    if test_x11_hotkeys():
+        print("\n✅ X11 热键测试通过")
+    else:
+        print("\n❌ X11 热键测试失败")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
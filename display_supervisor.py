@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多显示器连点监督进程 - 一台测试机上的每个 Xvfb DISPLAY 运行一个独立的引擎进程
+按会话列表为每个 DISPLAY 启动一个 EngineProcess（可按核绑定 CPU），
+引擎进程异常退出时自动重启并接着完成剩余的次数/时长，
+所有会话的运行指标直接从各自的共享内存读取，汇总成一张表。
+
+    python3 display_supervisor.py sessions.json
+    python3 display_supervisor.py sessions.json --pin --interval 5
+    python3 display_supervisor.py sessions.json --json > metrics.ndjson
+
+会话列表：每项是一个任务描述（字段同 auto_clicker_cli --jobs，但不支持
+action 与 delay）加上 "display"，
+也可以写成 {"defaults": {...}, "sessions": [...]}，defaults 为各会话的默认值：
+    {"defaults": {"rate": 20, "profile": "登录按钮"},
+     "sessions": [{"display": ":1"}, {"display": ":2", "rate": 50}]}
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from engine_process import MAX_POSITIONS, EngineProcess
+from job_scheduler import job_from_spec
+
+# 任务描述中引擎进程无法执行的字段
+UNSUPPORTED_FIELDS = ('action', 'delay')
+
+
+class DisplaySession:
+    """一个 DISPLAY 上的连点会话"""
+
+    def __init__(self, spec, cpus=None, dry_run=False):
+        if not spec.get('display'):
+            raise ValueError(f"会话缺少 display 字段: {spec}")
+        self.display = spec['display']
+        self.job = job_from_spec(spec, default_name=self.display)
+        # 引擎进程的共享控制块只有频率、次数、时长、位置与按键，不支持的字段直接拒绝
+        unsupported = [key for key in UNSUPPORTED_FIELDS if spec.get(key)]
+        if unsupported:
+            raise ValueError(f"会话 {self.display} 不支持字段: {', '.join(unsupported)}"
+                             f"（引擎进程不执行动作，也不支持延迟开始）")
+        if len(self.job.positions) > MAX_POSITIONS:
+            raise ValueError(f"会话 {self.display} 的位置数量 {len(self.job.positions)} "
+                             f"超过引擎进程的上限 {MAX_POSITIONS}")
+        self.cpus = cpus
+        self.dry_run = dry_run
+        self.engine = None
+        self.metrics = None
+        self.started_at = None
+        self.restarts = 0
+        self.clicks_before = 0      # 之前崩溃的引擎进程已完成的点击次数
+        self.stopped_by = None
+
+    @property
+    def clicks(self):
+        return self.clicks_before + (self.metrics.count if self.metrics is not None else 0)
+
+    @property
+    def finished(self):
+        return self.stopped_by is not None
+
+    def launch(self):
+        """启动引擎进程并提交剩余的任务"""
+        job = self.job
+        now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        count = job.count
+        if count > 0:
+            count -= self.clicks_before
+            if count <= 0:
+                self.stopped_by = 'count'
+                return
+        duration = job.duration
+        if duration:
+            duration -= now - self.started_at
+            if duration <= 0:
+                self.stopped_by = 'duration'
+                return
+        self.engine = EngineProcess(dry_run=self.dry_run, env={'DISPLAY': self.display}, cpus=self.cpus)
+        self.metrics = self.engine.submit(
+            rate=job.rate, count=count, duration=duration, positions=job.positions,
+            button=job.button, double=job.double, cycle=job.cycle)
+
+    def _release(self):
+        self.clicks_before = self.clicks
+        self.metrics = None
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    def poll(self, max_restarts):
+        """检查引擎进程；任务完成时记录结果，崩溃时重启。返回事件说明或 None"""
+        engine = self.engine
+        if engine is None or self.finished:
+            return None
+        if not engine.running:
+            self.stopped_by = engine.stats()['stopped_by']
+            self._release()
+            return 'finished'
+        if engine.alive:
+            return None
+        exitcode = engine.process.exitcode
+        self._release()
+        if self.restarts >= max_restarts:
+            self.stopped_by = 'crashed'
+            return f"引擎进程退出（{exitcode}），已达到重启上限"
+        self.restarts += 1
+        self.launch()
+        return f"引擎进程退出（{exitcode}），第 {self.restarts} 次重启"
+
+    def stop(self):
+        if self.engine is not None and not self.finished:
+            self.engine.stop()
+            self.engine.wait(1.0)
+            self.stopped_by = 'stop'
+        self._release()
+
+    def snapshot(self, window=1.0):
+        info = {
+            'display': self.display,
+            'pid': self.engine.process.pid if self.engine is not None else None,
+            'cpus': sorted(self.cpus) if self.cpus else None,
+            'clicks': self.clicks,
+            'target_rate': round(self.job.rate, 3),
+            'rate': 0.0,
+            'missed': 0,
+            'restarts': self.restarts,
+            'state': self.stopped_by or 'running',
+        }
+        if self.metrics is not None:
+            snap = self.metrics.snapshot(window)
+            info['rate'] = round(snap['rate'], 2)
+            info['missed'] = snap['missed']
+            info['latency_p99_ms'] = round(snap['latency_ms']['p99'], 3)
+        return info
+
+
+def load_sessions(path):
+    """读取会话列表，合并 defaults"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults', {})
+        data = data.get('sessions', [])
+    return [dict(defaults, **spec) for spec in data]
+
+
+def assign_cpus(count):
+    """按会话轮流分配可用的 CPU（每个会话一个核）"""
+    if not hasattr(os, 'sched_getaffinity'):
+        return [None] * count
+    cpus = sorted(os.sched_getaffinity(0))
+    return [{cpus[i % len(cpus)]} for i in range(count)]
+
+
+def print_table(snapshots, elapsed):
+    print(f"\n[{elapsed:7.1f}s] {'DISPLAY':8s} {'PID':>7s} {'CPU':>4s} {'点击':>8s} "
+          f"{'实际/目标':>15s} {'错过':>6s} {'重启':>4s}  状态")
+    for s in snapshots:
+        cpu = ','.join(map(str, s['cpus'])) if s['cpus'] else '-'
+        print(f"{'':10s} {s['display']:8s} {s['pid'] or '-':>7} {cpu:>4s} {s['clicks']:8d} "
+              f"{s['rate']:7.1f}/{s['target_rate']:<7g} {s['missed']:6d} {s['restarts']:4d}  {s['state']}")
+    total_rate = sum(s['rate'] for s in snapshots)
+    print(f"{'':10s} 合计 {sum(s['clicks'] for s in snapshots)} 次点击，{total_rate:.1f} 次/秒")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='多 DISPLAY 连点监督进程')
+    parser.add_argument('sessions', help='会话列表文件（JSON）')
+    parser.add_argument('--pin', action='store_true', help='每个会话绑定一个 CPU 核（Linux）')
+    parser.add_argument('--interval', type=float, default=2.0, help='汇总输出间隔（秒）')
+    parser.add_argument('--max-restarts', type=int, default=5, help='每个会话最多重启次数')
+    parser.add_argument('--json', action='store_true', help='以 JSON 行输出汇总而不是表格')
+    parser.add_argument('--dry-run', action='store_true', help='不注入鼠标事件，只按计划计时')
+    args = parser.parse_args(argv)
+
+    specs = load_sessions(args.sessions)
+    cpus = assign_cpus(len(specs)) if args.pin else [None] * len(specs)
+    try:
+        sessions = [DisplaySession(spec, cpu, args.dry_run) for spec, cpu in zip(specs, cpus)]
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    started = time.monotonic()
+    next_report = started + args.interval
+    try:
+        # 某个会话启动失败时，finally 中停止已经启动的会话
+        for session in sessions:
+            try:
+                session.launch()
+            except (OSError, RuntimeError, ValueError) as e:
+                raise SystemExit(f"{session.display}: 启动引擎进程失败: {e}")
+        while not stop_event.wait(0.1):
+            for session in sessions:
+                event = session.poll(args.max_restarts)
+                if event and event != 'finished':
+                    print(f"{session.display}: {event}", file=sys.stderr)
+            done = all(session.finished for session in sessions)
+            now = time.monotonic()
+            if now >= next_report or done:
+                snapshots = [session.snapshot() for session in sessions]
+                if args.json:
+                    print(json.dumps({'elapsed_s': round(now - started, 3), 'sessions': snapshots},
+                                     ensure_ascii=False), flush=True)
+                else:
+                    print_table(snapshots, now - started)
+                next_report = now + args.interval
+            if done:
+                break
+    finally:
+        for session in sessions:
+            session.stop()
+    summary = {
+        'elapsed_s': round(time.monotonic() - started, 3),
+        'clicks': sum(session.clicks for session in sessions),
+        'sessions': [{'display': s.display, 'clicks': s.clicks, 'restarts': s.restarts,
+                      'stopped_by': s.stopped_by} for s in sessions],
+    }
+    print(json.dumps(summary, ensure_ascii=False), flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
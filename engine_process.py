@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+独立进程连点引擎 - 点击循环不再与 Qt 界面、监听线程共享 GIL
+引擎在单独的进程中运行，双方通过一块 multiprocessing.shared_memory
+控制块通信：界面写入参数、递增任务序号（或写入要取消的序号）后拉一下
+“门铃”事件，引擎按序号而不是“最近一条命令”执行，门铃合并也不会丢任务；
+引擎进程直接把点击计数与 ClickMetrics 环形缓冲区写在共享内存里，
+界面读取统计时不需要任何进程间往返。
+
+    engine = EngineProcess()
+    engine.start()                     # 预先启动子进程（首次 submit 时也会自动启动）
+    metrics = engine.submit(rate=50, count=500)
+    metrics.snapshot()                 # 与 ClickMetrics 相同的接口
+    engine.stop(); engine.wait(1.0)
+    engine.close()
+"""
+
+import multiprocessing
+import os
+import threading
+from multiprocessing import shared_memory
+from queue import SimpleQueue
+
+from app_logging import get_logger
+from click_engine import BUTTONS, ClickEngine, NullMouse, number
+from click_metrics import ClickMetrics
+
+log = get_logger('engine_process')
+
+# 控制块整数区（int64）下标
+COMMAND = 0       # CMD_QUIT 时引擎进程退出
+STATE = 1         # 引擎状态
+JOB_SEQ = 2       # 界面每提交一次任务加一
+DONE_SEQ = 3      # 引擎完成（或取消）任务后写入对应的 JOB_SEQ
+CANCEL_SEQ = 13   # 界面停止时写入当前 JOB_SEQ：序号不超过它的任务被取消
+COUNT = 4
+DOUBLE = 5
+CYCLE = 6
+N_POSITIONS = 7
+BUTTON = 8
+CLICKS = 9        # ClickMetrics.count
+MISSED = 10       # ClickMetrics.missed
+STOPPED_BY = 11
+PID = 12
+INT_SLOTS = 16
+
+# 浮点区（double）下标
+RATE = 0
+DURATION = 1      # 0 表示不限时长
+ELAPSED = 2
+FLOAT_SLOTS = 8
+
+CMD_NONE, CMD_QUIT = 0, 1
+STATE_IDLE, STATE_RUNNING, STATE_EXITED = range(3)
+STOP_REASONS = ('count', 'duration', 'stop')
+
+MAX_POSITIONS = 256
+DEFAULT_CAPACITY = 4096
+
+
+class ControlBlock:
+    """共享内存控制块：整数区 + 浮点区 + 位置表 + 指标环形缓冲区"""
+
+    def __init__(self, name=None, capacity=DEFAULT_CAPACITY):
+        sizes = (INT_SLOTS, FLOAT_SLOTS, MAX_POSITIONS * 3, capacity * 3)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=8 * sum(sizes))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            capacity = (self.shm.size // 8 - sum(sizes[:3])) // 3
+        self.capacity = capacity
+        buf = self.shm.buf
+        offset = 0
+        views = []
+        for size, fmt in zip(sizes, 'qdqd'):
+            views.append(buf[offset:offset + 8 * size].cast(fmt))
+            offset += 8 * size
+        self.ints, self.floats, self.positions, self._metrics = views
+        self.metric_views = tuple(self._metrics[k * capacity:(k + 1) * capacity] for k in range(3))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write_job(self, rate, count, duration, positions, button, double, cycle):
+        positions = list(positions or [])
+        if len(positions) > MAX_POSITIONS:
+            raise ValueError(f"位置数量 {len(positions)} 超过引擎进程的上限 {MAX_POSITIONS}")
+        for k, position in enumerate(positions):
+            self.positions[3 * k] = int(position[0])
+            self.positions[3 * k + 1] = int(position[1])
+            code = BUTTONS.index(position[2]) if len(position) > 2 and position[2] in BUTTONS else -1
+            self.positions[3 * k + 2] = code
+        ints = self.ints
+        ints[N_POSITIONS] = len(positions)
+        ints[COUNT] = int(count)
+        ints[BUTTON] = BUTTONS.index(button) if button in BUTTONS else 0
+        ints[DOUBLE] = int(bool(double))
+        ints[CYCLE] = int(bool(cycle))
+        self.floats[RATE] = float(rate)
+        self.floats[DURATION] = float(duration or 0.0)
+
+    def read_job(self):
+        ints = self.ints
+        positions = []
+        for k in range(ints[N_POSITIONS]):
+            code = self.positions[3 * k + 2]
+            position = (self.positions[3 * k], self.positions[3 * k + 1])
+            positions.append(position + (BUTTONS[code],) if code >= 0 else position)
+        return {
+            'rate': self.floats[RATE],
+            'count': ints[COUNT],
+            'duration': self.floats[DURATION] or None,
+            'positions': positions,
+            'button': BUTTONS[ints[BUTTON]],
+            'double': bool(ints[DOUBLE]),
+            'cycle': bool(ints[CYCLE]),
+        }
+
+    def close(self):
+        for view in self.metric_views + (self._metrics, self.ints, self.floats, self.positions):
+            view.release()
+        self.shm.close()
+
+
+class SharedClickMetrics(ClickMetrics):
+    """数据放在控制块中的 ClickMetrics：引擎进程写，界面进程直接读"""
+
+    def __init__(self, block, interval):
+        self.capacity = block.capacity
+        self.interval = interval
+        self.miss_threshold = max(interval / 2, 0.001)
+        self._due, self._started, self._finished = block.metric_views
+        self._ints = block.ints
+
+    @property
+    def count(self):
+        return self._ints[CLICKS]
+
+    @count.setter
+    def count(self, value):
+        self._ints[CLICKS] = value
+
+    @property
+    def missed(self):
+        return self._ints[MISSED]
+
+    @missed.setter
+    def missed(self, value):
+        self._ints[MISSED] = value
+
+
+def _engine_main(name, doorbell, done, dry_run=False, env=None, cpus=None):
+    """引擎进程入口：门铃线程接收命令，主线程执行任务"""
+    # 在导入鼠标后端之前设置环境（例如 DISPLAY），并绑定 CPU
+    if env:
+        os.environ.update(env)
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            log.warning("设置 CPU 亲和性失败: %s", e)
+    block = ControlBlock(name)
+    ints = block.ints
+    ints[PID] = os.getpid()
+    commands = SimpleQueue()
+    current = {'kill_switch': None, 'seq': 0}
+
+    def watch():
+        queued = ints[DONE_SEQ]
+        while True:
+            doorbell.wait()
+            doorbell.clear()
+            # 每次被唤醒都核对全部计数器：多次门铃合并成一次也不会漏掉开始或取消
+            kill_switch = current['kill_switch']
+            if kill_switch is not None and current['seq'] <= ints[CANCEL_SEQ]:
+                kill_switch.set()
+            if ints[COMMAND] == CMD_QUIT:
+                if kill_switch is not None:
+                    kill_switch.set()
+                commands.put(None)
+                return
+            seq = ints[JOB_SEQ]
+            if seq > queued:
+                queued = seq
+                commands.put(seq)
+
+    threading.Thread(target=watch, name='engine-doorbell', daemon=True).start()
+    mouse = NullMouse() if dry_run else None
+    try:
+        while True:
+            job_seq = commands.get()
+            if job_seq is None:
+                break
+            summary = None
+            if job_seq > ints[CANCEL_SEQ]:
+                job = block.read_job()
+                kill_switch = threading.Event()
+                current['seq'] = job_seq
+                current['kill_switch'] = kill_switch
+                # 停止开关登记之前写入的取消，门铃线程可能看不到
+                if job_seq <= ints[CANCEL_SEQ]:
+                    kill_switch.set()
+                interval = 1.0 / job['rate'] if job['rate'] > 0 else 0.0
+                engine = ClickEngine(mouse=mouse, kill_switch=kill_switch,
+                                     metrics=SharedClickMetrics(block, interval), **job)
+                ints[STATE] = STATE_RUNNING
+                try:
+                    summary = engine.run()
+                except Exception as e:
+                    log.error("引擎进程点击错误: %s", e)
+                mouse = engine.mouse
+                current['kill_switch'] = None
+            # 开始之前就被取消的任务也要写 DONE_SEQ，界面才不会一直等待
+            ints[STOPPED_BY] = STOP_REASONS.index(summary['stopped_by'] if summary else 'stop')
+            block.floats[ELAPSED] = summary['elapsed_s'] if summary else 0.0
+            ints[STATE] = STATE_IDLE
+            ints[DONE_SEQ] = job_seq
+            done.set()
+    finally:
+        ints[STATE] = STATE_EXITED
+        block.close()
+
+
+class EngineProcess:
+    """界面侧的引擎进程句柄
+
+    env 为引擎进程额外的环境变量（例如 {'DISPLAY': ':1'}），
+    cpus 为绑定的 CPU 编号集合（仅 Linux）。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, dry_run=False, env=None, cpus=None):
+        self.block = ControlBlock(capacity=capacity)
+        context = multiprocessing.get_context('spawn')
+        self.doorbell = context.Event()
+        self.done = context.Event()
+        self.process = context.Process(target=_engine_main, name='click-engine', daemon=True,
+                                       args=(self.block.name, self.doorbell, self.done, dry_run,
+                                             env, set(cpus) if cpus else None))
+        self.metrics = None
+
+    def start(self):
+        """启动引擎进程（已启动时忽略）"""
+        if self.process.pid is None:
+            self.process.start()
+        return self
+
+    @property
+    def alive(self):
+        return self.process.pid is not None and self.process.is_alive()
+
+    @property
+    def running(self):
+        """当前是否有未完成的任务"""
+        ints = self.block.ints
+        return ints[JOB_SEQ] != ints[DONE_SEQ]
+
+    def submit(self, rate, count=0, duration=None, positions=None,
+               button='left', double=False, cycle=True):
+        """提交一个连点任务，返回可直接读取的 SharedClickMetrics"""
+        rate = float(number(rate, 'rate', minimum=0))
+        count = number(count, 'count', minimum=0, integer=True)
+        if duration is not None:
+            duration = float(number(duration, 'duration', minimum=0))
+        self.start()
+        if not self.process.is_alive():
+            raise RuntimeError('引擎进程已退出')
+        if self.running:
+            raise RuntimeError('引擎进程中的上一个任务尚未结束')
+        block = self.block
+        block.write_job(rate, count, duration, positions, button, double, cycle)
+        self.metrics = SharedClickMetrics(block, 1.0 / rate)
+        self.metrics.count = 0
+        self.metrics.missed = 0
+        self.done.clear()
+        block.ints[JOB_SEQ] += 1
+        self.doorbell.set()
+        return self.metrics
+
+    def stop(self):
+        """停止当前任务（不等待）；任务尚未开始时直接取消"""
+        ints = self.block.ints
+        ints[CANCEL_SEQ] = ints[JOB_SEQ]
+        self.doorbell.set()
+
+    def wait(self, timeout=None):
+        """等待当前任务结束，超时返回 False"""
+        if not self.running:
+            return True
+        return self.done.wait(timeout) and not self.running
+
+    def stats(self):
+        """直接从共享内存读取的运行状态"""
+        ints = self.block.ints
+        return {
+            'pid': ints[PID] or None,
+            'running': self.running,
+            'clicks': ints[CLICKS],
+            'missed': ints[MISSED],
+            'stopped_by': None if self.running else STOP_REASONS[ints[STOPPED_BY]],
+            'elapsed_s': None if self.running else self.block.floats[ELAPSED],
+        }
+
+    def close(self, timeout=2.0):
+        """结束引擎进程并释放共享内存"""
+        if self.alive:
+            self.block.ints[COMMAND] = CMD_QUIT
+            self.doorbell.set()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        self.metrics = None
+        self.block.close()
+        try:
+            self.block.shm.unlink()
+        except FileNotFoundError:
+            pass
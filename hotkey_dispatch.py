@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热键分发表 - 将热键绑定预编译为 {(键码, 修饰键掩码): 回调} 字典
+系统每产生一次按键事件只需做一次字典查找，与绑定数量无关
+支持命名方案（profile），切换方案时整表原子替换，监听线程无需重启
+按键按下/松开经 press()/release() 分发时过滤自动重复并按绑定去抖
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+
+import tracing
+from app_logging import get_logger
+
+log = get_logger('hotkey_dispatch')
+
+# macOS 修饰键标志位（与 Quartz 的 kCGEventFlagMask* 取值一致）
+MAC_MOD_FLAGS = {
+    'Ctrl': 0x40000,      # kCGEventFlagMaskControl
+    'Option': 0x80000,    # kCGEventFlagMaskAlternate
+    'Shift': 0x20000,     # kCGEventFlagMaskShift
+    'Command': 0x100000,  # kCGEventFlagMaskCommand
+}
+
+# macOS 硬件键码（ANSI 美式布局）
+MAC_KEYCODES = {
+    'A': 0, 'S': 1, 'D': 2, 'F': 3, 'H': 4, 'G': 5, 'Z': 6, 'X': 7,
+    'C': 8, 'V': 9, 'B': 11, 'Q': 12, 'W': 13, 'E': 14, 'R': 15,
+    'Y': 16, 'T': 17, '1': 18, '2': 19, '3': 20, '4': 21, '6': 22,
+    '5': 23, '9': 25, '7': 26, '8': 28, '0': 29, 'O': 31, 'U': 32,
+    'I': 34, 'P': 35, 'L': 37, 'J': 38, 'K': 40, 'N': 45, 'M': 46,
+    'F1': 122, 'F2': 120, 'F3': 99, 'F4': 118, 'F5': 96, 'F6': 97,
+    'F7': 98, 'F8': 100, 'F9': 101, 'F10': 109, 'F11': 103, 'F12': 111,
+}
+
+
+def native_hotkey_available():
+    """是否可以使用 macOS 原生热键（只查找 pyobjc 模块，不导入）"""
+    if sys.platform != 'darwin':
+        return False
+    try:
+        return (importlib.util.find_spec('Quartz') is not None
+                and importlib.util.find_spec('AppKit') is not None)
+    except (ImportError, ValueError):
+        return False
+
+
+def load_quartz():
+    """导入 Quartz 模块（较慢，只在开始监听热键时调用），失败时返回 None"""
+    try:
+        import Quartz  # type: ignore
+        return Quartz
+    except Exception as e:
+        log.error("加载 Quartz 失败: %s", e)
+        return None
+
+
+def mods_from_flags(cfg):
+    """将 {'ctrl': True, 'option': False, ...} 形式的配置转换为修饰键名称列表"""
+    names = (('ctrl', 'Ctrl'), ('option', 'Option'), ('shift', 'Shift'), ('command', 'Command'))
+    return [name for field, name in names if cfg.get(field)]
+
+
+def flags_from_mods(mods, key):
+    """将修饰键名称列表与主键转换为 {'ctrl': ..., 'key': ...} 形式的配置"""
+    return {
+        'ctrl': 'Ctrl' in mods, 'option': 'Option' in mods,
+        'shift': 'Shift' in mods, 'command': 'Command' in mods,
+        'key': key
+    }
+
+
+class HotkeyDispatchTable:
+    """预编译的热键分发表
+
+    绑定以 (修饰键列表, 主键, 回调) 的形式给出，编译后按
+    (键码, 修饰键掩码) 建立字典。事件回调中只需调用 dispatch()，
+    无需再逐条比较配置。修饰键要求精确匹配（未参与绑定的修饰键
+    位，例如 Fn、数字键盘标志，不影响匹配）。
+
+    生效的表 = 基础绑定 + 当前方案的绑定（方案内的同名组合键优先）。
+    任何修改都先构建新字典，再用一次属性赋值替换 self.table，
+    监听线程读到的永远是完整的旧表或新表。
+
+    press()/release() 在 dispatch() 之上增加两层过滤：
+    - 自动重复：键仍处于按下状态时的重复按下事件直接丢弃，
+      每次物理按键只分发一次；
+    - 去抖：同一绑定在 debounce 秒内只触发一次。
+    """
+
+    def __init__(self, mod_flags=None, keycodes=None, debounce=0.3):
+        self.mod_flags = dict(mod_flags if mod_flags is not None else MAC_MOD_FLAGS)
+        self.keycodes = dict(keycodes if keycodes is not None else MAC_KEYCODES)
+        self.mod_mask = 0
+        for flag in self.mod_flags.values():
+            self.mod_mask |= int(flag)
+        self.debounce = debounce
+        self.table = {}
+        self.active_profile = None
+        self._down = set()
+        self._last_fired = {}
+        self._base_table = {}
+        self._profile_tables = {}
+        self._lock = threading.Lock()
+
+    def mods_to_mask(self, mods):
+        """修饰键名称列表 -> 标志位掩码"""
+        mask = 0
+        for m in mods:
+            mask |= int(self.mod_flags.get(m, 0))
+        return mask
+
+    def resolve_key(self, key):
+        """主键名称（或直接给出的整数键码）-> 键码，无法识别时返回 None"""
+        if isinstance(key, int):
+            return key
+        return self.keycodes.get(str(key).upper())
+
+    def build(self, bindings):
+        """编译绑定列表，返回新的分发字典（不修改当前表）"""
+        table = {}
+        for mods, key, action in bindings:
+            keycode = self.resolve_key(key)
+            if keycode is None:
+                continue
+            table[(int(keycode), self.mods_to_mask(mods))] = action
+        return table
+
+    def compile(self, bindings):
+        """编译并启用基础绑定列表；整表一次性替换，监听线程无需加锁"""
+        base = self.build(bindings)
+        with self._lock:
+            self._base_table = base
+            self._swap()
+        return self.table
+
+    def set_profiles(self, profiles, active=None):
+        """设置命名方案 {名称: 绑定列表}，并激活其中一个（默认保持当前方案）"""
+        tables = {name: self.build(bindings) for name, bindings in profiles.items()}
+        with self._lock:
+            self._profile_tables = tables
+            if active is not None:
+                self.active_profile = active
+            if self.active_profile not in tables:
+                self.active_profile = None
+            self._swap()
+
+    def activate_profile(self, name):
+        """切换到指定方案（可在监听线程中直接调用），方案不存在时返回 False"""
+        with self._lock:
+            if name is not None and name not in self._profile_tables:
+                return False
+            self.active_profile = name
+            self._swap()
+        return True
+
+    @property
+    def profile_names(self):
+        return list(self._profile_tables)
+
+    def _swap(self):
+        table = dict(self._base_table)
+        if self.active_profile is not None:
+            table.update(self._profile_tables[self.active_profile])
+        self.table = table
+
+    def lookup(self, keycode, flags):
+        """查找按键事件对应的回调，未绑定时返回 None"""
+        return self.table.get((int(keycode), int(flags) & self.mod_mask))
+
+    def dispatch(self, keycode, flags):
+        """分发按键事件，命中绑定时执行回调并返回 True"""
+        action = self.table.get((int(keycode), int(flags) & self.mod_mask))
+        if action is None:
+            return False
+        with tracing.span('hotkey.dispatch', keycode):
+            action()
+        return True
+
+    def press(self, keycode, flags, autorepeat=False):
+        """按键按下：过滤自动重复与抖动后分发，命中并执行时返回 True"""
+        keycode = int(keycode)
+        if autorepeat or keycode in self._down:
+            return False
+        self._down.add(keycode)
+        key = (keycode, int(flags) & self.mod_mask)
+        action = self.table.get(key)
+        if action is None:
+            return False
+        now = time.monotonic()
+        if now - self._last_fired.get(key, -self.debounce) < self.debounce:
+            return False
+        self._last_fired[key] = now
+        with tracing.span('hotkey.press', keycode):
+            action()
+        return True
+
+    def release(self, keycode):
+        """按键松开：之后的按下事件才会被视为新的物理按键"""
+        self._down.discard(int(keycode))
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连点任务调度器 - 在一个计时线程上同时运行多个独立的连点任务
+每个任务有自己的按键、位置、频率与次数；调度线程维护一个按下一次
+截止时间排序的最小堆，每次只等待堆顶任务，到期后点击并把它按
+开始时间 + i × 间隔 重新入堆。几十个并行节奏也只占用一个线程，
+任务之间没有锁竞争；新增与取消任务经无锁队列交给调度线程处理。
+
+    scheduler = JobScheduler()
+    scheduler.start()
+    scheduler.submit(ClickJob(rate=5, positions=[(100, 100)], name='A'))
+    scheduler.submit(ClickJob(rate=20, button='right', count=100, name='B'))
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from array import array
+from queue import SimpleQueue, Empty
+
+import tracing
+from app_logging import get_logger
+from click_engine import (BUTTONS, STEP_CLICK, STEP_MOVE, STEP_PRESS, ClickEngine, PynputMouse,
+                          action_from_spec, number, timing_summary)
+
+log = get_logger('job_scheduler')
+
+# reconfigure() 可以修改的任务参数
+RECONFIGURABLE = frozenset(('rate', 'positions', 'button', 'double', 'cycle', 'action'))
+
+
+class ClickJob(ClickEngine):
+    """调度器中的一个连点任务
+
+    参数与 ClickEngine 相同（也可以用 ClickJob.from_recording 构造），
+    另外有 name 与 on_finished(任务, 统计) 回调；delay 为提交后延迟开始的秒数。
+    由调度器执行时不使用 ClickEngine.run()，但单独运行时仍然可以调用。
+    """
+
+    def __init__(self, *args, name=None, delay=0.0, on_finished=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = name
+        self.delay = delay
+        self.on_finished = on_finished
+        self.summary = None
+        # 以下为调度状态，只在调度线程中访问
+        self.start_time = None
+        self.end_time = None
+        self.index = 0
+        self.last_due = None
+        self.limit = None
+        self.generation = 0      # 重新配置后加一，堆中旧的条目随之失效
+        # 正在执行的动作（action）：步骤、下一步序号、开始时刻、按键与已按下的按键
+        self.current_action = None
+        self.step = 0
+        self.action_base = None
+        self.action_button = None
+        self.pressed = []
+
+    @property
+    def finished(self):
+        return self.summary is not None
+
+    def _due(self, i):
+        if self.offsets is not None:
+            return self.start_time + self.offsets[i]
+        return self.start_time + i * self.interval
+
+
+def profile_positions(name):
+    """位置方案库中的方案 -> (位置列表, 是否循环)，找不到时抛出 ValueError
+
+    方案中的 (x, y, 名称) 只是带标签的坐标：名称恰为按键名时按该按键点击
+    （与引擎对位置第三项的处理一致），否则只保留 (x, y)。
+    """
+    from profile_library import ProfileLibrary
+    profile = ProfileLibrary().load(name)
+    if profile is None:
+        raise ValueError(f"找不到位置方案: {name}")
+    positions = [(x, y, label) if label in BUTTONS else (x, y) for x, y, label in profile['positions']]
+    return positions, profile['cycle_mode']
+
+
+def flag(value, field):
+    """检查任务参数为布尔值，无效时抛出 ValueError"""
+    if not isinstance(value, bool):
+        raise ValueError(f"{field} 必须是 true 或 false: {value!r}")
+    return value
+
+
+def parse_positions(value):
+    """位置列表 [[x, y], [x, y, 按键], ...] -> [(x, y[, 按键]), ...]，格式无效时抛出 ValueError"""
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"positions 必须是列表: {value!r}")
+    positions = []
+    for i, p in enumerate(value, 1):
+        if not isinstance(p, (list, tuple)) or len(p) not in (2, 3):
+            raise ValueError(f"第 {i} 个位置必须是 [x, y] 或 [x, y, 按键]: {p!r}")
+        x, y = (number(v, f"第 {i} 个位置的坐标", integer=True) for v in p[:2])
+        if len(p) == 3:
+            if p[2] not in BUTTONS:
+                raise ValueError(f"第 {i} 个位置的按键无效: {p[2]!r}")
+            positions.append((x, y, p[2]))
+        else:
+            positions.append((x, y))
+    return positions
+
+
+def job_from_spec(spec, defaults=None, default_name='job'):
+    """由任务描述（JSON 对象）构造 ClickJob，参数无效时抛出 ValueError
+
+    可用字段：name、rate、count、duration、positions、profile、button、
+    double、cycle、delay、action（见 click_engine.action_from_spec）；
+    未给出的 rate / count / button / double 取 defaults（统一配置的 click 节）。
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"任务描述必须是 JSON 对象: {spec!r}")
+    if defaults is None:
+        from config_store import load_settings
+        defaults = load_settings().section('click')
+    name = spec.get('name') or default_name
+    try:
+        positions = parse_positions(spec.get('positions'))
+        cycle = flag(spec.get('cycle', True), 'cycle')
+        if spec.get('profile'):
+            positions, profile_cycle = profile_positions(spec['profile'])
+            cycle = cycle and profile_cycle
+        rate = float(number(spec.get('rate', defaults['frequency']), 'rate', minimum=0))
+        count = number(spec.get('count', defaults['max_clicks']), 'count', minimum=0, integer=True)
+        duration = spec.get('duration')
+        if duration is not None:
+            duration = float(number(duration, 'duration', minimum=0))
+        delay = number(spec.get('delay', 0.0), 'delay')
+        if delay < 0:
+            raise ValueError(f"delay 不能小于 0: {delay}")
+        button = spec.get('button', defaults['button'])
+        if button not in BUTTONS:
+            raise ValueError(f"按键无效: {button}")
+        double = flag(spec.get('double', defaults['click_type'] == 'double'), 'double')
+        action = action_from_spec(spec['action']) if spec.get('action') else None
+    except ValueError as e:
+        raise ValueError(f"任务 {name} 的参数无效: {e}")
+    return ClickJob(name=name, rate=rate, count=count, duration=duration, positions=positions,
+                    button=button, double=double, cycle=cycle, delay=float(delay), action=action)
+
+
+class JobScheduler:
+    """单线程多任务调度器
+
+    start() 在后台线程中持续运行，随时可以 submit() 新任务；
+    也可以在当前线程中调用 run()，所有任务结束后返回。
+    所有任务共用同一个鼠标后端（只在调度线程中调用，无需加锁）。
+    """
+
+    def __init__(self, mouse=None):
+        self.mouse = mouse
+        self.thread = None
+        self.jobs = []           # 已提交的任务（按提交顺序）；后台运行时结束的任务会被移除
+        self._keep_finished = True
+        self._heap = []          # [(截止时间, 序号, 任务, 代数)]，只在调度线程中访问
+        self._seq = itertools.count()
+        self._incoming = SimpleQueue()
+        self._cancelled = SimpleQueue()
+        self._updates = SimpleQueue()
+        self._wake = threading.Event()
+        self._closed = False
+
+    def submit(self, job):
+        """提交任务（可在任意线程调用），返回该任务"""
+        self.jobs.append(job)
+        self._incoming.put(job)
+        self._wake.set()
+        return job
+
+    def cancel(self, job):
+        """停止任务：调度线程被唤醒后立即结束它"""
+        job.stop()
+        self._cancelled.put(job)
+        self._wake.set()
+
+    def reconfigure(self, job, **changes):
+        """修改运行中任务的 rate / positions / button / double / cycle / action（可在任意线程调用）
+
+        新频率从上一次点击起算，之后仍按截止时间调度，不会补点或漏点。
+        参数在调用方线程中检查，无效时抛出 ValueError，不会交给调度线程。
+        """
+        unknown = set(changes) - RECONFIGURABLE
+        if unknown:
+            raise ValueError(f"不能修改的任务参数: {', '.join(sorted(unknown))}")
+        changes = dict(changes)
+        if 'positions' in changes:
+            changes['positions'] = parse_positions(changes['positions'])
+        if 'rate' in changes:
+            changes['rate'] = float(number(changes['rate'], 'rate', minimum=0))
+        if 'button' in changes and changes['button'] not in BUTTONS:
+            raise ValueError(f"按键无效: {changes['button']}")
+        for name in ('double', 'cycle'):
+            if name in changes:
+                flag(changes[name], name)
+        if 'action' in changes:
+            changes['action'] = action_from_spec(changes['action']) if changes['action'] else None
+        self._updates.put((job, changes))
+        self._wake.set()
+
+    def start(self):
+        """在后台线程中运行，直到 close()"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, kwargs={'until_idle': False},
+                                           name='job-scheduler', daemon=True)
+            self.thread.start()
+        return self
+
+    def close(self, timeout=None):
+        """停止调度线程，未完成的任务以 stopped_by='stop' 结束"""
+        self._closed = True
+        self._wake.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    # 兼容工作线程的接口（基准测试中与其他工作线程一起测量）
+    stop = close
+
+    def _drain_incoming(self, now):
+        """处理新提交与取消的任务（调度线程）"""
+        while True:
+            try:
+                job = self._incoming.get_nowait()
+            except Empty:
+                break
+            job.timestamps = array('d')
+            job.index = 0
+            try:
+                job.start_time = now + (job.delay or 0.0)
+                job.end_time = job.start_time + job.duration if job.duration else None
+                job.limit = job._limit()
+                self._schedule(job)
+            except Exception as e:
+                self._fail(job, e)
+        # 取消的任务立即结束，留在堆中的条目出堆时跳过
+        while True:
+            try:
+                job = self._cancelled.get_nowait()
+            except Empty:
+                return
+            if job.start_time is not None and not job.finished:
+                self._finish(job, 'stop')
+
+    def _drain_updates(self, now):
+        """应用重新配置（调度线程）"""
+        while True:
+            try:
+                job, changes = self._updates.get_nowait()
+            except Empty:
+                return
+            if job.finished:
+                continue
+            try:
+                self._apply_update(job, changes, now)
+            except Exception as e:
+                self._fail(job, e)
+
+    def _apply_update(self, job, changes, now):
+        """应用一项重新配置（调度线程）"""
+        if 'positions' in changes:
+            job.positions = list(changes['positions'])
+        for name in ('button', 'double', 'cycle', 'action'):
+            if name in changes:
+                setattr(job, name, changes[name])
+        rate = changes.get('rate')
+        if rate is not None and job.offsets is None:
+            job.rate = rate
+            job.interval = 1.0 / job.rate
+            if job.metrics is not None:
+                job.metrics.interval = job.interval
+            if job.index > 0:
+                # 重新锚定时间轴：下一次点击在上一次计划时间之后一个新间隔
+                next_due = max(now, job.last_due + job.interval)
+                job.start_time = next_due - job.index * job.interval
+        # 动作执行到一半时不打断，动作结束后按新参数安排下一次
+        if job.start_time is not None and not job.step:
+            job.limit = job._limit()
+            job.generation += 1
+            self._schedule(job)
+
+    def _schedule(self, job):
+        """计算任务的下一次截止时间并入堆，任务已完成时结束它"""
+        i = job.index
+        if job.limit is not None and i >= job.limit:
+            self._finish(job, 'count')
+            return
+        due = job._due(i)
+        if job.end_time is not None and due > job.end_time:
+            self._finish(job, 'duration')
+            return
+        heapq.heappush(self._heap, (due, next(self._seq), job, job.generation))
+
+    def _fail(self, job, error):
+        """任务出错：只结束这一个任务，调度线程继续运行其他任务"""
+        log.error("任务 %s 出错: %s: %s", job.name, type(error).__name__, error)
+        self._finish(job, 'error', f"{type(error).__name__}: {error}")
+
+    def _finish(self, job, stopped_by, error=None):
+        # 动作中途结束时松开仍按住的按键
+        for button in reversed(job.pressed):
+            try:
+                self.mouse.release(button)
+            except Exception as e:
+                log.error("松开按键失败: %s", e)
+        job.pressed = []
+        job.step = 0
+        interval = job.interval if job.interval > 0 else None
+        summary = timing_summary(job.timestamps, interval, job.offsets)
+        summary.update({
+            'name': job.name,
+            'target_rate': round(job.rate, 3),
+            'stopped_by': stopped_by,
+        })
+        if error is not None:
+            summary['error'] = error
+        job.summary = summary
+        # 后台长期运行时不保留已结束的任务（每个任务的指标缓冲区约 100 KB）
+        if not self._keep_finished:
+            try:
+                self.jobs.remove(job)
+            except ValueError:
+                pass
+        if job.on_finished:
+            try:
+                job.on_finished(job, summary)
+            except Exception as e:
+                log.error("任务结束回调错误: %s", e)
+
+    def _click(self, job, due, mouse):
+        i = job.index
+        positions = job.positions
+        position = positions[i % len(positions)] if positions else None
+        if position is not None:
+            mouse.move(position[0], position[1])
+        button = position[2] if position is not None and len(position) > 2 and position[2] in BUTTONS else job.button
+        started = time.perf_counter()
+        trace_start = tracing.now() if tracing.enabled else 0
+        if job.action is None:
+            mouse.click(button, 2 if job.double else 1)
+        else:
+            job.current_action = job.action
+            job.action_base = max(due, started)
+            job.action_button = button
+            self._step(job, mouse)
+        finished = time.perf_counter()
+        if trace_start:
+            tracing.complete('scheduler.click', trace_start, tracing.now(), i)
+        job.timestamps.append(finished)
+        job.last_due = due
+        if job.metrics is not None:
+            job.metrics.record(due, started, finished)
+        if job.on_click:
+            job.on_click(i, position)
+        job.index = i + 1
+
+    def _step(self, job, mouse):
+        """执行动作的下一步；还有后续步骤时按其时刻入堆（动作不阻塞其他任务）"""
+        action = job.current_action
+        _, op, a, b = action[job.step]
+        button = a or job.action_button
+        if op == STEP_MOVE:
+            mouse.move(a, b)
+        elif op == STEP_CLICK:
+            mouse.click(button, b)
+        elif op == STEP_PRESS:
+            mouse.press(button)
+            job.pressed.append(button)
+        else:
+            mouse.release(button)
+            if button in job.pressed:
+                job.pressed.remove(button)
+        job.step += 1
+        # 同一时刻的后续步骤直接执行
+        if job.step < len(action) and action[job.step][0] == action[job.step - 1][0]:
+            return self._step(job, mouse)
+        if job.step < len(action):
+            heapq.heappush(self._heap, (job.action_base + action[job.step][0], next(self._seq),
+                                        job, job.generation))
+            return True
+        job.step = 0
+        return False
+
+    def run(self, until_idle=True):
+        """在当前线程中调度；until_idle 时所有任务结束后返回"""
+        mouse = self.mouse if self.mouse is not None else PynputMouse()
+        self.mouse = mouse
+        self._keep_finished = until_idle
+        heap = self._heap
+        wake = self._wake
+        while not self._closed:
+            wake.clear()
+            now = time.perf_counter()
+            self._drain_incoming(now)
+            self._drain_updates(now)
+            if not heap:
+                if until_idle:
+                    break
+                wake.wait()
+                continue
+            due, _, job, generation = heap[0]
+            if job.finished or generation != job.generation:
+                heapq.heappop(heap)
+                continue
+            if job.kill_switch.is_set():
+                heapq.heappop(heap)
+                self._finish(job, 'stop')
+                continue
+            delay = due - time.perf_counter()
+            if delay > 0:
+                # 新任务、取消、重新配置或关闭都会提前唤醒
+                wake.wait(delay)
+                continue
+            heapq.heappop(heap)
+            try:
+                if job.step:
+                    # 动作的后续步骤，最后一步完成后再安排下一次点击
+                    if not self._step(job, mouse):
+                        self._schedule(job)
+                    continue
+                self._click(job, due, mouse)
+                if not job.step:
+                    self._schedule(job)
+            except Exception as e:
+                self._fail(job, e)
+
+        # 关闭时结束仍在队列中的任务
+        self._drain_incoming(time.perf_counter())
+        while heap:
+            job = heapq.heappop(heap)[2]
+            if not job.finished:
+                self._finish(job, 'stop')
+        return [job.summary for job in self.jobs]
@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+连点宏 - 一种小型宏语言，编译成扁平的指令数组后由连点引擎解释执行
+宏文本只在加载时解析一次，编译结果是一个 array('q')：操作码后面紧跟
+固定个数的整型操作数，跳转目标、循环计数寄存器都在编译期确定。
+解释循环只做数组下标读取和整数比较，不解析文本、不分配字典，
+长时间运行的宏每一步的开销与普通连点相当。
+
+语法（每行一条指令，# 开头的行与 // 之后的内容为注释）：
+
+    move 100 200                  移动光标
+    click [left|right|middle] [次数]
+    hold [按键] 150ms             按下并保持指定时间后松开
+    drag 100 200 400 200 [按键] [300ms]  按住从一点拖动到另一点
+    chord left+right [50ms]       同时按下多个按键，保持后松开
+    wait 500ms                    等待（也可以写 1.5s、200us，纯数字为毫秒）
+    loop 10 ... end               重复 10 次；不写次数为无限循环
+    repeat until pixel 100 200 #ff0000 [tolerance 8] [timeout 5s] ... end
+                                  重复执行，直到 (100, 200) 处像素为指定颜色
+    def 名称 ... end              定义子程序
+    call 名称                     调用子程序
+
+所有等待都累加在同一条截止时间线上（与 ClickEngine 相同），不会逐步漂移。
+"""
+
+import sys
+import time
+from array import array
+
+import click_engine
+
+BUTTON_NAMES = {'left': 0, 'right': 1, 'middle': 2, '左键': 0, '右键': 1, '中键': 2}
+BUTTONS = ('left', 'right', 'middle')
+
+# 操作码 -> 操作数个数
+OP_HALT = 0          #
+OP_MOVE = 1          # x y
+OP_CLICK = 2         # 按键 次数
+OP_PRESS = 3         # 按键
+OP_RELEASE = 4       # 按键
+OP_WAIT = 5          # 微秒
+OP_LOOP = 6          # 寄存器 次数（0 为无限，即源码中不写次数）
+OP_ENDLOOP = 7       # 寄存器 循环体起点
+OP_JUMP = 8          # 目标
+OP_DEADLINE = 9      # 寄存器 超时微秒
+OP_UNTIL_PIXEL = 10  # x y 颜色 容差 截止寄存器 结束位置
+OP_CALL = 11         # 目标
+OP_RET = 12          #
+OPERANDS = (0, 2, 2, 1, 1, 1, 2, 2, 1, 2, 6, 1, 0)
+OP_NAMES = ('halt', 'move', 'click', 'press', 'release', 'wait', 'loop', 'endloop',
+            'jump', 'deadline', 'until_pixel', 'call', 'ret')
+
+
+class MacroError(ValueError):
+    """宏语法或语义错误（带行号）"""
+
+    def __init__(self, message, line=None):
+        super().__init__(f"第 {line} 行: {message}" if line else message)
+        self.line = line
+
+
+def parse_duration_us(text, line=None):
+    """'500ms' / '1.5s' / '200us' / '250'（毫秒）-> 微秒"""
+    text = text.lower()
+    for suffix, scale in (('ms', 1e3), ('us', 1.0), ('s', 1e6)):
+        if text.endswith(suffix):
+            number, factor = text[:-len(suffix)], scale
+            break
+    else:
+        number, factor = text, 1e3
+    try:
+        value = float(number)
+    except ValueError:
+        raise MacroError(f"无效的时间: {text}", line)
+    if value < 0:
+        raise MacroError(f"时间不能为负: {text}", line)
+    return int(round(value * factor))
+
+
+def parse_color(text, line=None):
+    """'#ff0000' / 'ff0000' / '0xff0000' -> 0xRRGGBB"""
+    value = text.lower().lstrip('#')
+    if value.startswith('0x'):
+        value = value[2:]
+    try:
+        if len(value) != 6:
+            raise ValueError
+        return int(value, 16)
+    except ValueError:
+        raise MacroError(f"无效的颜色: {text}", line)
+
+
+def _int(text, line, what='数字'):
+    try:
+        return int(text)
+    except ValueError:
+        raise MacroError(f"无效的{what}: {text}", line)
+
+
+class MacroProgram:
+    """编译后的宏：扁平指令数组 + 寄存器/调用栈大小"""
+
+    def __init__(self, code, registers, call_depth, lines, uses_pixel):
+        self.code = code              # array('q')
+        self.registers = registers    # 循环计数与截止时间寄存器个数
+        self.call_depth = call_depth  # 最大调用深度
+        self.lines = lines            # array('i')：指令位置 -> 源码行号
+        self.uses_pixel = uses_pixel
+
+    def __len__(self):
+        return len(self.code)
+
+    def disassemble(self):
+        """可读的指令列表（调试用）"""
+        out = []
+        pc = 0
+        code = self.code
+        while pc < len(code):
+            op = code[pc]
+            n = OPERANDS[op]
+            args = ' '.join(str(v) for v in code[pc + 1:pc + 1 + n])
+            out.append(f"{pc:5d}  {OP_NAMES[op]:12s} {args}")
+            pc += 1 + n
+        return '\n'.join(out)
+
+
+class _Compiler:
+    def __init__(self):
+        self.code = array('q')
+        self.lines = array('i')
+        self.registers = 0
+        self.uses_pixel = False
+
+    def emit(self, line, op, *operands):
+        pc = len(self.code)
+        self.code.append(op)
+        self.code.extend(operands)
+        self.lines.extend([line] * (1 + len(operands)))
+        return pc
+
+    def register(self):
+        self.registers += 1
+        return self.registers - 1
+
+    def compile(self, text):
+        statements = []
+        for number, raw in enumerate(text.splitlines(), 1):
+            line = raw.split('//', 1)[0].strip()
+            if not line or line.startswith('#'):
+                continue
+            statements.append((number, line.split()))
+
+        # 先把子程序与主程序分开，子程序在主程序的 halt 之后编排
+        main, subroutines = [], {}
+        current, depth, def_line = main, 0, None
+        for number, tokens in statements:
+            word = tokens[0].lower()
+            if word == 'def':
+                if current is not main:
+                    raise MacroError('子程序不能嵌套定义', number)
+                if len(tokens) != 2:
+                    raise MacroError('用法: def 名称', number)
+                if tokens[1] in subroutines:
+                    raise MacroError(f"子程序重复定义: {tokens[1]}", number)
+                current, depth, def_line = [], 0, number
+                subroutines[tokens[1]] = current
+                continue
+            if word in ('loop', 'repeat'):
+                depth += 1
+            elif word == 'end':
+                if depth == 0:
+                    if current is main:
+                        raise MacroError('多余的 end', number)
+                    current = main
+                    continue
+                depth -= 1
+            current.append((number, tokens))
+        if current is not main:
+            raise MacroError('子程序缺少 end', def_line)
+
+        calls = {}       # 子程序名 -> 调用处的操作数位置
+        graph = {}       # 子程序名 -> 调用的子程序名（用于检查递归）
+        self._block(main, calls, graph.setdefault(None, set()))
+        self.emit(statements[-1][0] if statements else 0, OP_HALT)
+        entries = {}
+        for name, body in subroutines.items():
+            entries[name] = len(self.code)
+            self._block(body, calls, graph.setdefault(name, set()))
+            self.emit(body[-1][0] if body else def_line or 0, OP_RET)
+
+        for name, sites in calls.items():
+            if name not in entries:
+                raise MacroError(f"未定义的子程序: {name}", self.lines[sites[0]])
+            for site in sites:
+                self.code[site] = entries[name]
+        call_depth = _call_depth(graph)
+        return MacroProgram(self.code, self.registers, call_depth, self.lines, self.uses_pixel)
+
+    def _block(self, statements, calls, callees):
+        """编译一段语句（处理 loop / repeat 的嵌套）"""
+        i = 0
+        while i < len(statements):
+            number, tokens = statements[i]
+            word = tokens[0].lower()
+            if word in ('loop', 'repeat'):
+                # 找到配对的 end
+                depth, j = 1, i + 1
+                while j < len(statements):
+                    w = statements[j][1][0].lower()
+                    if w in ('loop', 'repeat'):
+                        depth += 1
+                    elif w == 'end':
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    j += 1
+                if j >= len(statements):
+                    raise MacroError(f"{word} 缺少 end", number)
+                body = statements[i + 1:j]
+                if word == 'loop':
+                    self._loop(number, tokens, body, calls, callees)
+                else:
+                    self._repeat(number, tokens, body, calls, callees)
+                i = j + 1
+                continue
+            if word == 'end':
+                raise MacroError('多余的 end', number)
+            self._simple(number, tokens, calls, callees)
+            i += 1
+
+    def _loop(self, number, tokens, body, calls, callees):
+        if len(tokens) > 2:
+            raise MacroError('用法: loop [次数]', number)
+        count = _int(tokens[1], number, '循环次数') if len(tokens) == 2 else 0
+        if len(tokens) == 2 and count <= 0:
+            raise MacroError('循环次数必须大于 0（不写次数为无限循环）', number)
+        reg = self.register()
+        self.emit(number, OP_LOOP, reg, count)
+        start = len(self.code)
+        self._block(body, calls, callees)
+        self.emit(number, OP_ENDLOOP, reg, start)
+
+    def _repeat(self, number, tokens, body, calls, callees):
+        words = [t.lower() for t in tokens]
+        if words[:3] != ['repeat', 'until', 'pixel'] or len(tokens) < 6:
+            raise MacroError('用法: repeat until pixel X Y #RRGGBB [tolerance N] [timeout T]', number)
+        x, y = _int(tokens[3], number, '坐标'), _int(tokens[4], number, '坐标')
+        color = parse_color(tokens[5], number)
+        tolerance, timeout = 0, None
+        rest = words[6:]
+        while rest:
+            if len(rest) < 2:
+                raise MacroError(f"{rest[0]} 缺少取值", number)
+            key, value = rest[0], rest[1]
+            if key == 'tolerance':
+                tolerance = _int(value, number, '容差')
+            elif key == 'timeout':
+                timeout = parse_duration_us(value, number)
+            else:
+                raise MacroError(f"未知的选项: {key}", number)
+            rest = rest[2:]
+        self.uses_pixel = True
+        reg = self.register()
+        self.emit(number, OP_DEADLINE, reg, -1 if timeout is None else timeout)
+        start = self.emit(number, OP_UNTIL_PIXEL, x, y, color, tolerance, reg, 0)
+        self._block(body, calls, callees)
+        self.emit(number, OP_JUMP, start)
+        self.code[start + 6] = len(self.code)
+
+    def _steps(self, number, action):
+        """click_engine 的动作步骤 -> 指令（步骤之间的时间差变为 wait）"""
+        ops = {click_engine.STEP_MOVE: OP_MOVE, click_engine.STEP_PRESS: OP_PRESS,
+               click_engine.STEP_RELEASE: OP_RELEASE, click_engine.STEP_CLICK: OP_CLICK}
+        elapsed = 0
+        for offset, op, a, b in action:
+            offset_us = int(round(offset * 1e6))
+            if offset_us > elapsed:
+                self.emit(number, OP_WAIT, offset_us - elapsed)
+                elapsed = offset_us
+            if op == click_engine.STEP_MOVE:
+                self.emit(number, OP_MOVE, a, b)
+            elif op == click_engine.STEP_CLICK:
+                self.emit(number, OP_CLICK, BUTTONS.index(a or 'left'), b)
+            else:
+                self.emit(number, ops[op], BUTTONS.index(a or 'left'))
+
+    def _simple(self, number, tokens, calls, callees):
+        word, args = tokens[0].lower(), tokens[1:]
+        if word == 'move':
+            if len(args) != 2:
+                raise MacroError('用法: move X Y', number)
+            self.emit(number, OP_MOVE, _int(args[0], number, '坐标'), _int(args[1], number, '坐标'))
+        elif word == 'click':
+            button, count = 0, 1
+            for arg in args:
+                if arg.lower() in BUTTON_NAMES:
+                    button = BUTTON_NAMES[arg.lower()]
+                else:
+                    count = _int(arg, number, '点击次数')
+            if count < 1:
+                raise MacroError('点击次数至少为 1', number)
+            self.emit(number, OP_CLICK, button, count)
+        elif word == 'hold':
+            button, duration = 0, None
+            for arg in args:
+                if arg.lower() in BUTTON_NAMES:
+                    button = BUTTON_NAMES[arg.lower()]
+                else:
+                    duration = parse_duration_us(arg, number)
+            if duration is None:
+                raise MacroError('用法: hold [按键] 时长', number)
+            self._steps(number, click_engine.hold(BUTTONS[button], duration * 1e-6))
+        elif word == 'drag':
+            if len(args) < 4:
+                raise MacroError('用法: drag X1 Y1 X2 Y2 [按键] [时长]', number)
+            start = (_int(args[0], number, '坐标'), _int(args[1], number, '坐标'))
+            end = (_int(args[2], number, '坐标'), _int(args[3], number, '坐标'))
+            button, duration = 'left', 200000
+            for arg in args[4:]:
+                if arg.lower() in BUTTON_NAMES:
+                    button = BUTTONS[BUTTON_NAMES[arg.lower()]]
+                else:
+                    duration = parse_duration_us(arg, number)
+            self._steps(number, click_engine.drag(start, end, button, duration * 1e-6))
+        elif word == 'chord':
+            names = args[0].lower().split('+') if args else []
+            if len(names) < 2 or any(name not in BUTTON_NAMES for name in names):
+                raise MacroError('用法: chord 按键+按键 [时长]', number)
+            duration = parse_duration_us(args[1], number) if len(args) > 1 else 50000
+            self._steps(number, click_engine.chord([BUTTONS[BUTTON_NAMES[n]] for n in names], duration * 1e-6))
+        elif word == 'wait':
+            if len(args) != 1:
+                raise MacroError('用法: wait 时长', number)
+            self.emit(number, OP_WAIT, parse_duration_us(args[0], number))
+        elif word == 'call':
+            if len(args) != 1:
+                raise MacroError('用法: call 名称', number)
+            site = self.emit(number, OP_CALL, 0) + 1
+            calls.setdefault(args[0], []).append(site)
+            callees.add(args[0])
+        else:
+            raise MacroError(f"未知指令: {tokens[0]}", number)
+
+
+def _call_depth(graph):
+    """子程序调用图的最大深度；存在递归时报错（寄存器按静态位置分配）"""
+    depths = {}
+
+    def visit(name, path):
+        if name in path:
+            raise MacroError(f"子程序不能递归调用: {' -> '.join(path[1:] + (name,))}")
+        if name not in depths:
+            depths[name] = 1 + max((visit(c, path + (name,)) for c in graph.get(name, ())), default=0)
+        return depths[name]
+
+    return visit(None, ()) - 1
+
+
+def compile_macro(text):
+    """宏文本 -> MacroProgram（语法错误抛出 MacroError）"""
+    return _Compiler().compile(text)
+
+
+def load_macro(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return compile_macro(f.read())
+
+
+def _format_wait(ms):
+    return f"{ms / 1000:g}s" if ms >= 1000 and ms % 100 == 0 else f"{ms}ms"
+
+
+def _repeat_run(units, i, max_period):
+    """从 i 开始重复次数最多（节省最多）的片段 -> (周期, 重复次数)"""
+    best_period, best_times, best_saved = 1, 1, 0
+    n = len(units)
+    for period in range(1, min(max_period, (n - i) // 2) + 1):
+        block = units[i:i + period]
+        times = 1
+        while units[i + times * period:i + (times + 1) * period] == block:
+            times += 1
+        saved = period * (times - 1)
+        if times > 1 and saved > best_saved:
+            best_period, best_times, best_saved = period, times, saved
+    return best_period, best_times
+
+
+def recording_to_macro(events, idle_threshold=1.0, idle_wait=0.1, quantum=0.01, max_period=16):
+    """把录制的事件列表转换成宏文本
+
+    点击之间的间隔量化到 quantum 秒的整数倍，超过 idle_threshold 秒的
+    空闲缩短为 idle_wait 秒；连续重复的点击序列（最长 max_period 次点击
+    为一段）合并成 loop。点击顺序、位置与按键保持不变，键盘事件不转换。
+    """
+    recorded_button = click_engine.recorded_button
+    clicks = [e for e in events if e.get('type') == 'click']
+    quantum_ms = max(1, int(round(quantum * 1000)))
+    # 每次点击为一个单元：(点击前等待的毫秒数, x, y, 按键)
+    units = []
+    previous = None
+    collapsed = 0
+    for e in clicks:
+        gap = 0.0 if previous is None else max(0.0, e['timestamp'] - previous)
+        previous = e['timestamp']
+        if gap > idle_threshold:
+            collapsed += 1
+            gap = idle_wait
+        wait_ms = int(round(gap * 1000 / quantum_ms)) * quantum_ms
+        units.append((wait_ms, int(e['x']), int(e['y']), recorded_button(e.get('button'))))
+
+    original = clicks[-1]['timestamp'] - clicks[0]['timestamp'] if clicks else 0.0
+    lines = [f"# 由录制转换：{len(clicks)} 次点击，原始时长 {original:.2f}s，"
+             f"预计 {sum(u[0] for u in units) / 1000:.2f}s（{collapsed} 段空闲已缩短）"]
+    cursor = [None]
+
+    def emit(unit, indent, move):
+        wait_ms, x, y, button = unit
+        if wait_ms:
+            lines.append(f"{indent}wait {_format_wait(wait_ms)}")
+        if move and cursor[0] != (x, y):
+            lines.append(f"{indent}move {x} {y}")
+        cursor[0] = (x, y)
+        lines.append(f"{indent}click {button}" if button != 'left' else f"{indent}click")
+
+    i = 0
+    while i < len(units):
+        period, times = _repeat_run(units, i, max_period)
+        if times == 1:
+            emit(units[i], '', True)
+            i += 1
+            continue
+        block = units[i:i + period]
+        first, last = (block[0][1], block[0][2]), (block[-1][1], block[-1][2])
+        if first == last and cursor[0] != first:
+            # 每轮都从同一位置开始并在此结束：move 提到循环外
+            lines.append(f"move {first[0]} {first[1]}")
+            cursor[0] = first
+        lines.append(f"loop {times}")
+        entry = cursor[0]
+        for k, unit in enumerate(block):
+            # 第一轮与之后各轮进入循环时光标位置相同，才能省略循环体开头的 move
+            if k == 0 and entry != last:
+                cursor[0] = None
+            emit(unit, '  ', True)
+        lines.append('end')
+        i += period * times
+    return '\n'.join(lines) + '\n'
+
+
+def default_pixel_reader():
+    """返回 (x, y) -> 0xRRGGBB 的取色函数：有 QApplication 时用 Qt，否则用 Xlib"""
+    try:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance()
+    except ImportError:
+        app = None
+    if app is not None:
+        screen = app.primaryScreen()
+
+        def qt_pixel(x, y):
+            return screen.grabWindow(0, x, y, 1, 1).toImage().pixel(0, 0) & 0xFFFFFF
+        return qt_pixel
+    try:
+        from Xlib import X, display as xdisplay  # type: ignore
+        root = xdisplay.Display().screen().root
+    except Exception as e:
+        raise MacroError(f"没有可用的屏幕取色方式: {e}")
+
+    def x11_pixel(x, y):
+        data = root.get_image(x, y, 1, 1, X.ZPixmap, 0xFFFFFFFF).data
+        return data[2] << 16 | data[1] << 8 | data[0]   # BGRX
+    return x11_pixel
+
+
+def _color_close(a, b, tolerance):
+    if tolerance <= 0:
+        return a == b
+    return (abs((a >> 16) - (b >> 16)) <= tolerance and abs((a >> 8 & 0xFF) - (b >> 8 & 0xFF)) <= tolerance
+            and abs((a & 0xFF) - (b & 0xFF)) <= tolerance)
+
+
+def execute(program, mouse, kill_switch, timestamps, count=0, duration=None,
+            metrics=None, on_click=None, pixel_reader=None):
+    """解释执行宏，返回 (停止原因, 执行的指令数)
+
+    每条鼠标动作在截止时间线到达后执行；wait 只推进时间线，循环向后跳转
+    与程序结束时也先等到时间线（没有鼠标动作的循环不会空转，末尾的 wait
+    不会被丢弃）。count > 0 时点击满 count 次后停止，duration 为最长运行秒数。
+    """
+    code = program.code
+    regs = array('q', bytes(8 * max(1, program.registers)))
+    stack = array('q', bytes(8 * max(1, program.call_depth)))
+    sp = 0
+    if program.uses_pixel and pixel_reader is None:
+        pixel_reader = default_pixel_reader()
+    clock = time.perf_counter
+    wait = kill_switch.wait
+    is_set = kill_switch.is_set
+    start = due = clock()
+    end = start + duration if duration else None
+    clicks = 0
+    steps = 0
+    pc = 0
+    stopped_by = 'end'
+
+    def settle():
+        # 等到时间线（不超过结束时刻），返回停止原因或 None
+        delay = (due if end is None else min(due, end)) - clock()
+        if delay > 0:
+            if wait(delay):
+                return 'stop'
+        elif is_set():
+            return 'stop'
+        if end is not None and clock() >= end:
+            return 'duration'
+        return None
+
+    while True:
+        op = code[pc]
+        steps += 1
+        if op == OP_WAIT:
+            due += code[pc + 1] * 1e-6
+            pc += 2
+            continue
+        if op <= OP_RELEASE:
+            if op == OP_HALT:
+                stopped_by = settle() or 'end'
+                break
+            # 鼠标动作：等到截止时间再执行
+            if end is not None and due > end:
+                stopped_by = 'duration'
+                break
+            delay = due - clock()
+            if delay > 0:
+                if wait(delay):
+                    stopped_by = 'stop'
+                    break
+            elif is_set():
+                stopped_by = 'stop'
+                break
+            if op == OP_CLICK:
+                started = clock()
+                mouse.click(BUTTONS[code[pc + 1]], code[pc + 2])
+                finished = clock()
+                timestamps.append(finished)
+                if metrics is not None:
+                    metrics.record(due, started, finished)
+                if on_click:
+                    on_click(clicks, None)
+                clicks += 1
+                pc += 3
+                if clicks == count:
+                    stopped_by = 'count'
+                    break
+            elif op == OP_MOVE:
+                mouse.move(code[pc + 1], code[pc + 2])
+                pc += 3
+            elif op == OP_PRESS:
+                mouse.press(BUTTONS[code[pc + 1]])
+                pc += 2
+            else:
+                mouse.release(BUTTONS[code[pc + 1]])
+                pc += 2
+        elif op == OP_ENDLOOP:
+            reg = code[pc + 1]
+            remaining = regs[reg] - 1
+            if remaining != 0:
+                regs[reg] = remaining
+                pc = code[pc + 2]
+                # 向后跳转时等到时间线并检查停止开关与时长，避免没有动作的循环空转
+                reason = settle()
+                if reason:
+                    stopped_by = reason
+                    break
+            else:
+                pc += 3
+        elif op == OP_LOOP:
+            regs[code[pc + 1]] = code[pc + 2] or -1   # -1：无限循环（递减后永远不为 0）
+            pc += 3
+        elif op == OP_CALL:
+            stack[sp] = pc + 2
+            sp += 1
+            pc = code[pc + 1]
+        elif op == OP_RET:
+            sp -= 1
+            pc = stack[sp]
+        elif op == OP_JUMP:
+            pc = code[pc + 1]
+            reason = settle()
+            if reason:
+                stopped_by = reason
+                break
+        elif op == OP_UNTIL_PIXEL:
+            # 取色也在时间线上：循环体里的 wait 决定轮询间隔
+            delay = due - clock()
+            if delay > 0:
+                if wait(delay):
+                    stopped_by = 'stop'
+                    break
+            elif is_set():
+                stopped_by = 'stop'
+                break
+            now = clock()
+            # 取色是阻塞的屏幕读取，时间线不能落后于当前时间，否则之后的动作会连发
+            if due < now:
+                due = now
+            deadline = regs[code[pc + 5]]
+            if (_color_close(pixel_reader(code[pc + 1], code[pc + 2]), code[pc + 3], code[pc + 4])
+                    or (deadline >= 0 and now * 1e6 >= deadline)):
+                pc = code[pc + 6]
+            else:
+                pc += 7
+        elif op == OP_DEADLINE:
+            timeout = code[pc + 2]
+            regs[code[pc + 1]] = -1 if timeout < 0 else int(clock() * 1e6) + timeout
+            pc += 3
+        else:
+            raise MacroError(f"无效的操作码 {op}（位置 {pc}）", program.lines[pc])
+    return stopped_by, steps
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python3 -m macro', description='把录制文件转换成可编辑的宏')
+    parser.add_argument('recording', help='录制文件（JSON 事件列表）')
+    parser.add_argument('-o', '--output', help='写入宏文件而不是标准输出')
+    parser.add_argument('--idle', type=float, default=1.0, help='超过该秒数的空闲会被缩短（默认 1.0）')
+    parser.add_argument('--idle-wait', type=float, default=0.1, help='缩短后的空闲秒数（默认 0.1）')
+    parser.add_argument('--quantum', type=float, default=0.01, help='间隔量化的粒度秒数（默认 0.01）')
+    args = parser.parse_args(argv)
+
+    from auto_clicker_cli import load_recording
+    text = recording_to_macro(load_recording(args.recording), idle_threshold=args.idle,
+                              idle_wait=args.idle_wait, quantum=args.quantum)
+    compile_macro(text)   # 转换结果必须能编译
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
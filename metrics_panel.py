@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标面板 - 定时采样 ClickMetrics 并显示
+勾选后才启动定时器（每 250ms 采样一次），不勾选时没有任何开销。
+"""
+
+from PyQt5.QtWidgets import QGroupBox, QVBoxLayout, QLabel
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
+
+from click_metrics import JITTER_BUCKETS_MS
+
+
+class MetricsPanel(QGroupBox):
+    """显示实际频率、错过截止次数、注入耗时与抖动直方图"""
+
+    def __init__(self, parent=None, window=1.0, poll_ms=250):
+        super().__init__("运行指标", parent)
+        self.window = window
+        self.metrics = None
+        self.setCheckable(True)
+        self.setChecked(False)
+        self.toggled.connect(self._on_toggled)
+
+        layout = QVBoxLayout()
+        self.summary_label = QLabel('未运行')
+        layout.addWidget(self.summary_label)
+        self.histogram_label = QLabel('')
+        self.histogram_label.setFont(QFont('Courier', 10))
+        layout.addWidget(self.histogram_label)
+        self.setLayout(layout)
+        self._set_contents_visible(False)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(poll_ms)
+        self.timer.timeout.connect(self.refresh)
+
+    def _set_contents_visible(self, visible):
+        self.summary_label.setVisible(visible)
+        self.histogram_label.setVisible(visible)
+
+    def _on_toggled(self, checked):
+        self._set_contents_visible(checked)
+        if checked and self.metrics is not None:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def attach(self, metrics):
+        """开始显示一次连点的指标"""
+        self.metrics = metrics
+        if self.isChecked():
+            self.refresh()
+            self.timer.start()
+
+    def detach(self):
+        """连点结束：停止采样，保留最后一次的数据"""
+        self.timer.stop()
+        if self.metrics is not None and self.isChecked():
+            self.refresh()
+
+    def refresh(self):
+        if self.metrics is None:
+            return
+        snap = self.metrics.snapshot(self.window)
+        latency = snap['latency_ms']
+        self.summary_label.setText(
+            f"实际 {snap['rate']:.1f}/{snap['target_rate']:.1f} 次/秒   "
+            f"错过截止 {snap['missed']}/{snap['total']}\n"
+            f"注入耗时 p50 {latency['p50']:.2f}ms  p99 {latency['p99']:.2f}ms  max {latency['max']:.2f}ms"
+        )
+        histogram = snap['jitter_histogram']
+        peak = max(histogram) or 1
+        labels = [f"<{b:g}ms" for b in JITTER_BUCKETS_MS] + [f"≥{JITTER_BUCKETS_MS[-1]:g}ms"]
+        lines = [f"{label:>7s} {'█' * round(20 * n / peak):20s} {n}" for label, n in zip(labels, histogram)]
+        self.histogram_label.setText('延迟分布（相对计划时间）\n' + '\n'.join(lines))
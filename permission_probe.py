@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输入注入权限探测 - 结果带有效期缓存，过期后在后台重新探测
+开始连点时只读缓存，不再每次都创建鼠标监听器、移动真实光标并 sleep。
+
+各平台的探测方式：
+- macOS：优先调用 AXIsProcessTrusted()（辅助功能授权状态，无副作用），
+  不可用时退回 监听器 + 移动光标 的旧方法；
+- Linux/X11：检查 X 服务器是否提供 XTEST 扩展（pynput 靠它注入事件），
+  不移动指针；
+- 其他平台：不需要额外授权，直接视为有权限。
+"""
+
+import os
+import sys
+import threading
+import time
+
+PERMISSION_TTL = 300.0  # 秒
+
+
+def probe_macos_trusted():
+    """macOS：查询辅助功能授权状态，无法查询时返回 None"""
+    for module_name in ('ApplicationServices', 'HIServices'):
+        try:
+            module = __import__(module_name)
+            return bool(module.AXIsProcessTrusted())
+        except Exception:
+            continue
+    return None
+
+
+def probe_x11_xtest(display_name=None):
+    """Linux/X11：X 服务器是否提供 XTEST 扩展，无法连接时返回 False"""
+    try:
+        from Xlib import display as xdisplay  # type: ignore
+    except Exception:
+        return False
+    try:
+        d = xdisplay.Display(display_name)
+    except Exception:
+        return False
+    try:
+        return d.has_extension('XTEST')
+    finally:
+        d.close()
+
+
+def probe_pointer_move():
+    """旧方法：创建鼠标监听器，失败时尝试移动光标 1 像素再移回（约 150ms）"""
+    try:
+        from pynput.mouse import Controller
+        from pynput import mouse
+
+        try:
+            test_listener = mouse.Listener(on_click=lambda x, y, button, pressed: None)
+            test_listener.start()
+            time.sleep(0.1)
+            test_listener.stop()
+            return True
+        except Exception:
+            pass
+
+        mouse_controller = Controller()
+        original_pos = mouse_controller.position
+        test_pos = (original_pos[0] + 1, original_pos[1] + 1)
+        mouse_controller.position = test_pos
+        time.sleep(0.05)
+        new_pos = mouse_controller.position
+        mouse_controller.position = original_pos
+        return abs(new_pos[0] - test_pos[0]) <= 2 and abs(new_pos[1] - test_pos[1]) <= 2
+    except Exception:
+        return False
+
+
+def probe_input_permission():
+    """按平台探测是否可以注入鼠标事件"""
+    if sys.platform == 'darwin':
+        trusted = probe_macos_trusted()
+        return trusted if trusted is not None else probe_pointer_move()
+    if sys.platform.startswith('linux'):
+        if os.environ.get('DISPLAY'):
+            return probe_x11_xtest()
+        return probe_pointer_move()
+    return True
+
+
+class PermissionCache:
+    """权限探测结果缓存
+
+    check() 在有效期内直接返回缓存结果；过期后仍先返回旧结果，同时
+    在后台线程重新探测。只有从未探测过（或上次结果为无权限）时才会
+    同步探测——用户刚在系统设置中授权后，下一次开始就能立即生效。
+    """
+
+    def __init__(self, probe=probe_input_permission, ttl=PERMISSION_TTL):
+        self.probe = probe
+        self.ttl = ttl
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def fresh(self):
+        return self._result is not None and time.monotonic() - self._checked_at < self.ttl
+
+    def _run_probe(self):
+        result = bool(self.probe())
+        with self._lock:
+            self._result = result
+            self._checked_at = time.monotonic()
+        return result
+
+    def refresh_async(self):
+        """在后台线程重新探测（已有探测在进行时不重复启动）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            self._thread = threading.Thread(target=self._run_probe, daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def check(self):
+        """返回是否有权限；缓存有效时不做任何探测"""
+        if self._result:
+            if not self.fresh:
+                self.refresh_async()
+            return True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            # 启动时的预探测还没完成，等它的结果
+            thread.join()
+            return bool(self._result)
+        return self._run_probe()
+
+    def invalidate(self):
+        """丢弃缓存，下一次 check() 重新探测"""
+        with self._lock:
+            self._result = None
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+位置方案库 - 按任务保存多组点击位置，按需加载
+index.json 只记录方案名称与元数据（位置数量、修改时间、数据文件名），
+每个方案的位置列表单独存成一个文件，只有被选中时才读取和解析。
+方案再多，启动时也只解析一个小索引，内存中只保留当前选中的方案。
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config_store import atomic_write, dump_json
+
+PROFILE_DIR = os.path.join(os.path.expanduser('~'), '.auto_clicker_profiles')
+INDEX_VERSION = 1
+
+
+def _normalize_positions(raw):
+    """[[x, y, name], ...] 或 [{'x':, 'y':, 'name':}, ...] -> [(x, y, name), ...]"""
+    positions = []
+    for pos in raw or []:
+        if isinstance(pos, dict):
+            positions.append((int(pos['x']), int(pos['y']), pos['name']))
+        elif isinstance(pos, (list, tuple)) and len(pos) >= 3:
+            positions.append((int(pos[0]), int(pos[1]), pos[2]))
+    return positions
+
+
+class ProfileLibrary:
+    """位置方案库
+
+    names()/info() 只读索引；load() 读取单个方案文件并缓存为当前方案，
+    切换到其他方案时旧方案即被释放。save()/delete() 先写方案文件，
+    再原子替换索引，中途崩溃不会出现索引指向半个文件的情况。
+    """
+
+    def __init__(self, root=PROFILE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        self._lock = threading.Lock()
+        self._active = None  # (名称, 方案数据)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            profiles = data.get('profiles')
+            return profiles if isinstance(profiles, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"加载方案索引失败: {e}")
+            return {}
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        atomic_write(self.index_path, dump_json({'version': INDEX_VERSION, 'profiles': self.index}))
+
+    @staticmethod
+    def _file_name(name):
+        # 名称可能包含任意字符，文件名用其摘要
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()[:16] + '.json'
+
+    def names(self):
+        """所有方案名称（按名称排序）"""
+        with self._lock:
+            return sorted(self.index)
+
+    def info(self, name):
+        """方案元数据 {'count': 位置数量, 'updated': 修改时间, 'file': 数据文件}"""
+        with self._lock:
+            meta = self.index.get(name)
+            return dict(meta) if meta else None
+
+    @property
+    def active_name(self):
+        active = self._active
+        return active[0] if active else None
+
+    def load(self, name):
+        """加载方案 {'positions': [(x, y, name), ...], 'cycle_mode': bool}，不存在时返回 None"""
+        with self._lock:
+            if self._active and self._active[0] == name:
+                return self._active[1]
+            meta = self.index.get(name)
+            if not meta:
+                return None
+            path = os.path.join(self.root, meta['file'])
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+            except Exception as e:
+                print(f"加载方案 {name} 失败: {e}")
+                return None
+            data = {
+                'positions': _normalize_positions(raw.get('positions')),
+                'cycle_mode': bool(raw.get('cycle_mode', True)),
+            }
+            # 只保留当前方案，之前加载的方案随之释放
+            self._active = (name, data)
+            return data
+
+    def save(self, name, positions, cycle_mode=True):
+        """保存（或覆盖）方案，并将其设为当前方案"""
+        positions = _normalize_positions(positions)
+        data = {'positions': positions, 'cycle_mode': bool(cycle_mode)}
+        with self._lock:
+            meta = self.index.get(name) or {'file': self._file_name(name)}
+            os.makedirs(self.root, exist_ok=True)
+            atomic_write(os.path.join(self.root, meta['file']),
+                         dump_json({'positions': [list(p) for p in positions],
+                                    'cycle_mode': data['cycle_mode']}))
+            meta['count'] = len(positions)
+            meta['updated'] = time.time()
+            self.index[name] = meta
+            self._save_index()
+            self._active = (name, data)
+
+    def delete(self, name):
+        """删除方案，不存在时返回 False"""
+        with self._lock:
+            meta = self.index.pop(name, None)
+            if meta is None:
+                return False
+            self._save_index()
+            if self._active and self._active[0] == name:
+                self._active = None
+        try:
+            os.remove(os.path.join(self.root, meta['file']))
+        except OSError:
+            pass
+        return True
+
+    def import_file(self, path, name=None):
+        """导入旧版按任务保存的 .auto_clicker_multi_config.json，返回方案名称"""
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        if name is None:
+            name = os.path.splitext(os.path.basename(path))[0].lstrip('.') or '导入方案'
+        self.save(name, raw.get('positions', []), raw.get('cycle_mode', True))
+        return name
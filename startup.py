@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动辅助 - 推迟非必要的初始化，并测量启动到首个窗口绘制的时间
+after_first_paint() 把热键后端等初始化推迟到主窗口第一次绘制之后，
+窗口先出现，再在事件循环中加载 pynput / keyboard / Quartz / Xlib。
+
+设置环境变量 AUTO_CLICKER_STARTUP_PROBE=1 时，install_probe() 在主窗口
+第一次绘制时打印一行 "STARTUP_READY <已导入的顶层模块>" 并退出事件循环，
+供 bench_startup.py 计时；未设置时不做任何事。
+"""
+
+import os
+import sys
+
+PROBE_ENV_VAR = 'AUTO_CLICKER_STARTUP_PROBE'
+READY_MARKER = 'STARTUP_READY'
+
+
+def _on_first_paint(window, handler):
+    from PyQt5.QtCore import QEvent, QObject
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                handler()
+            return False
+
+    event_filter = FirstPaintFilter(window)
+    window.installEventFilter(event_filter)
+    return event_filter
+
+
+def after_first_paint(window, callback, timeout_ms=500):
+    """主窗口第一次绘制后执行 callback（窗口迟迟未绘制时 timeout_ms 后兜底执行）"""
+    from PyQt5.QtCore import QTimer
+    state = {'done': False}
+
+    def run_once():
+        if not state['done']:
+            state['done'] = True
+            callback()
+
+    _on_first_paint(window, lambda: QTimer.singleShot(0, run_once))
+    QTimer.singleShot(timeout_ms, run_once)
+
+
+def install_probe(window):
+    """安装启动探针（仅在设置了 AUTO_CLICKER_STARTUP_PROBE 时生效）"""
+    if not os.environ.get(PROBE_ENV_VAR):
+        return
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    def report():
+        modules = ','.join(sorted(name for name in sys.modules if '.' not in name))
+        print(f"{READY_MARKER} {modules}", flush=True)
+        QTimer.singleShot(0, QApplication.instance().quit)
+
+    _on_first_paint(window, report)
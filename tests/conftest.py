@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共设置：模块位于仓库根目录；HOME 指向临时目录，
+各模块导入时计算的配置与方案路径都不会碰到真实的用户目录。
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ['HOME'] = tempfile.mkdtemp(prefix='auto_clicker_test_home_')
+
+import pytest  # noqa: E402
+
+
+class RecordingMouse:
+    """只记录调用的鼠标后端：calls 为 [(操作, 参数...), ...]"""
+
+    def __init__(self):
+        self.calls = []
+        self._position = (0, 0)
+
+    def move(self, x, y):
+        self._position = (x, y)
+        self.calls.append(('move', x, y))
+
+    def position(self):
+        return self._position
+
+    def click(self, button='left', count=1):
+        self.calls.append(('click', button, count))
+
+    def press(self, button='left'):
+        self.calls.append(('press', button))
+
+    def release(self, button='left'):
+        self.calls.append(('release', button))
+
+    def ops(self, *names):
+        return [c for c in self.calls if c[0] in names]
+
+
+@pytest.fixture
+def mouse():
+    return RecordingMouse()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+
+import app_logging
+from app_logging import get_logger
+
+
+@pytest.fixture
+def stream():
+    saved = dict(app_logging._config)
+    stream = io.StringIO()
+    app_logging.configure(level='info', use_queue=False, stream=stream)
+    yield stream
+    app_logging.configure(use_queue=False)
+    app_logging._config.update(saved)
+    for logger in app_logging._loggers.values():
+        logger.set_level(saved['level'])
+
+
+def test_levels_and_lazy_formatting(stream):
+    log = get_logger('test')
+    assert get_logger('test') is log
+    log.debug('hidden %s', 1)
+    log.info('点击 %d 次', 3)
+    log.error('plain')
+    assert stream.getvalue() == '点击 3 次\nplain\n'
+    assert not log.debug_enabled and log.info_enabled
+
+
+def test_configure_updates_existing_loggers(stream):
+    log = get_logger('test')
+    app_logging.configure(level='debug')
+    assert log.debug_enabled
+    log.debug('x=%s', 5)
+    app_logging.configure(level='error')
+    log.warning('dropped')
+    assert stream.getvalue() == '[test] x=5\n'
+
+
+def test_bad_format_arguments_do_not_raise(stream):
+    get_logger('test').error('%d', 'not a number')
+    assert stream.getvalue() == "%d ('not a number',)\n"
+
+
+def test_queue_writer_flushes_on_demand(stream):
+    app_logging.configure(use_queue=True)
+    writer = app_logging._config['writer']
+    log = get_logger('test')
+    for i in range(50):
+        log.info('line %d', i)
+    app_logging.flush()
+    assert writer.thread is None
+    assert stream.getvalue().splitlines() == [f'line {i}' for i in range(50)]
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import threading
+import time
+
+import pytest
+
+import auto_clicker_cli
+from click_engine import ClickEngine, timing_summary
+
+
+@pytest.fixture(autouse=True)
+def no_signal_handlers(monkeypatch):
+    monkeypatch.setattr(auto_clicker_cli.signal, 'signal', lambda *args: None)
+
+
+def run_cli(tmp_path, *argv):
+    output = tmp_path / 'summary.json'
+    assert auto_clicker_cli.main([*argv, '--dry-run', '--output', str(output)]) == 0
+    return json.loads(output.read_text(encoding='utf-8'))
+
+
+def test_engine_keeps_deadline_schedule(mouse):
+    engine = ClickEngine(rate=200, count=40, positions=[(1, 1), (2, 2, 'right')], mouse=mouse)
+    summary = engine.run()
+    assert summary['stopped_by'] == 'count' and summary['clicks'] == 40
+    assert summary['achieved_rate'] == pytest.approx(200, rel=0.05)
+    assert engine.timestamps[-1] - engine.timestamps[0] == pytest.approx(39 / 200, abs=0.01)
+    assert mouse.ops('click')[:2] == [('click', 'left', 1), ('click', 'right', 1)]
+
+
+def test_engine_stops_on_kill_switch_and_duration(mouse):
+    engine = ClickEngine(rate=100, mouse=mouse)
+    threading.Timer(0.05, engine.stop).start()
+    assert engine.run()['stopped_by'] == 'stop'
+    assert ClickEngine(rate=100, duration=0.05, mouse=mouse).run()['stopped_by'] == 'duration'
+    single_pass = ClickEngine(rate=500, positions=[(1, 1), (2, 2)], cycle=False, mouse=mouse).run()
+    assert single_pass['clicks'] == 2
+
+
+def test_engine_replays_recording_offsets(mouse):
+    events = [{'type': 'click', 'timestamp': 10 + t, 'x': 5, 'y': 6, 'button': 'Button.right'}
+              for t in (0.0, 0.02, 0.1)]
+    engine = ClickEngine.from_recording(events, speed=2.0, mouse=mouse)
+    assert engine.offsets == pytest.approx([0.0, 0.01, 0.05])
+    engine.run()
+    assert mouse.ops('click') == [('click', 'right', 1)] * 3
+    assert engine.timestamps[-1] - engine.timestamps[0] == pytest.approx(0.05, abs=0.01)
+
+
+def test_timing_summary():
+    summary = timing_summary([0.0, 0.1, 0.2, 0.31], interval=0.1)
+    assert summary['clicks'] == 4
+    assert summary['achieved_rate'] == pytest.approx(3 / 0.31, abs=0.01)
+    assert summary['jitter_ms']['max'] == pytest.approx(10.0)
+    assert timing_summary([])['achieved_rate'] == 0.0
+
+
+def test_parse_positions():
+    assert auto_clicker_cli.parse_positions('100,200; 300,400;') == [(100, 200), (300, 400)]
+    with pytest.raises(argparse.ArgumentTypeError):
+        auto_clicker_cli.parse_positions('100;200')
+
+
+def test_cli_rate_mode(tmp_path):
+    summary = run_cli(tmp_path, '--rate', '500', '--count', '25', '--positions', '1,2;3,4')
+    assert summary['clicks'] == 25 and summary['stopped_by'] == 'count'
+    assert summary['mode'] == 'rate' and summary['positions'] == 2
+
+
+def test_cli_action_and_bad_action(tmp_path, capsys):
+    summary = run_cli(tmp_path, '--rate', '200', '--count', '3', '--action', '{"type": "hold", "duration": 0.001}')
+    assert summary['clicks'] == 3
+    with pytest.raises(SystemExit):
+        auto_clicker_cli.main(['--action', '{"type": "hold", "duration": "long"}'])
+    assert '无效的动作' in capsys.readouterr().err
+
+
+def test_cli_recording_and_macro(tmp_path):
+    recording = tmp_path / 'rec.json'
+    recording.write_text(json.dumps([{'type': 'click', 'timestamp': t, 'x': 1, 'y': 2} for t in (0, 0.01, 0.02)]),
+                         encoding='utf-8')
+    assert run_cli(tmp_path, '--recording', str(recording))['clicks'] == 3
+
+    program = tmp_path / 'farm.macro'
+    program.write_text('loop\n  click\n  wait 1ms\nend\n', encoding='utf-8')
+    summary = run_cli(tmp_path, '--macro', str(program), '--count', '10')
+    assert summary['mode'] == 'macro' and summary['clicks'] == 10 and summary['stopped_by'] == 'count'
+
+    program.write_text('loop 0\n  click\nend\n', encoding='utf-8')
+    with pytest.raises(SystemExit, match='循环次数'):
+        auto_clicker_cli.main(['--macro', str(program), '--dry-run'])
+
+
+def test_cli_jobs(tmp_path):
+    jobs = tmp_path / 'jobs.json'
+    jobs.write_text(json.dumps({'jobs': [{'name': 'A', 'rate': 400, 'count': 4, 'positions': [[1, 2]]},
+                                         {'name': 'B', 'rate': 300, 'count': 2, 'button': 'right'}]}),
+                    encoding='utf-8')
+    started = time.perf_counter()
+    summary = run_cli(tmp_path, '--jobs', str(jobs))
+    assert time.perf_counter() - started < 2
+    assert summary['mode'] == 'jobs' and summary['clicks'] == 6
+    assert {job['name']: job['stopped_by'] for job in summary['jobs']} == {'A': 'count', 'B': 'count'}
+
+    jobs.write_text(json.dumps([{'name': 'bad', 'positions': [[100]]}]), encoding='utf-8')
+    with pytest.raises(SystemExit, match='bad'):
+        auto_clicker_cli.main(['--jobs', str(jobs), '--dry-run'])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+from click_engine import (STEP_CLICK, STEP_MOVE, STEP_PRESS, STEP_RELEASE, ClickEngine, action_from_spec,
+                          chord, double_click, drag, hold, perform)
+from job_scheduler import ClickJob, JobScheduler
+
+
+def test_builders():
+    assert hold('right', 0.2) == ((0.0, STEP_PRESS, 'right', None), (0.2, STEP_RELEASE, 'right', None))
+    assert double_click(gap=0.03)[1] == (0.03, STEP_CLICK, None, 1)
+    steps = drag((0, 0), (100, 50), duration=0.1, rate=100)
+    assert steps[0] == (0.0, STEP_MOVE, 0, 0) and steps[1][1] == STEP_PRESS
+    assert steps[-2] == (0.1, STEP_MOVE, 100, 50) and steps[-1] == (0.1, STEP_RELEASE, None, None)
+    assert [s[2] for s in chord(['left', 'right'])] == ['left', 'right', 'right', 'left']
+
+
+def test_action_from_spec_builds_each_type():
+    assert action_from_spec({'type': 'hold', 'duration': 0.15, 'button': 'right'}) == hold('right', 0.15)
+    assert action_from_spec({'type': 'double'}) == double_click(None, 0.05)
+    assert action_from_spec({'type': 'drag', 'from': [1, 2], 'to': [30.0, 40]}) == drag((1, 2), (30, 40))
+    assert action_from_spec({'type': 'chord', 'buttons': ['left', 'middle'], 'duration': 0}) == \
+        chord(['left', 'middle'], 0.0)
+
+
+@pytest.mark.parametrize('spec', [
+    'hold',
+    ['hold'],
+    {'type': 'tap'},
+    {'button': 'left'},
+    {'type': 'hold', 'duration': '0.1'},
+    {'type': 'hold', 'duration': -0.1},
+    {'type': 'hold', 'duration': float('inf')},
+    {'type': 'hold', 'duration': True},
+    {'type': 'hold', 'button': 'thumb'},
+    {'type': 'double', 'gap': None},
+    {'type': 'drag', 'to': [1, 2]},
+    {'type': 'drag', 'from': [1], 'to': [1, 2]},
+    {'type': 'drag', 'from': [1, 2, 3], 'to': [1, 2]},
+    {'type': 'drag', 'from': [1, 2], 'to': ['a', 2]},
+    {'type': 'drag', 'from': [1, 2], 'to': [1.5, 2]},
+    {'type': 'drag', 'from': {'x': 1, 'y': 2}, 'to': [1, 2]},
+    {'type': 'chord', 'buttons': ['left']},
+    {'type': 'chord', 'buttons': 'left+right'},
+    {'type': 'chord', 'buttons': ['left', 'left']},
+    {'type': 'chord', 'buttons': ['left', 'thumb']},
+])
+def test_action_from_spec_rejects_malformed_specs(spec):
+    with pytest.raises(ValueError):
+        action_from_spec(spec)
+
+
+def test_perform_keeps_step_timing(mouse):
+    base = time.perf_counter()
+    done, first = perform(hold(None, 0.05), mouse, 'right', base, threading.Event())
+    assert done and first - base < 0.02
+    assert time.perf_counter() - base >= 0.05
+    assert mouse.calls == [('press', 'right'), ('release', 'right')]
+
+
+def test_perform_releases_held_buttons_when_stopped(mouse):
+    kill_switch = threading.Event()
+    threading.Timer(0.03, kill_switch.set).start()
+    done, _ = perform(chord(['left', 'right'], 1.0), mouse, 'left', time.perf_counter(), kill_switch)
+    assert not done
+    assert mouse.calls == [('press', 'left'), ('press', 'right'), ('release', 'right'), ('release', 'left')]
+
+
+def test_engine_runs_action_per_click(mouse):
+    engine = ClickEngine(rate=50, count=3, positions=[(5, 5, 'middle')], mouse=mouse,
+                         action=action_from_spec({'type': 'hold', 'duration': 0.005}))
+    summary = engine.run()
+    assert summary['stopped_by'] == 'count' and summary['clicks'] == 3
+    assert mouse.ops('press', 'release') == [('press', 'middle'), ('release', 'middle')] * 3
+
+
+def test_scheduler_interleaves_action_steps_with_other_jobs(mouse):
+    scheduler = JobScheduler(mouse=mouse)
+    scheduler.submit(ClickJob(name='hold', rate=10, count=2,
+                              action=action_from_spec({'type': 'hold', 'duration': 0.05, 'button': 'right'})))
+    scheduler.submit(ClickJob(name='fast', rate=200, count=10))
+    result = {s['name']: s for s in scheduler.run()}
+    assert result['hold']['clicks'] == 2 and result['fast']['clicks'] == 10
+    kinds = [c[0] for c in mouse.calls]
+    first_press, first_release = kinds.index('press'), kinds.index('release')
+    assert 'click' in kinds[first_press:first_release]       # 按住期间其他任务照常点击
+
+
+def test_reconfigured_action_applies_from_next_click(mouse):
+    scheduler = JobScheduler(mouse=mouse).start()
+    job = scheduler.submit(ClickJob(name='A', rate=20,
+                                    action=action_from_spec({'type': 'hold', 'duration': 0.03})))
+    time.sleep(0.01)                                          # 第一次按住进行中
+    scheduler.reconfigure(job, action={'type': 'chord', 'buttons': ['left', 'right'], 'duration': 0.01})
+    time.sleep(0.1)
+    scheduler.close(1.0)
+    assert job.summary['stopped_by'] == 'stop'
+    calls = mouse.ops('press', 'release')
+    assert calls[:2] == [('press', 'left'), ('release', 'left')]  # 进行中的动作按原步骤完成
+    assert ('press', 'right') in calls
+    with pytest.raises(ValueError):
+        scheduler.reconfigure(job, action={'type': 'chord', 'buttons': ['left']})
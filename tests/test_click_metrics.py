@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from click_metrics import JITTER_BUCKETS_MS, ClickMetrics
+
+
+def test_snapshot_rate_jitter_and_latency():
+    metrics = ClickMetrics(interval=0.1)
+    now = 100.0
+    for i in range(10):
+        due = now - 1.0 + i * 0.1
+        late = 0.0003 if i < 8 else 0.008                  # 两次晚 8ms
+        metrics.record(due, due + late, due + late + 0.002)
+    snap = metrics.snapshot(window=1.0, now=now)
+    assert snap['total'] == 10
+    assert snap['rate'] == pytest.approx(10.0)
+    assert snap['target_rate'] == pytest.approx(10.0)
+    assert snap['jitter_histogram'][0] == 8
+    assert snap['jitter_histogram'][JITTER_BUCKETS_MS.index(10)] == 2
+    assert snap['latency_ms']['p50'] == pytest.approx(2.0)
+    assert snap['missed'] == 0                              # 阈值为半个间隔（50ms）
+
+
+def test_missed_deadlines_and_window():
+    metrics = ClickMetrics(interval=0.01)                   # 阈值 5ms
+    metrics.record(0.0, 0.006, 0.007)
+    metrics.record(5.0, 5.001, 5.002)
+    snap = metrics.snapshot(window=1.0, now=5.5)
+    assert snap['missed'] == 1 and snap['total'] == 2
+    assert snap['rate'] == pytest.approx(1.0)               # 第一次点击已在窗口之外
+    assert sum(snap['jitter_histogram']) == 1
+
+
+def test_ring_buffer_keeps_latest_capacity_records():
+    metrics = ClickMetrics(interval=0.001, capacity=8)
+    for i in range(20):
+        t = i * 0.001
+        metrics.record(t, t, t + (0.005 if i >= 12 else 0.0))
+    snap = metrics.snapshot(window=10.0, now=0.1)
+    assert snap['total'] == 20
+    assert snap['rate'] == pytest.approx(0.8)              # 只剩最近 8 条
+    assert snap['latency_ms']['p50'] == pytest.approx(5.0)
+
+
+def test_empty_snapshot():
+    snap = ClickMetrics().snapshot(now=1.0)
+    assert snap['rate'] == 0.0 and snap['latency_ms'] == {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
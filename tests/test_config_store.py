@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+
+import pytest
+
+import config_store
+from config_store import ConfigStore, atomic_write, dump_ini
+
+
+def test_atomic_write_replaces_file_and_leaves_no_temp(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('old', encoding='utf-8')
+    atomic_write(str(path), '{"a": 1}')
+    assert path.read_text(encoding='utf-8') == '{"a": 1}'
+    assert os.listdir(tmp_path) == ['config.json']
+
+
+def test_atomic_write_failure_keeps_old_file(tmp_path, monkeypatch):
+    path = tmp_path / 'config.json'
+    path.write_text('old', encoding='utf-8')
+
+    def fail(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(config_store.os, 'replace', fail)
+    with pytest.raises(OSError):
+        atomic_write(str(path), 'new')
+    assert path.read_text(encoding='utf-8') == 'old'
+    assert os.listdir(tmp_path) == ['config.json']
+
+
+def test_store_coalesces_rapid_saves(tmp_path, monkeypatch):
+    path = tmp_path / 'config.json'
+    writes = []
+    done = threading.Event()
+    real_write = atomic_write
+
+    def counting_write(p, text):
+        writes.append(text)
+        real_write(p, text)
+        done.set()
+    monkeypatch.setattr(config_store, 'atomic_write', counting_write)
+    store = ConfigStore(str(path), delay=0.05)
+    for i in range(20):
+        store.save({'n': i})
+    assert done.wait(2.0)
+    store.close()
+    assert len(writes) == 1
+    assert json.loads(path.read_text(encoding='utf-8')) == {'n': 19}
+    assert not store.dirty
+
+
+def test_flush_writes_pending_immediately(tmp_path):
+    path = tmp_path / 'config.json'
+    store = ConfigStore(str(path), delay=60)
+    store.save({'frequency': 25.0})
+    assert store.dirty
+    store.flush()
+    assert not store.dirty
+    assert json.loads(path.read_text(encoding='utf-8')) == {'frequency': 25.0}
+    store.close()
+
+
+def test_close_writes_last_snapshot(tmp_path):
+    path = tmp_path / 'config.ini'
+    store = ConfigStore(str(path), serializer=dump_ini, delay=60)
+    store.save({'Settings': {'interval': 100}})
+    store.close()
+    assert '[Settings]' in path.read_text(encoding='utf-8')
+
+
+def test_write_error_is_logged_not_raised(tmp_path):
+    store = ConfigStore(str(tmp_path / 'missing' / 'config.json'), delay=60)
+    store.save({'a': 1})
+    store.flush()          # 目录不存在：只记录错误
+    assert not store.dirty
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def test_migrate_legacy_without_files_returns_none(tmp_path):
+    assert config_store.migrate_legacy(str(tmp_path), str(tmp_path / 'multi.json')) is None
+
+
+def test_migrate_legacy_merges_files_in_order(tmp_path):
+    (tmp_path / 'config.ini').write_text(
+        '[Settings]\ninterval = 100\nclick_type = right\nmax_clicks = 5\nhotkey = f8\n', encoding='utf-8')
+    write_json(tmp_path / 'config_hotkey.json', {'frequency': 40, 'button': '中键', 'click_type': '双击',
+                                                 'hotkey_start': 'f9', 'hotkey_stop': 'f10'})
+    write_json(tmp_path / 'config_native.json', {'hotkey_config': {
+        'start_mods': ['Ctrl', 'Shift'], 'start_key': 'A', 'stop_mods': ['Command'], 'stop_key': 'B'}})
+    multi = tmp_path / 'multi.json'
+    write_json(multi, {'positions': [{'x': 1, 'y': 2, 'name': '甲'}, [3, 4, '乙']], 'cycle_mode': False})
+
+    data = config_store.migrate_legacy(str(tmp_path), str(multi))
+    click, hotkeys, positions = data['click'], data['hotkeys'], data['multi_position']
+    assert data['version'] == config_store.SCHEMA_VERSION
+    assert click['frequency'] == 40.0                 # config_hotkey.json 覆盖 config.ini
+    assert click['max_clicks'] == 5 and isinstance(click['max_clicks'], int)
+    assert click['button'] == 'middle'
+    assert click['click_type'] == 'double'
+    assert hotkeys['toggle_key'] == 'f8'
+    assert (hotkeys['start_key'], hotkeys['stop_key']) == ('f9', 'f10')
+    assert hotkeys['start_combo'] == {'ctrl': True, 'option': False, 'shift': True, 'command': False, 'key': 'A'}
+    assert hotkeys['stop_combo']['command'] and hotkeys['stop_combo']['key'] == 'B'
+    assert positions['positions'] == [[1, 2, '甲'], [3, 4, '乙']]
+    assert positions['cycle_mode'] is False
+
+
+def test_migrate_legacy_skips_broken_file(tmp_path):
+    (tmp_path / 'config.json').write_text('{not json', encoding='utf-8')
+    write_json(tmp_path / 'config_native.json', {'frequency': 12})
+    data = config_store.migrate_legacy(str(tmp_path), str(tmp_path / 'multi.json'))
+    assert data['click']['frequency'] == 12.0
+
+
+def test_validate_fills_defaults_coerces_and_drops_unknown():
+    data = config_store.validate({'click': {'frequency': '15', 'hold_mode': 'yes', 'bogus': 1},
+                                  'hotkeys': 'not a dict'})
+    assert data['click']['frequency'] == 15.0
+    assert data['click']['hold_mode'] is True
+    assert 'bogus' not in data['click']
+    assert data['hotkeys']['start_key'] == 'f6'
+
+
+def test_settings_migrates_once_then_reads_unified_file(tmp_path):
+    legacy = tmp_path / 'legacy'
+    legacy.mkdir()
+    write_json(legacy / 'config_native.json', {'frequency': 33})
+    path = tmp_path / 'settings.json'
+    settings = config_store.Settings(str(path), legacy_dir=str(legacy))
+    settings.update('click', max_clicks='7', unknown=1)
+    settings.close()
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved['click']['frequency'] == 33.0
+    assert saved['click']['max_clicks'] == 7
+
+    (legacy / 'config_native.json').unlink()
+    again = config_store.Settings(str(path), legacy_dir=str(legacy))
+    assert again.get('click', 'frequency') == 33.0
+    again.close()
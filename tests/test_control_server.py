@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import time
+
+import pytest
+
+import control_server
+from click_engine import NullMouse
+from control_server import ControlServer, Session
+from job_scheduler import JobScheduler
+
+
+@pytest.fixture
+def server():
+    scheduler = JobScheduler(mouse=NullMouse()).start()
+    server = ControlServer(scheduler=scheduler)
+    yield server
+    scheduler.close(1.0)
+
+
+def test_start_update_stop_and_jobs(server):
+    assert server.handle({'cmd': 'start', 'name': 'A', 'rate': 100, 'positions': [[1, 2]]}, None) == \
+        {'job': 'A', 'ok': True}
+    assert server.handle({'cmd': 'start', 'name': 'A'}, None)['ok'] is False     # 同名任务仍在运行
+    assert server.handle({'cmd': 'update', 'job': 'A', 'rate': 200, 'positions': [[3, 4, 'right']]},
+                         None)['ok']
+    time.sleep(0.05)
+    assert server.handle({'cmd': 'stop', 'job': 'A'}, None) == {'stopped': ['A'], 'ok': True}
+    time.sleep(0.05)
+    info = server.handle({'cmd': 'jobs'}, None)['jobs'][0]
+    assert info['name'] == 'A' and not info['running']
+    assert info['target_rate'] == 200.0 and info['summary']['stopped_by'] == 'stop'
+
+
+@pytest.mark.parametrize('request_', [
+    {'cmd': 'start', 'positions': [[100]]},
+    {'cmd': 'start', 'positions': [[1, 2, 3, 4]]},
+    {'cmd': 'start', 'rate': '80'},
+    {'cmd': 'start', 'count': 'many'},
+    {'cmd': 'start', 'duration': -5},
+    {'cmd': 'start', 'action': {'type': 'drag', 'from': [1], 'to': [2, 3]}},
+    {'cmd': 'nope'},
+])
+def test_bad_requests_answer_ok_false(server, request_):
+    reply = server.handle(request_, None)
+    assert reply['ok'] is False and reply['error']
+    assert server.jobs == {}
+
+
+@pytest.mark.parametrize('changes', [
+    {'rate': '80'},
+    {'rate': 0},
+    {'positions': [[100]]},
+    {'positions': [['a', 'b']]},
+    {'button': 'thumb'},
+    {'cycle': 'sometimes'},
+])
+def test_bad_updates_answer_ok_false_and_job_keeps_running(server, changes):
+    server.handle({'cmd': 'start', 'name': 'A', 'rate': 100}, None)
+    reply = server.handle(dict(changes, cmd='update', job='A'), None)
+    assert reply['ok'] is False
+    time.sleep(0.03)
+    info = server.handle({'cmd': 'jobs'}, None)['jobs'][0]
+    assert info['running'] and info['target_rate'] == 100.0
+
+
+def test_update_unknown_job(server):
+    assert server.handle({'cmd': 'update', 'job': 'missing', 'rate': 5}, None)['ok'] is False
+
+
+@pytest.mark.parametrize('request_', [
+    {'cmd': 'metrics', 'window': 0},
+    {'cmd': 'metrics', 'window': -1},
+    {'cmd': 'metrics', 'interval': float('nan')},
+    {'cmd': 'metrics', 'interval': float('inf')},
+    {'cmd': 'metrics', 'interval': 'abc'},
+])
+def test_bad_metrics_subscription_answers_ok_false(server, request_):
+    reply = server.handle(request_, None)
+    assert reply['ok'] is False and reply['error']
+
+
+class FakeWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        pass
+
+
+def test_failed_metrics_stream_sends_error_event(server):
+    """推送任务出错时客户端收到 error 事件，而不是一直等待"""
+    server.handle({'cmd': 'start', 'name': 'A', 'rate': 100}, None)
+
+    def broken(window):
+        raise ZeroDivisionError('division by zero')
+    server.jobs['A'].metrics.snapshot = broken
+    session = Session(FakeWriter())
+
+    async def subscribe():
+        reply = server.handle({'cmd': 'metrics', 'interval': 0.05}, session)
+        assert reply['ok']
+        await asyncio.sleep(0.1)
+
+    asyncio.run(subscribe())
+    assert session.stream_task is None
+    assert session.writer.lines[-1]['event'] == 'error'
+    assert 'ZeroDivisionError' in session.writer.lines[-1]['error']
+
+
+def test_finished_jobs_are_bounded(server, monkeypatch):
+    monkeypatch.setattr(control_server, 'FINISHED_LIMIT', 2)
+    for _ in range(5):
+        assert server.handle({'cmd': 'start', 'name': 'A', 'rate': 1000, 'count': 1}, None)['ok']
+        time.sleep(0.02)
+    for _ in range(4):
+        assert server.handle({'cmd': 'start', 'rate': 1000, 'count': 1}, None)['ok']
+        time.sleep(0.02)
+    server.handle({'cmd': 'start', 'name': 'live', 'rate': 100}, None)
+    assert list(server.jobs) == ['job3', 'job4', 'live']
+    assert server.scheduler.jobs == [server.jobs['live']]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import signal
+import time
+
+import pytest
+
+import display_supervisor
+from display_supervisor import DisplaySession, load_sessions
+from engine_process import MAX_POSITIONS
+
+
+def write_sessions(tmp_path, data):
+    path = tmp_path / 'sessions.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def wait_finished(session, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    events = []
+    while not session.finished and time.monotonic() < deadline:
+        event = session.poll(max_restarts=3)
+        if event:
+            events.append(event)
+        time.sleep(0.02)
+    return events
+
+
+def test_load_sessions_merges_defaults(tmp_path):
+    path = write_sessions(tmp_path, {'defaults': {'rate': 20, 'count': 5},
+                                     'sessions': [{'display': ':1'}, {'display': ':2', 'rate': 50}]})
+    assert load_sessions(path) == [{'rate': 20, 'count': 5, 'display': ':1'},
+                                   {'rate': 50, 'count': 5, 'display': ':2'}]
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'rate': 5}, 'display'),
+    ({'display': ':1', 'delay': 2}, 'delay'),
+    ({'display': ':1', 'action': {'type': 'hold', 'duration': 0.1}}, 'action'),
+    ({'display': ':1', 'rate': '5'}, 'rate'),
+])
+def test_unsupported_or_invalid_sessions_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        DisplaySession(spec)
+
+
+def test_main_exits_with_message_for_rejected_session(tmp_path):
+    path = write_sessions(tmp_path, [{'display': ':1', 'action': {'type': 'double'}}])
+    with pytest.raises(SystemExit, match='action'):
+        display_supervisor.main([path, '--dry-run'])
+
+
+def test_session_runs_to_count_in_dry_run():
+    session = DisplaySession({'display': ':99', 'rate': 200, 'count': 10}, dry_run=True)
+    session.launch()
+    try:
+        assert wait_finished(session) == ['finished']
+        assert session.stopped_by == 'count'
+        assert session.clicks == 10
+    finally:
+        session.stop()
+
+
+def test_crashed_engine_restarts_with_remaining_count():
+    session = DisplaySession({'display': ':99', 'rate': 50, 'count': 30}, dry_run=True)
+    session.launch()
+    try:
+        time.sleep(0.2)
+        before = session.clicks
+        assert 0 < before < 30
+        os.kill(session.engine.process.pid, signal.SIGKILL)
+        events = wait_finished(session)
+        assert any('重启' in e for e in events)
+        assert session.restarts == 1
+        assert session.stopped_by == 'count'
+        assert session.clicks == 30
+    finally:
+        session.stop()
+
+
+def test_session_with_more_positions_than_the_engine_holds_is_rejected():
+    positions = [[k, k] for k in range(MAX_POSITIONS + 1)]
+    with pytest.raises(ValueError, match='位置数量'):
+        DisplaySession({'display': ':1', 'positions': positions})
+
+
+def test_failed_launch_stops_sessions_already_started(tmp_path, monkeypatch):
+    """第二个会话启动失败时，第一个会话的引擎进程也被停止"""
+    path = write_sessions(tmp_path, [{'display': ':1', 'rate': 5}, {'display': ':2', 'rate': 5}])
+    launched, stopped = [], []
+
+    def launch(session):
+        if session.display == ':2':
+            raise RuntimeError('引擎进程已退出')
+        launched.append(session.display)
+
+    monkeypatch.setattr(DisplaySession, 'launch', launch)
+    monkeypatch.setattr(DisplaySession, 'stop', lambda session: stopped.append(session.display))
+    with pytest.raises(SystemExit, match=':2'):
+        display_supervisor.main([path, '--dry-run'])
+    assert launched == [':1']
+    assert stopped == [':1', ':2']
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from engine_process import MAX_POSITIONS, ControlBlock, EngineProcess
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = EngineProcess(dry_run=True)
+    engine.start()
+    yield engine
+    engine.close()
+
+
+def test_control_block_round_trip():
+    block = ControlBlock()
+    try:
+        block.write_job(50.0, 7, 1.5, [(1, 2), (3, 4, 'right')], 'middle', True, False)
+        job = block.read_job()
+        assert job['rate'] == 50.0 and job['count'] == 7 and job['duration'] == 1.5
+        assert job['positions'] == [(1, 2), (3, 4, 'right')]
+        assert job['button'] == 'middle' and job['double'] is True and job['cycle'] is False
+    finally:
+        block.close()
+        block.shm.unlink()
+
+
+def test_job_runs_to_count(engine):
+    metrics = engine.submit(rate=200, count=20)
+    assert engine.wait(5.0)
+    stats = engine.stats()
+    assert stats['stopped_by'] == 'count'
+    assert metrics.count == 20
+
+
+def test_stop_right_after_submit_is_never_lost(engine):
+    """stop() 紧跟 submit() 时任务被取消，DONE_SEQ 照常写入，之后的任务不受影响"""
+    for _ in range(5):
+        engine.submit(rate=100, count=50)
+        engine.stop()
+        assert engine.wait(5.0)
+        assert not engine.running
+        assert engine.stats()['stopped_by'] == 'stop'
+    engine.submit(rate=200, count=10)
+    assert engine.wait(5.0)
+    assert engine.stats()['stopped_by'] == 'count'
+
+
+def test_stop_while_running(engine):
+    engine.submit(rate=100, count=0)
+    time.sleep(0.1)
+    assert engine.running
+    engine.stop()
+    assert engine.wait(2.0)
+    assert engine.stats()['stopped_by'] == 'stop'
+    assert engine.metrics.count > 0
+
+
+def test_too_many_positions_are_rejected_not_truncated(engine):
+    positions = [(k, k) for k in range(MAX_POSITIONS + 1)]
+    with pytest.raises(ValueError):
+        engine.submit(rate=100, count=1, positions=positions)
+    assert not engine.running
+
+
+@pytest.mark.parametrize('params', [
+    {'rate': 0, 'count': 5},
+    {'rate': -10},
+    {'rate': float('nan')},
+    {'rate': 10, 'count': -1},
+    {'rate': 10, 'duration': 0},
+])
+def test_invalid_parameters_are_rejected(engine, params):
+    with pytest.raises(ValueError):
+        engine.submit(**params)
+    assert not engine.running
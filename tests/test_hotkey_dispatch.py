@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import hotkey_dispatch
+from hotkey_dispatch import MAC_KEYCODES, MAC_MOD_FLAGS, HotkeyDispatchTable
+
+CTRL = MAC_MOD_FLAGS['Ctrl']
+OPTION = MAC_MOD_FLAGS['Option']
+S, D = MAC_KEYCODES['S'], MAC_KEYCODES['D']
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(hotkey_dispatch.time, 'monotonic', clock)
+    return clock
+
+
+def make_table(debounce=0.3):
+    fired = []
+    table = HotkeyDispatchTable(debounce=debounce)
+    table.compile([(['Ctrl', 'Option'], 'S', lambda: fired.append('start')),
+                   (['Ctrl', 'Option'], 'D', lambda: fired.append('stop'))])
+    return table, fired
+
+
+def test_dispatch_matches_exact_modifiers():
+    table, fired = make_table()
+    assert table.dispatch(S, CTRL | OPTION)
+    assert not table.dispatch(S, CTRL)                  # 少一个修饰键
+    assert not table.dispatch(MAC_KEYCODES['A'], CTRL | OPTION)
+    assert fired == ['start']
+
+
+def test_unrelated_flag_bits_are_ignored():
+    table, fired = make_table()
+    fn_flag = 0x800000
+    assert table.dispatch(D, CTRL | OPTION | fn_flag)
+    assert fired == ['stop']
+
+
+def test_unknown_key_is_skipped_when_compiling():
+    table = HotkeyDispatchTable()
+    table.compile([(['Ctrl'], 'NOT_A_KEY', lambda: None)])
+    assert table.table == {}
+
+
+def test_autorepeat_fires_once_per_physical_press(clock):
+    table, fired = make_table(debounce=0)
+    assert table.press(S, CTRL | OPTION)
+    clock.now += 1.0
+    assert not table.press(S, CTRL | OPTION)            # 仍按住：系统的自动重复
+    assert not table.press(S, CTRL | OPTION, autorepeat=True)
+    table.release(S)
+    clock.now += 1.0
+    assert table.press(S, CTRL | OPTION)
+    assert fired == ['start', 'start']
+
+
+def test_debounce_drops_presses_within_window(clock):
+    table, fired = make_table(debounce=0.3)
+    assert table.press(S, CTRL | OPTION)
+    table.release(S)
+    clock.now += 0.1
+    assert not table.press(S, CTRL | OPTION)
+    table.release(S)
+    clock.now += 0.3
+    assert table.press(S, CTRL | OPTION)
+    assert fired == ['start', 'start']
+
+
+def test_debounce_is_per_binding(clock):
+    table, fired = make_table(debounce=0.3)
+    assert table.press(S, CTRL | OPTION)
+    assert table.press(D, CTRL | OPTION)
+    assert fired == ['start', 'stop']
+
+
+def test_profile_overrides_base_and_switches_atomically():
+    table, fired = make_table()
+    table.set_profiles({
+        'game': [(['Ctrl', 'Option'], 'S', lambda: fired.append('game-start'))],
+        'office': [(['Ctrl'], 'D', lambda: fired.append('office-stop'))],
+    }, active='game')
+    before = table.table
+    table.dispatch(S, CTRL | OPTION)
+    assert table.activate_profile('office')
+    assert table.table is not before                    # 整表替换，不修改旧表
+    table.dispatch(S, CTRL | OPTION)
+    table.dispatch(D, CTRL)
+    assert fired == ['game-start', 'start', 'office-stop']
+
+
+def test_activate_unknown_profile_keeps_current():
+    table, _ = make_table()
+    table.set_profiles({'game': []}, active='game')
+    assert not table.activate_profile('missing')
+    assert table.active_profile == 'game'
+    assert table.activate_profile(None)
+    assert table.active_profile is None
+
+
+def test_set_profiles_drops_vanished_active_profile():
+    table, _ = make_table()
+    table.set_profiles({'game': []}, active='game')
+    table.set_profiles({'office': []})
+    assert table.active_profile is None
+    assert sorted(table.profile_names) == ['office']
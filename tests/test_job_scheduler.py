@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+from click_engine import NullMouse
+from job_scheduler import ClickJob, JobScheduler, job_from_spec, profile_positions
+
+
+def summaries(scheduler):
+    return {s['name']: s for s in scheduler.run()}
+
+
+def test_independent_jobs_run_to_their_counts(mouse):
+    scheduler = JobScheduler(mouse=mouse)
+    scheduler.submit(ClickJob(name='A', rate=500, count=5, button='left'))
+    scheduler.submit(ClickJob(name='B', rate=400, count=3, button='right', double=True))
+    result = summaries(scheduler)
+    assert result['A']['stopped_by'] == result['B']['stopped_by'] == 'count'
+    assert mouse.ops('click').count(('click', 'left', 1)) == 5
+    assert mouse.ops('click').count(('click', 'right', 2)) == 3
+
+
+def test_positions_cycle_and_single_pass(mouse):
+    scheduler = JobScheduler(mouse=mouse)
+    scheduler.submit(ClickJob(name='once', rate=500, positions=[(1, 1), (2, 2), (3, 3, 'middle')],
+                              cycle=False))
+    assert summaries(scheduler)['once']['clicks'] == 3
+    assert mouse.ops('move') == [('move', 1, 1), ('move', 2, 2), ('move', 3, 3)]
+    assert mouse.ops('click')[-1] == ('click', 'middle', 1)
+
+
+def test_duration_and_delay(mouse):
+    scheduler = JobScheduler(mouse=mouse)
+    job = scheduler.submit(ClickJob(name='A', rate=100, duration=0.1, delay=0.05))
+    started = time.perf_counter()
+    result = summaries(scheduler)['A']
+    assert result['stopped_by'] == 'duration'
+    assert 8 <= result['clicks'] <= 12
+    assert job.timestamps[0] - started >= 0.04
+
+
+def test_cancel_and_close_stop_jobs(mouse):
+    scheduler = JobScheduler(mouse=mouse).start()
+    a = scheduler.submit(ClickJob(name='A', rate=200))
+    b = scheduler.submit(ClickJob(name='B', rate=200))
+    time.sleep(0.05)
+    scheduler.cancel(a)
+    time.sleep(0.05)
+    assert a.summary['stopped_by'] == 'stop'
+    assert not b.finished
+    scheduler.close(1.0)
+    assert b.summary['stopped_by'] == 'stop'
+
+
+def test_reconfigure_rate_reanchors_timeline(mouse):
+    scheduler = JobScheduler(mouse=mouse).start()
+    job = scheduler.submit(ClickJob(name='A', rate=20))
+    time.sleep(0.12)
+    scheduler.reconfigure(job, rate=200.0, positions=[(7, 8)])
+    time.sleep(0.1)
+    scheduler.close(1.0)
+    assert job.interval == 1 / 200
+    assert ('move', 7, 8) in mouse.calls
+    assert job.summary['clicks'] > 15
+
+
+def test_failing_job_is_isolated(mouse):
+    """一个任务出错只结束该任务，其他任务继续调度"""
+    scheduler = JobScheduler(mouse=mouse)
+
+    def boom(i, position):
+        if i == 2:
+            raise RuntimeError('callback failed')
+    scheduler.submit(ClickJob(name='bad', rate=500, count=10, on_click=boom))
+    scheduler.submit(ClickJob(name='broken', rate=500, count=10, positions=[(1,)]))
+    scheduler.submit(ClickJob(name='good', rate=500, count=10))
+    result = summaries(scheduler)
+    assert result['bad']['stopped_by'] == 'error'
+    assert result['bad']['error'] == 'RuntimeError: callback failed'
+    assert result['bad']['clicks'] == 3
+    assert result['broken']['stopped_by'] == 'error'
+    assert result['broken']['error'].startswith('IndexError')
+    assert result['good']['stopped_by'] == 'count' and result['good']['clicks'] == 10
+
+
+def test_failing_on_finished_does_not_stop_scheduler(mouse):
+    scheduler = JobScheduler(mouse=mouse)
+    done = threading.Event()
+
+    def bad_callback(job, summary):
+        raise ValueError('nope')
+    scheduler.submit(ClickJob(name='A', rate=500, count=2, on_finished=bad_callback))
+    scheduler.submit(ClickJob(name='B', rate=500, count=4, on_finished=lambda j, s: done.set()))
+    result = summaries(scheduler)
+    assert done.is_set()
+    assert result['A']['clicks'] == 2 and result['B']['clicks'] == 4
+
+
+DEFAULTS = {'frequency': 10.0, 'max_clicks': 0, 'button': 'left', 'click_type': 'single'}
+
+
+def spec_error(spec):
+    try:
+        job_from_spec(spec, DEFAULTS)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError(f"job_from_spec 接受了无效的任务: {spec}")
+
+
+def test_job_from_spec_defaults_and_coercion():
+    job = job_from_spec({'positions': [[1, 2], [3.0, 4, 'right']], 'count': 5.0, 'duration': 2}, DEFAULTS)
+    assert job.name == 'job' and job.rate == 10.0
+    assert job.positions == [(1, 2), (3, 4, 'right')]
+    assert job.count == 5 and isinstance(job.count, int)
+    assert job.duration == 2.0
+
+
+def test_job_from_spec_rejects_malformed_input():
+    assert '位置' in spec_error({'positions': [[100]]})
+    assert '位置' in spec_error({'positions': [[1, 'a']]})
+    assert '位置' in spec_error({'positions': [[1, 2.5]]})
+    assert '按键' in spec_error({'positions': [[1, 2, 'thumb']]})
+    assert 'positions' in spec_error({'positions': 'x'})
+    assert 'rate' in spec_error({'rate': '80'})
+    assert 'rate' in spec_error({'rate': 0})
+    assert 'rate' in spec_error({'rate': float('nan')})
+    assert 'count' in spec_error({'count': -1})
+    assert 'count' in spec_error({'count': 1.5})
+    assert 'duration' in spec_error({'duration': 0})
+    assert 'delay' in spec_error({'delay': -1})
+    assert 'double' in spec_error({'double': 'yes'})
+    assert 'cycle' in spec_error({'cycle': 1})
+    assert '按键' in spec_error({'button': 'thumb'})
+    with pytest.raises(ValueError):
+        job_from_spec(['not', 'a', 'dict'], DEFAULTS)
+
+
+def test_reconfigure_validates_in_caller_thread():
+    scheduler = JobScheduler(mouse=NullMouse())
+    job = ClickJob(name='A')
+    for changes in ({'rate': '80'}, {'rate': -1}, {'positions': [[100]]}, {'button': 'thumb'},
+                    {'double': 'no'}, {'count': 5}, {'action': {'type': 'hold', 'duration': 'x'}}):
+        with pytest.raises(ValueError):
+            scheduler.reconfigure(job, **changes)
+    assert scheduler._updates.empty()
+
+
+def test_profile_labels_become_click_positions(tmp_path, monkeypatch):
+    import profile_library
+    library = profile_library.ProfileLibrary(str(tmp_path))
+    library.save('任务1', [[10, 20, '登录按钮'], [30, 40, 'right']], cycle_mode=False)
+    monkeypatch.setattr(profile_library, 'ProfileLibrary', lambda: library)
+    assert profile_positions('任务1') == ([(10, 20), (30, 40, 'right')], False)
+    job = job_from_spec({'profile': '任务1'}, DEFAULTS)
+    assert job.positions == [(10, 20), (30, 40, 'right')] and job.cycle is False
+    with pytest.raises(ValueError):
+        profile_positions('missing')
+
+
+def test_background_scheduler_forgets_finished_jobs(mouse):
+    """后台运行时结束的任务不再留在 jobs 中，run() 仍返回全部任务的统计"""
+    scheduler = JobScheduler(mouse=mouse).start()
+    try:
+        done = scheduler.submit(ClickJob(name='A', rate=500, count=3))
+        running = scheduler.submit(ClickJob(name='B', rate=100))
+        time.sleep(0.05)
+        assert done.summary['stopped_by'] == 'count'
+        assert scheduler.jobs == [running]
+    finally:
+        scheduler.close(1.0)
+
+    foreground = JobScheduler(mouse=mouse)
+    foreground.submit(ClickJob(name='C', rate=500, count=2))
+    assert [s['name'] for s in foreground.run()] == ['C']
+    assert len(foreground.jobs) == 1
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from array import array
+
+import pytest
+
+from click_engine import ClickEngine
+from macro import MacroError, compile_macro, execute, parse_color, parse_duration_us
+
+
+def run(text, mouse, **kwargs):
+    kill_switch = kwargs.pop('kill_switch', None) or threading.Event()
+    timestamps = array('d')
+    started = time.perf_counter()
+    stopped_by, steps = execute(compile_macro(text), mouse, kill_switch, timestamps, **kwargs)
+    return stopped_by, steps, time.perf_counter() - started, timestamps
+
+
+@pytest.mark.parametrize('text, us', [('500ms', 500000), ('1.5s', 1500000), ('200us', 200), ('250', 250000)])
+def test_parse_duration(text, us):
+    assert parse_duration_us(text) == us
+
+
+def test_parse_color():
+    assert parse_color('#FF0000') == parse_color('0xff0000') == parse_color('ff0000') == 0xFF0000
+    with pytest.raises(MacroError):
+        parse_color('#fff')
+
+
+@pytest.mark.parametrize('text, line', [
+    ('click\nfrobnicate', 2),
+    ('move 1', 1),
+    ('click 0', 1),
+    ('wait -5ms', 1),
+    ('loop 3\n  click', 1),
+    ('click\nend', 2),
+    ('call missing', 1),
+    ('loop 0\n  click\nend', 1),
+    ('loop -2\n  click\nend', 1),
+    ('loop x\n  click\nend', 1),
+])
+def test_compile_errors_carry_line_numbers(text, line):
+    with pytest.raises(MacroError) as info:
+        compile_macro(text)
+    assert info.value.line == line
+
+
+def test_recursion_is_rejected():
+    with pytest.raises(MacroError, match='递归'):
+        compile_macro('call a\ndef a\n  call b\nend\ndef b\n  call a\nend')
+
+
+def test_clicks_moves_and_nested_loops(mouse):
+    text = '''
+    # 注释
+    move 10 20
+    loop 2
+      loop 3
+        click right     // 行尾注释
+      end
+      call twice
+    end
+    def twice
+      click middle 2
+    end
+    '''
+    stopped_by, _, _, timestamps = run(text, mouse)
+    assert stopped_by == 'end'
+    assert mouse.calls[0] == ('move', 10, 20)
+    assert mouse.ops('click') == ([('click', 'right', 1)] * 3 + [('click', 'middle', 2)]) * 2
+    assert len(timestamps) == 8
+
+
+def test_waits_accumulate_on_one_timeline(mouse):
+    stopped_by, _, elapsed, timestamps = run('loop 5\n  click\n  wait 20ms\nend', mouse)
+    assert stopped_by == 'end'
+    assert len(timestamps) == 5
+    assert timestamps[-1] - timestamps[0] == pytest.approx(0.08, abs=0.015)
+    assert elapsed == pytest.approx(0.1, abs=0.02)      # 最后一个 wait 也会等完
+
+
+def test_trailing_wait_before_halt_is_honoured(mouse):
+    stopped_by, _, elapsed, _ = run('click\nwait 150ms', mouse)
+    assert stopped_by == 'end'
+    assert elapsed >= 0.145
+
+
+def test_wait_only_loop_respects_duration_without_spinning(mouse):
+    """没有鼠标动作的无限循环：按时间线等待，并在 duration 到达时停止"""
+    watchdog = threading.Event()
+    timer = threading.Timer(2.0, watchdog.set)      # 回归时以 'stop' 失败而不是卡住
+    timer.start()
+    stopped_by, steps, elapsed, _ = run('loop\n  wait 10ms\nend', mouse, duration=0.2, kill_switch=watchdog)
+    timer.cancel()
+    assert stopped_by == 'duration'
+    assert elapsed == pytest.approx(0.2, abs=0.03)
+    assert steps < 100
+
+
+def test_kill_switch_stops_infinite_loop(mouse):
+    kill_switch = threading.Event()
+    threading.Timer(0.1, kill_switch.set).start()
+    stopped_by, _, elapsed, _ = run('loop\n  wait 5ms\nend', mouse, kill_switch=kill_switch)
+    assert stopped_by == 'stop'
+    assert elapsed < 0.5
+
+
+def test_count_and_duration_limits(mouse):
+    assert run('loop\n  click\n  wait 1ms\nend', mouse, count=7)[0] == 'count'
+    assert len(mouse.ops('click')) == 7
+    stopped_by, _, elapsed, timestamps = run('loop\n  click\n  wait 10ms\nend', mouse, duration=0.1)
+    assert stopped_by == 'duration'
+    assert 9 <= len(timestamps) <= 11
+
+
+def test_repeat_until_pixel_stops_on_colour_and_timeout(mouse):
+    samples = []
+
+    def reader(x, y):
+        samples.append((x, y))
+        return 0xFF0000 if len(samples) >= 3 else 0x000000
+    program = 'repeat until pixel 5 6 #fe0101 tolerance 2\n  click\n  wait 5ms\nend\nclick right'
+    assert run(program, mouse, pixel_reader=reader)[0] == 'end'
+    assert samples == [(5, 6)] * 3
+    assert mouse.ops('click') == [('click', 'left', 1)] * 2 + [('click', 'right', 1)]
+
+    stopped_by, _, elapsed, _ = run('repeat until pixel 0 0 #ffffff timeout 50ms\n  wait 10ms\nend',
+                                    mouse, pixel_reader=lambda x, y: 0)
+    assert stopped_by == 'end'
+    assert elapsed == pytest.approx(0.05, abs=0.03)
+
+
+def test_hold_drag_and_chord_statements(mouse):
+    run('hold right 20ms\ndrag 0 0 10 0 10ms\nchord left+middle 5ms', mouse)
+    presses = mouse.ops('press', 'release')
+    assert presses[:2] == [('press', 'right'), ('release', 'right')]
+    assert presses[2:4] == [('press', 'left'), ('release', 'left')]
+    assert presses[4:] == [('press', 'left'), ('press', 'middle'), ('release', 'middle'), ('release', 'left')]
+    moves = mouse.ops('move')
+    assert moves[0] == ('move', 0, 0) and moves[-1] == ('move', 10, 0)
+
+
+def test_click_engine_runs_program(mouse):
+    engine = ClickEngine(program=compile_macro('loop\n  click\n  wait 2ms\nend'), count=5, mouse=mouse)
+    summary = engine.run()
+    assert summary['stopped_by'] == 'count' and summary['clicks'] == 5
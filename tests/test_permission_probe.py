@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import permission_probe
+from permission_probe import PermissionCache
+
+
+class Probe:
+    def __init__(self, *results, gate=None):
+        self.results = list(results)
+        self.calls = 0
+        self.gate = gate
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(1.0)
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+def test_fresh_result_is_served_from_cache():
+    probe = Probe(True)
+    cache = PermissionCache(probe, ttl=60)
+    assert cache.check() and cache.check() and cache.check()
+    assert probe.calls == 1 and cache.fresh
+
+
+def test_expired_grant_returns_old_result_and_refreshes_in_background():
+    gate = threading.Event()
+    probe = Probe(True, False, gate=gate)
+    gate.set()
+    cache = PermissionCache(probe, ttl=0)
+    assert cache.check()
+    gate.clear()
+    assert cache.check()                  # 过期：先返回旧结果，不阻塞
+    gate.set()
+    cache._thread.join(1.0)
+    assert probe.calls == 2
+    assert not cache.check()              # 后台探测结果为无权限后同步重新探测
+    assert probe.calls == 3
+
+
+def test_denied_result_is_rechecked_every_time():
+    probe = Probe(False, False, True)
+    cache = PermissionCache(probe, ttl=60)
+    assert not cache.check()
+    assert not cache.check()
+    assert cache.check()                  # 用户刚授权，下一次立即生效
+    assert probe.calls == 3
+
+
+def test_check_waits_for_running_prefetch():
+    gate = threading.Event()
+    probe = Probe(True, gate=gate)
+    cache = PermissionCache(probe, ttl=60)
+    cache.refresh_async()
+    assert cache.refresh_async() is cache._thread         # 不重复启动
+    threading.Timer(0.05, gate.set).start()
+    assert cache.check()
+    assert probe.calls == 1
+
+
+def test_invalidate_forces_new_probe():
+    probe = Probe(True)
+    cache = PermissionCache(probe, ttl=60)
+    cache.check()
+    cache.invalidate()
+    cache.check()
+    assert probe.calls == 2
+
+
+@pytest.mark.parametrize('has_xtest', [True, False])
+def test_x11_probe_checks_xtest_without_moving_pointer(monkeypatch, has_xtest):
+    pytest.importorskip('Xlib')
+    closed = []
+    fake = SimpleNamespace(has_extension=lambda name: has_xtest and name == 'XTEST',
+                           close=lambda: closed.append(True))
+    import Xlib.display
+    monkeypatch.setattr(Xlib.display, 'Display', lambda name=None: fake)
+    assert permission_probe.probe_x11_xtest() is has_xtest
+    assert closed == [True]
+
+
+def test_x11_probe_without_server(monkeypatch):
+    pytest.importorskip('Xlib')
+    import Xlib.display
+
+    def no_server(name=None):
+        raise OSError('no display')
+    monkeypatch.setattr(Xlib.display, 'Display', no_server)
+    assert permission_probe.probe_x11_xtest() is False
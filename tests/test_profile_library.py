@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+from profile_library import ProfileLibrary
+
+
+def test_save_and_load_round_trip(tmp_path):
+    library = ProfileLibrary(str(tmp_path))
+    library.save('登录', [[10, 20, '按钮'], {'x': 30, 'y': 40, 'name': '确定'}], cycle_mode=False)
+    assert library.names() == ['登录']
+    assert library.info('登录')['count'] == 2
+
+    reopened = ProfileLibrary(str(tmp_path))
+    assert reopened.load('登录') == {'positions': [(10, 20, '按钮'), (30, 40, '确定')], 'cycle_mode': False}
+    assert reopened.active_name == '登录'
+
+
+def test_index_only_until_profile_is_loaded(tmp_path, monkeypatch):
+    ProfileLibrary(str(tmp_path)).save('甲', [[1, 2, 'a']])
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+    monkeypatch.setattr('builtins.open', tracking_open)
+    library = ProfileLibrary(str(tmp_path))
+    library.names()
+    assert opened == ['index.json']
+    library.load('甲')
+    assert len(opened) == 2
+
+
+def test_loading_another_profile_releases_the_previous(tmp_path):
+    library = ProfileLibrary(str(tmp_path))
+    library.save('甲', [[1, 2, 'a']])
+    library.save('乙', [[3, 4, 'b']])
+    first = library.load('甲')
+    assert library.load('甲') is first               # 当前方案直接复用
+    library.load('乙')
+    assert library.active_name == '乙'
+    assert library.load('甲') is not first
+
+
+def test_delete_removes_index_entry_and_file(tmp_path):
+    library = ProfileLibrary(str(tmp_path))
+    library.save('甲', [[1, 2, 'a']])
+    data_file = library.info('甲')['file']
+    assert library.delete('甲')
+    assert not library.delete('甲')
+    assert library.load('甲') is None
+    assert not os.path.exists(os.path.join(str(tmp_path), data_file))
+    assert ProfileLibrary(str(tmp_path)).names() == []
+
+
+def test_missing_data_file_and_broken_index(tmp_path):
+    library = ProfileLibrary(str(tmp_path))
+    library.save('甲', [[1, 2, 'a']])
+    os.remove(os.path.join(str(tmp_path), library.info('甲')['file']))
+    assert ProfileLibrary(str(tmp_path)).load('甲') is None
+
+    (tmp_path / 'index.json').write_text('{broken', encoding='utf-8')
+    assert ProfileLibrary(str(tmp_path)).names() == []
+
+
+def test_import_legacy_multi_config(tmp_path):
+    legacy = tmp_path / '.auto_clicker_multi_config.json'
+    legacy.write_text(json.dumps({'positions': [{'x': 5, 'y': 6, 'name': 'p'}], 'cycle_mode': True}),
+                      encoding='utf-8')
+    library = ProfileLibrary(str(tmp_path / 'profiles'))
+    name = library.import_file(str(legacy))
+    assert name == 'auto_clicker_multi_config'
+    assert library.load(name)['positions'] == [(5, 6, 'p')]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import json
+import random
+import threading
+from array import array
+
+import macro
+from macro import compile_macro, execute, recording_to_macro
+
+
+def click(t, x, y, button='Button.left'):
+    return {'type': 'click', 'timestamp': t, 'x': x, 'y': y, 'button': button}
+
+
+def replay(text, mouse):
+    """执行宏，返回每次点击时的 (x, y, 按键)"""
+    execute(compile_macro(text), mouse, threading.Event(), array('d'))
+    position, clicks = None, []
+    for call in mouse.calls:
+        if call[0] == 'move':
+            position = call[1:]
+        elif call[0] == 'click':
+            clicks.append(position + (call[1],))
+    return clicks
+
+
+def expected(events):
+    return [(e['x'], e['y'], macro.click_engine.recorded_button(e['button']))
+            for e in events if e['type'] == 'click']
+
+
+def test_replay_matches_recording(mouse):
+    rng = random.Random(7)
+    spots = [(10, 10, 'Button.left'), (20, 5, 'Button.right'), (30, 40, 'Button.middle')]
+    events, t = [], 100.0
+    for _ in range(120):
+        # 有重复段也有随机段；间隔远小于量化粒度，回放不需要真实等待
+        pattern = spots[:2] if rng.random() < 0.6 else [rng.choice(spots)]
+        for x, y, button in pattern:
+            t += 0.001
+            events.append(click(t, x, y, button))
+        if rng.random() < 0.1:
+            events.append({'type': 'key_press', 'timestamp': t, 'key': 'a'})
+    text = recording_to_macro(events)
+    assert replay(text, mouse) == expected(events)
+    unrolled = recording_to_macro(events, max_period=0)
+    assert replay(unrolled, mouse.__class__()) == expected(events)
+    assert len(text.splitlines()) < len(unrolled.splitlines()) * 0.8
+
+
+def test_repeated_clicks_collapse_into_loop():
+    events = [click(i * 0.05, 100, 200) for i in range(50)]
+    lines = recording_to_macro(events).splitlines()
+    assert lines[1:] == ['move 100 200', 'click', 'loop 49', '  wait 50ms', '  click', 'end']
+
+
+def test_repeated_sequence_keeps_moves_inside_loop(mouse):
+    events = []
+    for i in range(10):
+        events.append(click(i * 0.002, 1, 1))
+        events.append(click(i * 0.002 + 0.001, 2, 2, 'Button.right'))
+    text = recording_to_macro(events)
+    assert 'loop' in text
+    assert replay(text, mouse) == expected(events)
+
+
+def test_idle_gaps_are_shortened_and_intervals_quantized():
+    events = [click(0.0, 1, 1), click(0.034, 2, 2), click(5.034, 3, 3)]
+    text = recording_to_macro(events, idle_threshold=1.0, idle_wait=0.25, quantum=0.01)
+    assert 'wait 30ms' in text
+    assert 'wait 250ms' in text
+    assert '1 段空闲已缩短' in text.splitlines()[0]
+    compile_macro(text)
+
+
+def test_empty_recording_compiles():
+    text = recording_to_macro([{'type': 'key_press', 'timestamp': 1.0, 'key': 'a'}])
+    assert compile_macro(text).code[0] == macro.OP_HALT
+
+
+def test_cli_writes_macro_file(tmp_path, capsys):
+    recording = tmp_path / 'rec.json'
+    recording.write_text(json.dumps({'events': [click(i * 0.1, 5, 5) for i in range(4)]}), encoding='utf-8')
+    output = tmp_path / 'out.macro'
+    macro.main([str(recording), '-o', str(output)])
+    text = output.read_text(encoding='utf-8')
+    assert 'loop' in text
+    compile_macro(text)
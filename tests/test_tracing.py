@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+import pytest
+
+import tracing
+from tracing import Tracer
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    tracer = Tracer(capacity=64)
+    monkeypatch.setattr(tracing, 'tracer', tracer)
+    monkeypatch.setattr(tracing, 'enabled', True)
+    return tracer
+
+
+def test_disabled_tracing_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(tracing, 'enabled', False)
+
+    def func(a):
+        return a
+    assert tracing.traced()(func) is func
+    assert tracing.span('x') is tracing._NULL_SPAN
+    tracing.instant('x')
+    tracing.complete('x', 0, 1)
+
+
+def test_span_instant_and_complete_are_recorded(enabled):
+    with tracing.span('work', 7):
+        pass
+    tracing.instant('hotkey')
+    tracing.complete('click', 1000, 4000, 3)
+    events = list(enabled.events())
+    assert [e[0] for e in events] == ['work', 'hotkey', 'click']
+    assert events[0][4] == 'X' and events[0][5] == 7 and events[0][2] >= 0
+    assert events[1][4] == 'i'
+    assert events[2][1:3] == (1000, 3000)
+
+
+def test_traced_wrapper_truncates_extra_positional_args(enabled):
+    calls = []
+
+    @tracing.traced('slot')
+    def slot(self_like):
+        calls.append(self_like)
+    slot('a', True)                        # PyQt 会多传 checked 参数
+    assert calls == ['a']
+    assert [e[0] for e in enabled.events()] == ['slot']
+
+
+def test_ring_buffer_overwrites_oldest():
+    tracer = Tracer(capacity=4)
+    for i in range(10):
+        tracer.record(f'e{i}', i)
+    assert [e[0] for e in tracer.events()] == ['e6', 'e7', 'e8', 'e9']
+
+
+def test_concurrent_records_are_not_lost():
+    tracer = Tracer(capacity=10000)
+
+    def writer():
+        for i in range(1000):
+            tracer.record('w', i)
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(list(tracer.events())) == 4000
+
+
+def test_export_chrome_trace(tmp_path):
+    tracer = Tracer(capacity=16)
+    tracer.record('span', 2000, 1000, tracing.PHASE_COMPLETE, 5)
+    tracer.record('tick', 3000, 0, tracing.PHASE_INSTANT)
+    path = tmp_path / 'trace.json'
+    assert tracer.export_chrome(str(path)) == 3           # 两条记录 + 线程名
+    data = json.loads(path.read_text(encoding='utf-8'))
+    span, tick, meta = data['traceEvents']
+    assert span == {'name': 'span', 'ph': 'X', 'ts': 2.0, 'dur': 1.0, 'pid': span['pid'],
+                    'tid': span['tid'], 'args': {'value': 5}}
+    assert tick['ph'] == 'i' and tick['s'] == 't'
+    assert meta['ph'] == 'M' and meta['args']['name'] == threading.current_thread().name
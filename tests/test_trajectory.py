@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import math
+import random
+import threading
+
+import pytest
+
+import trajectory
+from trajectory import fitts_duration, plan, plan_cycle, stream
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(trajectory, '_numpy', lambda: None)
+    return request.param
+
+
+def test_fitts_duration_grows_with_distance():
+    assert fitts_duration(0) == pytest.approx(0.08)
+    assert fitts_duration(100) < fitts_duration(1000)
+
+
+def test_path_ends_exactly_on_target(backend):
+    path = plan((0, 0), (400, 300), rate=240, rng=random.Random(1))
+    assert path.end == (400, 300)
+    assert len(path) == round(fitts_duration(500) * 240)
+    assert (path.xy is not None) == (backend == 'numpy')
+    assert all(isinstance(v, int) for point in path.points for v in point)
+
+
+def test_path_stays_near_the_segment_and_moves_forward(backend):
+    path = plan((0, 0), (1000, 0), rate=240, curvature=0.05, tremor=0.5, rng=random.Random(3))
+    xs = [x for x, _ in path.points]
+    assert max(abs(y) for _, y in path.points) < 200
+    assert xs[len(xs) // 4] < xs[len(xs) // 2] < xs[3 * len(xs) // 4]
+    # 最小加加速度曲线：两端慢、中间快
+    steps = [b - a for a, b in zip(xs, xs[1:])]
+    assert max(steps[:3]) < max(steps) and max(steps[-3:]) < max(steps)
+
+
+def test_seeded_plans_are_reproducible(backend):
+    a = plan((5, 5), (300, 80), rng=random.Random(42))
+    b = plan((5, 5), (300, 80), rng=random.Random(42))
+    c = plan((5, 5), (300, 80), rng=random.Random(43))
+    assert a.points == b.points
+    assert a.points != c.points
+
+
+def test_numpy_and_python_use_the_same_curve(monkeypatch):
+    pytest.importorskip('numpy')
+    fast = plan((0, 0), (600, 200), tremor=0, rng=random.Random(5))
+    monkeypatch.setattr(trajectory, '_numpy', lambda: None)
+    slow = plan((0, 0), (600, 200), tremor=0, rng=random.Random(5))
+    assert len(fast) == len(slow)
+    assert max(math.dist(p, q) for p, q in zip(fast.points, slow.points)) <= 1.5
+
+
+def test_short_and_capped_moves(backend):
+    assert plan((10, 10), (10, 10)).points == [(10, 10)]
+    capped = plan((0, 0), (2000, 0), rate=200, max_duration=0.05)
+    assert len(capped) == 10 and capped.duration == pytest.approx(0.05)
+
+
+def test_plan_cycle_legs_connect_positions(backend):
+    positions = [(0, 0), (100, 50), (300, 20)]
+    legs = plan_cycle(positions, max_duration=0.05, variants=3, seed=1)
+    assert len(legs) == 3
+    for i, variants in enumerate(legs):
+        assert len(variants) == 3
+        assert all(path.end == positions[i] for path in variants)
+        assert all(path.duration <= 0.05 + 1e-9 for path in variants)
+
+
+def test_stream_moves_along_path_and_stops(mouse):
+    path = plan((0, 0), (200, 0), rate=500, max_duration=0.04, rng=random.Random(2))
+    assert stream(mouse, path, threading.Event())
+    assert [c[1:] for c in mouse.ops('move')] == path.points
+
+    stopped = threading.Event()
+    stopped.set()
+    assert not stream(mouse, plan((0, 0), (200, 0), rate=100, max_duration=0.5), stopped)
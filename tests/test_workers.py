@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""所有连点工作线程（含各界面版本）在假鼠标后端上的行为"""
+import time
+
+import pytest
+
+import bench_workers
+from bench_workers import WORKERS, FakeMouse, run_worker
+
+pytest.importorskip('PyQt5')
+
+
+@pytest.mark.parametrize('name', sorted(WORKERS))
+def test_worker_reaches_count(name):
+    mouse = FakeMouse()
+    worker = WORKERS[name][1](200, 20, mouse)
+    thread, _ = run_worker(worker)
+    thread.join(5.0)
+    assert not thread.is_alive()
+    assert len(mouse.timestamps) == 20
+
+
+# 这两个旧工作线程用 time.sleep 等待间隔，stop() 要等当前间隔结束才生效
+SLEEPING_WORKERS = {'auto_clicker', 'native'}
+
+
+@pytest.mark.parametrize('name', [
+    pytest.param(name, marks=pytest.mark.xfail(strict=True, reason='按间隔 sleep，停止不会唤醒等待'))
+    if name in SLEEPING_WORKERS else name
+    for name in sorted(WORKERS)])
+def test_worker_stops_promptly(name):
+    mouse = FakeMouse()
+    worker = WORKERS[name][1](2, 10 ** 9, mouse)          # 间隔 500ms：停止必须唤醒等待
+    thread, _ = run_worker(worker)
+    deadline = time.monotonic() + 2.0
+    while not mouse.timestamps and time.monotonic() < deadline:
+        time.sleep(0.005)
+    started = time.perf_counter()
+    worker.stop()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert time.perf_counter() - started < 0.1
+
+
+def test_throughput_measurement_matches_target():
+    summary = bench_workers.measure_throughput(WORKERS['engine'][1], 200, 0.2)
+    assert summary['clicks'] == 40
+    assert summary['achieved_rate'] == pytest.approx(200, rel=0.1)
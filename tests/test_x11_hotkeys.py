@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""X11 热键后端：用假的 Display 驱动监听线程（不需要 X 服务器）"""
+import collections
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import x11_hotkeys
+from x11_hotkeys import X11_MOD_FLAGS, X11HotkeyManager
+
+KEY_PRESS, KEY_RELEASE = 2, 3
+
+
+class FakeRoot:
+    def __init__(self):
+        self.grabbed = set()
+
+    def grab_key(self, keycode, modmask, owner_events, pointer_mode, keyboard_mode):
+        self.grabbed.add((keycode, modmask))
+
+    def ungrab_key(self, keycode, modmask):
+        self.grabbed.discard((keycode, modmask))
+
+
+class FakeDisplay:
+    """事件队列 + 管道：有事件时 fileno() 可读，与真实连接的行为一致"""
+
+    def __init__(self, name=None):
+        self.root = FakeRoot()
+        self.events = collections.deque()
+        self._read, self._write = os.pipe()
+        self.closed = False
+
+    def screen(self):
+        return SimpleNamespace(root=self.root)
+
+    def keysym_to_keycode(self, keysym):
+        return keysym
+
+    def sync(self):
+        pass
+
+    def fileno(self):
+        return self._read
+
+    def pending_events(self):
+        return len(self.events)
+
+    def next_event(self):
+        os.read(self._read, 1)
+        return self.events.popleft()
+
+    def push(self, kind, keycode, state=0, when=0):
+        self.events.append(SimpleNamespace(type=kind, detail=keycode, state=state, time=when))
+        os.write(self._write, b'\0')
+
+    def close(self):
+        self.closed = True
+        os.close(self._read)
+        os.close(self._write)
+
+
+@pytest.fixture
+def fake_x(monkeypatch):
+    displays = []
+
+    def make_display(name=None):
+        displays.append(FakeDisplay(name))
+        return displays[-1]
+    monkeypatch.setattr(x11_hotkeys, 'X11_HOTKEY_AVAILABLE', True)
+    monkeypatch.setattr(x11_hotkeys, 'X', SimpleNamespace(KeyPress=KEY_PRESS, KeyRelease=KEY_RELEASE,
+                                                           GrabModeAsync=1))
+    monkeypatch.setattr(x11_hotkeys, 'XK', SimpleNamespace(string_to_keysym=lambda name: ord(name[0])))
+    monkeypatch.setattr(x11_hotkeys, 'xdisplay', SimpleNamespace(Display=make_display))
+    return displays
+
+
+def wait_until(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_loop_blocks_without_timeout(fake_x, monkeypatch):
+    calls = []
+    real_select = x11_hotkeys.select.select
+
+    def recording_select(*args):
+        calls.append(args)
+        return real_select(*args)
+    monkeypatch.setattr(x11_hotkeys.select, 'select', recording_select)
+    manager = X11HotkeyManager()
+    manager.set_bindings([(['Ctrl'], 'S', lambda: None)])
+    assert manager.start_monitoring()
+    time.sleep(0.3)
+    manager.stop_monitoring()
+    assert calls and all(len(args) == 3 for args in calls)     # 不传超时
+    assert len(calls) <= 3                                      # 空闲时不轮询
+
+
+def test_stop_wakes_loop_and_closes_pipe(fake_x):
+    manager = X11HotkeyManager()
+    manager.set_bindings([(['Ctrl'], 'S', lambda: None)])
+    assert manager.start_monitoring()
+    thread, fds = manager.thread, manager._wake_fds
+    time.sleep(0.05)
+    started = time.monotonic()
+    manager.stop_monitoring()
+    assert time.monotonic() - started < 0.2
+    assert not thread.is_alive()
+    assert manager._wake_fds is None and fake_x[0].closed
+    for fd in fds:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+def test_set_bindings_regrabs_while_running(fake_x):
+    manager = X11HotkeyManager()
+    manager.set_bindings([(['Ctrl'], 'S', lambda: None)])
+    assert manager.start_monitoring()
+    root = fake_x[0].root
+    ctrl = X11_MOD_FLAGS['Ctrl']
+    assert (ord('s'), ctrl) in root.grabbed
+    manager.set_bindings([(['Ctrl'], 'D', lambda: None)])
+    assert wait_until(lambda: (ord('d'), ctrl) in root.grabbed and (ord('s'), ctrl) not in root.grabbed)
+    assert len(root.grabbed) == len(x11_hotkeys._LOCK_MASKS)   # 每个组合覆盖全部锁定键
+    manager.stop_monitoring()
+
+
+def test_key_events_dispatch_and_autorepeat_is_dropped(fake_x):
+    pressed, released = [], []
+    manager = X11HotkeyManager(debounce=0)
+    manager.set_bindings([(['Ctrl'], 'S', lambda: pressed.append(1))],
+                         [(['Ctrl'], 'S', lambda: released.append(1))])
+    assert manager.start_monitoring()
+    display, key, ctrl = fake_x[0], ord('s'), X11_MOD_FLAGS['Ctrl']
+    display.push(KEY_PRESS, key, ctrl, when=1)
+    display.push(KEY_RELEASE, key, ctrl, when=2)                # 自动重复：同一时刻的 松开+按下
+    display.push(KEY_PRESS, key, ctrl, when=2)
+    display.push(KEY_RELEASE, key, ctrl, when=3)
+    assert wait_until(lambda: released)
+    display.push(KEY_PRESS, key, ctrl | 1 << 1, when=4)         # CapsLock 打开时同样生效
+    assert wait_until(lambda: len(pressed) == 2)
+    manager.stop_monitoring()
+    assert released == [1]
+
+
+def test_unavailable_backend_does_not_start(monkeypatch):
+    monkeypatch.setattr(x11_hotkeys, 'X11_HOTKEY_AVAILABLE', False)
+    assert not X11HotkeyManager().start_monitoring()
+
+
+def test_pipe_is_closed_under_the_wake_lock(fake_x, monkeypatch):
+    """监听线程关闭管道时持有 _wake_lock，并发的 _wake() 不会写入已关闭的 fd"""
+    manager = X11HotkeyManager()
+    manager.set_bindings([(['Ctrl'], 'S', lambda: None)])
+    assert manager.start_monitoring()
+    fds = manager._wake_fds
+    held = []
+    real_close = os.close
+
+    def recording_close(fd):
+        if fd in fds:
+            held.append(manager._wake_lock.locked())
+        real_close(fd)
+    monkeypatch.setattr(x11_hotkeys.os, 'close', recording_close)
+
+    stop = threading.Event()
+
+    def hammer():
+        while not stop.is_set():
+            manager.set_bindings([(['Ctrl'], 'S', lambda: None)])
+    thread = threading.Thread(target=hammer)
+    thread.start()
+    try:
+        time.sleep(0.05)
+        manager.stop_monitoring()
+    finally:
+        stop.set()
+        thread.join(1.0)
+    assert held == [True, True]
+    manager.set_bindings([])          # 停止后再唤醒不写入任何 fd
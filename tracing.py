@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热路径事件追踪 - 预分配环形缓冲区 + Chrome/Perfetto trace 导出
+默认关闭：未设置环境变量 AUTO_CLICKER_TRACE 时 traced() 直接返回原函数，
+span()/instant() 只做一次标志判断。设置后（值为导出文件路径，例如
+AUTO_CLICKER_TRACE=trace.json）每条记录写入固定大小的预分配数组，
+程序退出时导出为 Chrome trace JSON，可用 chrome://tracing 或
+https://ui.perfetto.dev 打开，查看从热键按下到第一次点击之间的耗时。
+
+    AUTO_CLICKER_TRACE=trace.json python3 auto_clicker_multi_position.py
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from array import array
+
+TRACE_ENV_VAR = 'AUTO_CLICKER_TRACE'
+DEFAULT_CAPACITY = 65536
+
+# 记录类型（Chrome trace 的 ph 字段）
+PHASE_COMPLETE = 0   # 'X'：有开始时间和持续时间的区间
+PHASE_INSTANT = 1    # 'i'：瞬时事件
+_PHASES = ('X', 'i')
+
+_CO_VARARGS = 0x04  # inspect.CO_VARARGS，避免启动时导入 inspect
+
+
+class Tracer:
+    """环形缓冲区追踪器
+
+    每条记录由 6 个定长字段组成（开始时间、持续时间 ns，线程 id，
+    名称编号，类型，整型参数），分别存放在预分配的 array 中；
+    写入只有数组赋值和计数递增，缓冲区写满后覆盖最旧的记录。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.enabled = False
+        self._start = array('q', bytes(8 * capacity))
+        self._duration = array('q', bytes(8 * capacity))
+        self._tid = array('q', bytes(8 * capacity))
+        self._arg = array('q', bytes(8 * capacity))
+        self._name = array('i', bytes(4 * capacity))
+        self._phase = array('b', bytes(capacity))
+        self._names = []
+        self._name_ids = {}
+        self._names_lock = threading.Lock()
+        self._count = 0
+        self._count_lock = threading.Lock()
+
+    def name_id(self, name):
+        """名称 -> 编号（只在第一次出现时加锁）"""
+        nid = self._name_ids.get(name)
+        if nid is None:
+            with self._names_lock:
+                nid = self._name_ids.get(name)
+                if nid is None:
+                    nid = len(self._names)
+                    self._names.append(name)
+                    self._name_ids[name] = nid
+        return nid
+
+    def record(self, name, start_ns, duration_ns=0, phase=PHASE_COMPLETE, arg=0):
+        """写入一条记录"""
+        with self._count_lock:
+            slot = self._count % self.capacity
+            self._count += 1
+        self._start[slot] = start_ns
+        self._duration[slot] = duration_ns
+        self._tid[slot] = threading.get_ident()
+        self._arg[slot] = int(arg)
+        self._name[slot] = self.name_id(name)
+        self._phase[slot] = phase
+
+    def events(self):
+        """按写入顺序返回缓冲区中的记录"""
+        count = self._count
+        n = min(count, self.capacity)
+        for k in range(count - n, count):
+            slot = k % self.capacity
+            yield (self._names[self._name[slot]], self._start[slot], self._duration[slot],
+                   self._tid[slot], _PHASES[self._phase[slot]], self._arg[slot])
+
+    def export_chrome(self, path):
+        """导出为 Chrome trace JSON（时间单位：微秒）"""
+        pid = os.getpid()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        trace_events = []
+        tids = set()
+        for name, start, duration, tid, phase, arg in self.events():
+            event = {'name': name, 'ph': phase, 'ts': start / 1000, 'pid': pid, 'tid': tid}
+            if phase == 'X':
+                event['dur'] = duration / 1000
+            else:
+                event['s'] = 't'
+            if arg:
+                event['args'] = {'value': arg}
+            trace_events.append(event)
+            tids.add(tid)
+        for tid in tids:
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                 'args': {'name': thread_names.get(tid, f'thread-{tid}')}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return len(trace_events)
+
+
+tracer = Tracer()
+enabled = False
+_clock = time.perf_counter_ns
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'arg', 'start')
+
+    def __init__(self, name, arg):
+        self.name = name
+        self.arg = arg
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        tracer.record(self.name, self.start, _clock() - self.start, PHASE_COMPLETE, self.arg)
+        return False
+
+
+def now():
+    """当前时间（ns），与追踪记录使用同一个时钟"""
+    return _clock()
+
+
+def span(name, arg=0):
+    """区间：with tracing.span('名称'): ...（未启用时返回空上下文）"""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, arg)
+
+
+def complete(name, start_ns, end_ns, arg=0):
+    """记录一个已知起止时间的区间"""
+    if enabled:
+        tracer.record(name, start_ns, end_ns - start_ns, PHASE_COMPLETE, arg)
+
+
+def instant(name, arg=0):
+    """记录瞬时事件"""
+    if enabled:
+        tracer.record(name, _clock(), 0, PHASE_INSTANT, arg)
+
+
+def _max_positional(func):
+    """函数可接受的位置参数个数，有 *args 时返回 None"""
+    code = func.__code__
+    if code.co_flags & _CO_VARARGS:
+        return None
+    return code.co_argcount
+
+
+def traced(name=None):
+    """装饰器：把函数调用记录为区间；未启用追踪时原样返回函数（零开销）
+
+    PyQt 连接槽函数时会按槽的参数个数丢弃多余的信号参数（例如
+    clicked(bool) 的 checked），包装后的函数签名变成了 *args，
+    因此在这里按原函数的位置参数个数截断。
+    """
+    def decorator(func):
+        if not enabled:
+            return func
+        label = name or func.__qualname__
+        max_positional = _max_positional(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if max_positional is not None and len(args) > max_positional:
+                args = args[:max_positional]
+            start = _clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(label, start, _clock() - start)
+        return wrapper
+    return decorator
+
+
+def enable(path=None, capacity=DEFAULT_CAPACITY):
+    """启用追踪；给出 path 时在程序退出时导出（应在导入被追踪的模块之前调用）"""
+    global enabled, tracer
+    if tracer.capacity != capacity:
+        tracer = Tracer(capacity)
+    tracer.enabled = enabled = True
+    if path:
+        atexit.register(_export_at_exit, path)
+
+
+def _export_at_exit(path):
+    try:
+        count = tracer.export_chrome(path)
+        print(f"追踪记录已导出: {path} ({count} 条)")
+    except Exception as e:
+        print(f"导出追踪记录失败: {e}")
+
+
+if os.environ.get(TRACE_ENV_VAR):
+    enable(os.environ[TRACE_ENV_VAR])
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+拟人鼠标轨迹 - 在目标之间生成带弯曲与抖动的移动路径
+有些目标只响应真实的鼠标移动而忽略瞬移。这里用三次 Bezier 曲线给出
+路径形状，按最小加加速度（minimum-jerk）速度曲线采样，再叠加两端
+收敛为零的平滑抖动；移动时长按 Fitts 定律随距离增长。
+
+整条路径在开始连点前一次算好（有 NumPy 时为向量化计算，没有时用纯
+Python 计算同样的公式），点击线程只按固定的移动频率逐点 move，
+不在连点循环中做任何逐点的数学计算。
+
+    legs = plan_cycle([(100, 100), (400, 300)], max_duration=0.08)
+    stream(mouse, legs[1][0], kill_switch)     # 从第 1 个位置移动到第 2 个位置
+"""
+
+import math
+import random
+import time
+
+DEFAULT_RATE = 240        # 移动事件频率（次/秒）
+DEFAULT_VARIANTS = 4      # 每段路径预先生成的不同形状数
+
+
+def fitts_duration(distance, width=20.0):
+    """Fitts 定律估计的移动时长（秒）"""
+    return 0.08 + 0.07 * math.log2(1.0 + distance / width)
+
+
+class Path:
+    """一条预先算好的移动路径：points 为 [(x, y), ...]，按 rate 次/秒依次移动"""
+
+    __slots__ = ('xy', 'points', 'rate')
+
+    def __init__(self, xy, points, rate):
+        self.xy = xy            # NumPy 时为 (n, 2) int32 数组，否则为 None
+        self.points = points
+        self.rate = rate
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def duration(self):
+        return len(self.points) / self.rate
+
+    @property
+    def end(self):
+        return self.points[-1]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _min_jerk(t):
+    return t * t * t * (10.0 - 15.0 * t + 6.0 * t * t)
+
+
+def plan(start, end, duration=None, rate=DEFAULT_RATE, curvature=0.15, tremor=0.8, rng=None,
+         max_duration=None):
+    """生成从 start 到 end 的路径（不含起点，终点精确为 end）
+
+    duration 默认按 Fitts 定律估计，max_duration 为其上限。curvature 为控制点
+    偏离直线的标准差（相对距离），tremor 为抖动幅度（像素）。
+    rng 为 random.Random，给定种子时结果可复现。
+    """
+    rng = rng if rng is not None else random.Random()
+    x0, y0 = float(start[0]), float(start[1])
+    x3, y3 = float(end[0]), float(end[1])
+    dx, dy = x3 - x0, y3 - y0
+    distance = math.hypot(dx, dy)
+    if duration is None:
+        duration = fitts_duration(distance)
+    if max_duration is not None:
+        duration = min(duration, max_duration)
+    n = max(1, int(round(duration * rate)))
+    if distance < 1.0:
+        return Path(None, [(int(end[0]), int(end[1]))], rate)
+
+    # 控制点：沿直线 1/3、2/3 处，再向法线方向随机偏移（同侧偏移为弧线，异侧为 S 形）
+    px, py = -dy / distance, dx / distance
+    c1 = rng.gauss(0.0, curvature) * distance
+    c2 = rng.gauss(0.0, curvature) * distance
+    x1, y1 = x0 + dx / 3 + px * c1, y0 + dy / 3 + py * c1
+    x2, y2 = x0 + 2 * dx / 3 + px * c2, y0 + 2 * dy / 3 + py * c2
+    seed = rng.getrandbits(32)
+
+    np = _numpy()
+    if np is not None:
+        t = np.arange(1, n + 1, dtype=np.float64) / n
+        s = _min_jerk(t)
+        u = 1.0 - s
+        b0, b1, b2, b3 = u * u * u, 3 * u * u * s, 3 * u * s * s, s * s * s
+        xy = np.empty((n, 2))
+        xy[:, 0] = b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3
+        xy[:, 1] = b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3
+        if tremor > 0 and n > 2:
+            noise = np.random.default_rng(seed).normal(0.0, tremor, (n + 4, 2))
+            kernel = np.full(5, 0.2)
+            smooth = np.column_stack([np.convolve(noise[:, k], kernel, 'valid') for k in (0, 1)])
+            xy += smooth * np.sin(np.pi * t)[:, None]
+        xy = np.rint(xy).astype(np.int32)
+        xy[-1] = (int(end[0]), int(end[1]))
+        return Path(xy, list(map(tuple, xy.tolist())), rate)
+
+    # 没有 NumPy：逐点计算同样的公式
+    noise_rng = random.Random(seed)
+    noise = [(noise_rng.gauss(0.0, tremor), noise_rng.gauss(0.0, tremor)) for _ in range(n + 4)]
+    points = []
+    for i in range(1, n + 1):
+        t = i / n
+        s = _min_jerk(t)
+        u = 1.0 - s
+        b0, b1, b2, b3 = u * u * u, 3 * u * u * s, 3 * u * s * s, s * s * s
+        x = b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3
+        y = b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3
+        if tremor > 0 and n > 2:
+            envelope = math.sin(math.pi * t) * 0.2
+            x += sum(v[0] for v in noise[i - 1:i + 4]) * envelope
+            y += sum(v[1] for v in noise[i - 1:i + 4]) * envelope
+        points.append((int(round(x)), int(round(y))))
+    points[-1] = (int(end[0]), int(end[1]))
+    return Path(None, points, rate)
+
+
+def plan_cycle(positions, max_duration=None, rate=DEFAULT_RATE, variants=DEFAULT_VARIANTS, seed=None, **kwargs):
+    """为循环点击的每一段预先生成若干条路径
+
+    返回 legs，legs[i] 为从 positions[i - 1] 移动到 positions[i] 的路径列表
+    （legs[0] 为从最后一个位置回到第一个位置）。max_duration 限制每条路径
+    的时长，保证移动能在点击间隔内完成。
+    """
+    rng = random.Random(seed)
+    return [[plan(positions[i - 1], end, rate=rate, rng=rng, max_duration=max_duration, **kwargs)
+             for _ in range(variants)]
+            for i, end in enumerate(positions)]
+
+
+def stream(mouse, path, kill_switch, start=None):
+    """按路径的移动频率依次移动光标（截止时间调度），停止开关置位时返回 False"""
+    clock = time.perf_counter
+    wait = kill_switch.wait
+    move = mouse.move
+    step = 1.0 / path.rate
+    due = start if start is not None else clock()
+    for x, y in path.points:
+        due += step
+        delay = due - clock()
+        if delay > 0 and wait(delay):
+            return False
+        move(x, y)
+    return not kill_switch.is_set()
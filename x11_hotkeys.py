@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Linux/X11 全局热键后端 - 基于 XGrabKey
+只有注册的组合键才会唤醒 Python，其余按键完全由 X 服务器处理，
+不像 pynput / keyboard 那样对系统中的每一次按键都执行回调。
+依赖 python-xlib（可选），不可用时 X11_HOTKEY_AVAILABLE 为 False。
+Xlib 在开始监听时才导入，不占用程序启动时间。
+"""
+
+import importlib.util
+import os
+import select
+import threading
+
+from app_logging import get_logger
+from hotkey_dispatch import HotkeyDispatchTable
+
+log = get_logger('x11_hotkeys')
+
+try:
+    X11_HOTKEY_AVAILABLE = bool(os.environ.get('DISPLAY')) and importlib.util.find_spec('Xlib') is not None
+except (ImportError, ValueError):
+    X11_HOTKEY_AVAILABLE = False
+
+X = XK = xdisplay = None
+
+
+def _load_xlib():
+    """首次开始监听时导入 Xlib"""
+    global X, XK, xdisplay
+    if X is None:
+        from Xlib import X as x_mod, XK as xk_mod  # type: ignore
+        from Xlib import display as display_mod  # type: ignore
+        X, XK, xdisplay = x_mod, xk_mod, display_mod
+
+# X11 修饰键掩码（ShiftMask / ControlMask / Mod1Mask / Mod4Mask）
+X11_MOD_FLAGS = {
+    'Ctrl': 1 << 2,
+    'Option': 1 << 3,   # Alt
+    'Shift': 1 << 0,
+    'Command': 1 << 6,  # Super
+}
+# 抓键时需要额外覆盖的锁定键组合：CapsLock(LockMask) / NumLock(Mod2Mask)
+_LOCK_MASKS = (0, 1 << 1, 1 << 4, (1 << 1) | (1 << 4))
+
+
+def key_to_keysym_name(key):
+    """界面中的主键名称 -> X keysym 名称（字母用小写，F1~F12 保持原样）"""
+    key = str(key)
+    if len(key) == 1:
+        return key.lower()
+    return key.upper() if key.upper().startswith('F') else key
+
+
+class X11HotkeyManager:
+    """X11 全局热键管理器
+
+    绑定格式与 HotkeyDispatchTable 相同：[(修饰键列表, 主键, 回调), ...]。
+    所有 X 调用都在监听线程中完成；set_bindings() 只记录新绑定，
+    由监听线程在下一轮循环中重新抓键并整表替换分发表。
+    release_bindings 在按键松开时触发（用于按住连点等场景），
+    X 自动重复产生的 松开+按下 事件对会被过滤掉。
+    """
+
+    def __init__(self, display_name=None, debounce=0.3):
+        self.display_name = display_name
+        self.display = None
+        self.root = None
+        self.monitoring = False
+        self.thread = None
+        self.dispatch_table = HotkeyDispatchTable(mod_flags=X11_MOD_FLAGS, keycodes={}, debounce=debounce)
+        self.release_table = HotkeyDispatchTable(mod_flags=X11_MOD_FLAGS, keycodes={})
+        self._bindings = []
+        self._release_bindings = []
+        self._grabbed = []
+        self._dirty = threading.Event()
+        self._ready = threading.Event()
+        self._wake_fds = None    # 自唤醒管道：停止与绑定变更时写入一个字节唤醒 select
+        self._wake_lock = threading.Lock()   # 写入与关闭管道互斥，避免写入已关闭（或被复用）的 fd
+
+    def set_bindings(self, bindings, release_bindings=()):
+        """设置热键绑定（按下/松开），监听线程运行中也可调用"""
+        self._bindings = list(bindings)
+        self._release_bindings = list(release_bindings)
+        self._dirty.set()
+        self._wake()
+
+    def _wake(self):
+        with self._wake_lock:
+            fds = self._wake_fds
+            if fds is not None:
+                try:
+                    os.write(fds[1], b'\0')
+                except OSError:
+                    pass
+
+    def start_monitoring(self):
+        """开始监听全局热键，成功抓键后返回 True"""
+        if not X11_HOTKEY_AVAILABLE:
+            return False
+        if self.monitoring:
+            return True
+        try:
+            _load_xlib()
+            self.display = xdisplay.Display(self.display_name)
+            self.root = self.display.screen().root
+        except Exception as e:
+            log.error("X11 热键后端启动失败: %s", e)
+            self.display = None
+            return False
+        self.monitoring = True
+        wake_fds = os.pipe()
+        # 写端非阻塞：监听线程来不及读取时管道写满也不会在持锁时阻塞
+        os.set_blocking(wake_fds[1], False)
+        with self._wake_lock:
+            self._wake_fds = wake_fds
+        self._dirty.set()
+        self._ready.clear()
+        self.thread = threading.Thread(target=self._run_event_loop, daemon=True)
+        self.thread.start()
+        # 等待首次抓键完成，保证返回后热键立即可用
+        self._ready.wait(1.0)
+        return self.monitoring
+
+    def stop_monitoring(self):
+        """停止监听全局热键"""
+        self.monitoring = False
+        self._wake()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(1.0)
+        self.thread = None
+
+    def _apply_bindings(self):
+        """（监听线程）按当前绑定重新抓键并替换分发表"""
+        self._dirty.clear()
+        bindings = self._bindings
+        release_bindings = self._release_bindings
+        keycodes = {}
+        for _, key, _ in bindings + release_bindings:
+            keysym = XK.string_to_keysym(key_to_keysym_name(key))
+            keycode = self.display.keysym_to_keycode(keysym) if keysym else 0
+            if keycode:
+                keycodes[str(key).upper()] = keycode
+        self.dispatch_table.keycodes = keycodes
+        self.release_table.keycodes = keycodes
+        table = self.dispatch_table.compile(bindings)
+        release_table = self.release_table.compile(release_bindings)
+
+        for keycode, modmask in self._grabbed:
+            self.root.ungrab_key(keycode, modmask)
+        self._grabbed = []
+        for keycode, modmask in set(table) | set(release_table):
+            for lock in _LOCK_MASKS:
+                self.root.grab_key(keycode, modmask | lock, True, X.GrabModeAsync, X.GrabModeAsync)
+                self._grabbed.append((keycode, modmask | lock))
+        self.display.sync()
+
+    def _on_release(self, event):
+        self.dispatch_table.release(event.detail)
+        self.release_table.dispatch(event.detail, event.state)
+
+    def _run_event_loop(self):
+        display = self.display
+        wake_fds = self._wake_fds
+        try:
+            self._apply_bindings()
+            self._ready.set()
+            fd = display.fileno()
+            wake_fd = wake_fds[0]
+            while self.monitoring:
+                if self._dirty.is_set():
+                    self._apply_bindings()
+                if not display.pending_events():
+                    # 无超时阻塞：只有 X 事件或自唤醒管道（停止、绑定变更）才会唤醒
+                    readable, _, _ = select.select([fd, wake_fd], [], [])
+                    if wake_fd in readable:
+                        os.read(wake_fd, 64)
+                    if not display.pending_events():
+                        continue
+                event = display.next_event()
+                if event.type == X.KeyRelease:
+                    # 自动重复表现为同一时刻的 松开+按下，两者一起丢弃
+                    if display.pending_events():
+                        following = display.next_event()
+                        if (following.type == X.KeyPress and following.detail == event.detail
+                                and following.time == event.time):
+                            continue
+                        self._on_release(event)
+                        event = following
+                    else:
+                        self._on_release(event)
+                        continue
+                if event.type == X.KeyPress:
+                    self.dispatch_table.press(event.detail, event.state)
+                elif event.type == X.KeyRelease:
+                    self._on_release(event)
+        except Exception as e:
+            log.error("X11 热键监听错误: %s", e)
+        finally:
+            self.monitoring = False
+            self._ready.set()
+            try:
+                for keycode, modmask in self._grabbed:
+                    self.root.ungrab_key(keycode, modmask)
+                self._grabbed = []
+                display.close()
+            except Exception:
+                pass
+            self.display = None
+            # 监听期间重新 start_monitoring() 时管道已被替换，只清理本线程的管道
+            with self._wake_lock:
+                if self._wake_fds is wake_fds:
+                    self._wake_fds = None
+                for fd in wake_fds:
+                    os.close(fd)